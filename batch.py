@@ -0,0 +1,81 @@
+"""generate many mazes in parallel, each from its own reproducible seed
+
+    python batch.py 10000 50 50 --seed 7 --generator kruskal --output mazes.bin
+
+The output file is the maze_file records of every maze back to back.
+"""
+import argparse
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from generators import GENERATORS, generate
+from maze_file import MazeHeader, maze_from_bytes, maze_to_bytes
+from maze_rng import MazeRNG
+from packed_grid import PackedVCWGrid
+
+def derive_seed(base_seed: int, index: int) -> int:
+    """stable per-maze seed, independent of worker count and ordering"""
+    digest = hashlib.sha256(f"{base_seed}:{index}".encode()).digest()
+    # 63 bits so it fits the signed seed field in the file header
+    return int.from_bytes(digest[:8], "little") >> 1
+
+def generate_one(cell_rows: int, cell_cols: int, generator: str,
+                 seed: int) -> bytes:
+    """one maze as a maze_file record, using its own MazeRNG stream"""
+    grid = generate(cell_rows, cell_cols, generator, rng=MazeRNG(seed),
+                    grid_class=PackedVCWGrid)
+    return maze_to_bytes(grid, seed=seed, generator=generator)
+
+def _generate_job(job: tuple[int, int, str, int]) -> bytes:
+    return generate_one(*job)
+
+def generate_batch(count: int, cell_rows: int, cell_cols: int,
+                   base_seed: int=0, generator: str="backtracker",
+                   workers: int | None=None,
+                   chunksize: int | None=None) -> list[bytes]:
+    """count serialized mazes, in index order, built across processes
+
+    workers=1 runs in this process, which gives the same bytes.
+    """
+    jobs = [(cell_rows, cell_cols, generator, derive_seed(base_seed, idx))
+            for idx in range(count)]
+    if workers == 1:
+        return [_generate_job(job) for job in jobs]
+    workers = workers or os.cpu_count() or 1
+    # a few chunks per worker keeps them busy without a pickle per maze
+    chunksize = chunksize or max(1, count // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_generate_job, jobs, chunksize=chunksize))
+
+def iter_batch(data) -> Iterator[tuple[PackedVCWGrid, MazeHeader]]:
+    """walks back to back maze_file records, e.g. a batch output file"""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        grid, header = maze_from_bytes(view[offset:])
+        yield grid, header
+        offset += header.file_size
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("cols", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generator", choices=sorted(GENERATORS),
+                        default="backtracker")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", required=True)
+    args = parser.parse_args(argv)
+
+    records = generate_batch(args.count, args.rows, args.cols,
+                             base_seed=args.seed, generator=args.generator,
+                             workers=args.workers)
+    with open(args.output, "wb") as fh:
+        for record in records:
+            fh.write(record)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from batch import derive_seed, generate_batch, iter_batch
+from solvers import bfs
+
+class Tests(unittest.TestCase):
+    def test_batch_is_reproducible_across_workers(self):
+        serial = generate_batch(6, 8, 9, base_seed=3, workers=1)
+        parallel = generate_batch(6, 8, 9, base_seed=3, workers=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(len(set(serial)), 6)
+
+    def test_workers_start_without_numpy(self):
+        # every pool worker pays for what these import
+        check = ("import sys, batch, main, tiled, solvers; "
+                 "print('numpy' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", check], check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+    def test_batch_records_decode(self):
+        records = generate_batch(3, 5, 5, base_seed=1, generator="kruskal",
+                                 workers=1)
+        decoded = list(iter_batch(b"".join(records)))
+        self.assertEqual(len(decoded), 3)
+        for idx, (grid, header) in enumerate(decoded):
+            self.assertEqual(header.seed, derive_seed(1, idx))
+            self.assertEqual(header.generator, "kruskal")
+            self.assertTrue(bfs(grid).solved)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""headless timing and peak memory for each phase of building a maze
+
+    python benchmark.py --sizes 10 100 500 --output bench.json
+
+Every phase runs on a fresh, fixed-seed maze so numbers are comparable
+between commits.  Results are a JSON list with one record per
+(size, phase).
+"""
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from dataclasses import dataclass, asdict
+from time import perf_counter
+from typing import Any, Callable
+
+from generators import GENERATORS, get_generator
+from maze_engine import (build_grid, headless_wall_path,
+                         remove_entrance_and_exit, run_maze)
+from maze_rng import MazeRNG
+from packed_grid import PackedVCWGrid
+from screen_coordinate_calculator import GridToScreenTranslator
+from solvers import SOLVERS
+from vcw_grid import VCWGrid
+
+DEFAULT_SIZES = (10, 100, 500, 1000, 2000)
+BACKENDS = {"vcw": VCWGrid, "packed": PackedVCWGrid}
+PHASES = ("populate_walls", "vertex_coordinates", "generate", "solve")
+CELL_SIZE = 35
+BORDER_WIDTH = 5
+
+@dataclass
+class BenchResult:
+    phase: str
+    rows: int
+    cols: int
+    backend: str
+    generator: str
+    solver: str
+    seed: int
+    seconds: float
+    peak_bytes: int | None
+
+def measure(setup: Callable[[], Any], phase: Callable[[Any], Any],
+            track_memory: bool=True) -> tuple[float, int | None]:
+    """times phase(setup()) untraced, then reruns it under tracemalloc
+
+    Only the phase itself is timed or traced, never the setup.
+    """
+    state = setup()
+    start = perf_counter()
+    phase(state)
+    seconds = perf_counter() - start
+    if not track_memory:
+        return seconds, None
+    state = setup()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        phase(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+def phase_steps(rows: int, cols: int, grid_class: Any, generator: str,
+                solver: str, seed: int) -> dict[str, tuple]:
+    """(setup, phase) pairs for every benchmarked phase
+
+    Setups hand the phase its grid and a ready MazeRNG, so building the
+    rng and its first block of floats is not timed.
+    """
+    carve = get_generator(generator)
+
+    def fresh_grid() -> tuple[Any, MazeRNG]:
+        grid = build_grid(rows, cols, grid_class=grid_class)
+        remove_entrance_and_exit(grid)
+        return grid, MazeRNG(seed)
+
+    def carved_grid() -> tuple[Any, MazeRNG]:
+        grid, rng = fresh_grid()
+        carve(grid, rng)
+        return grid, MazeRNG(seed)
+
+    def solve(state: tuple[Any, MazeRNG]) -> Any:
+        grid, rng = state
+        if solver == "run_maze":
+            return run_maze(grid, rng)
+        return SOLVERS[solver](grid)
+
+    return {
+        "populate_walls": (
+            lambda: grid_class(cell_rows=rows, cell_cols=cols),
+            lambda grid: grid.populate_walls(headless_wall_path)),
+        "vertex_coordinates": (
+            lambda: GridToScreenTranslator(rows, cols, CELL_SIZE,
+                                           BORDER_WIDTH),
+            lambda screen: screen.create_vertex_coordinates()),
+        "generate": (
+            fresh_grid,
+            lambda state: carve(*state)),
+        "solve": (carved_grid, solve),
+    }
+
+def run_benchmarks(sizes, backend: str="packed",
+                   generator: str="backtracker", solver: str="run_maze",
+                   seed: int=1, phases=PHASES, track_memory: bool=True,
+                   report: Callable[[BenchResult], None]=None
+                   ) -> list[BenchResult]:
+    results = []
+    for size in sizes:
+        steps = phase_steps(size, size, BACKENDS[backend], generator,
+                            solver, seed)
+        for phase in phases:
+            seconds, peak = measure(*steps[phase], track_memory=track_memory)
+            result = BenchResult(phase=phase, rows=size, cols=size,
+                                 backend=backend, generator=generator,
+                                 solver=solver, seed=seed, seconds=seconds,
+                                 peak_bytes=peak)
+            if report:
+                report(result)
+            results.append(result)
+    return results
+
+def print_result(result: BenchResult) -> None:
+    peak = ("-" if result.peak_bytes is None
+            else f"{result.peak_bytes / 2**20:9.1f} MiB")
+    print(f"{result.rows:>5}x{result.cols:<5} {result.phase:<19}"
+          f"{result.seconds:10.4f} s {peak:>13}", file=sys.stderr)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=list(DEFAULT_SIZES))
+    parser.add_argument("--backend", choices=sorted(BACKENDS),
+                        default="packed")
+    parser.add_argument("--generator", choices=sorted(GENERATORS),
+                        default="backtracker")
+    parser.add_argument("--solver", choices=["run_maze", *sorted(SOLVERS)],
+                        default="run_maze")
+    parser.add_argument("--phases", nargs="+", choices=PHASES,
+                        default=list(PHASES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc rerun of each phase")
+    parser.add_argument("--output", help="write JSON results here")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, backend=args.backend,
+                             generator=args.generator, solver=args.solver,
+                             seed=args.seed, phases=args.phases,
+                             track_memory=not args.no_memory,
+                             report=print_result)
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [asdict(result) for result in results],
+    }
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(document, fh, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from benchmark import PHASES, main, phase_steps, run_benchmarks
+from maze_rng import MazeRNG
+from packed_grid import PackedVCWGrid
+
+class Tests(unittest.TestCase):
+    def test_runs_every_phase_per_size(self):
+        results = run_benchmarks([3, 5], backend="vcw", generator="kruskal",
+                                 solver="bfs", seed=2)
+        self.assertEqual([(r.rows, r.phase) for r in results],
+                         [(size, phase) for size in (3, 5)
+                          for phase in PHASES])
+        for result in results:
+            self.assertEqual((result.cols, result.backend, result.seed),
+                             (result.rows, "vcw", 2))
+            self.assertGreaterEqual(result.seconds, 0)
+            self.assertGreater(result.peak_bytes, 0)
+
+    def test_setup_builds_the_rng(self):
+        steps = phase_steps(4, 4, PackedVCWGrid, "backtracker", "run_maze", 1)
+        for phase in ("generate", "solve"):
+            setup, _ = steps[phase]
+            _, rng = setup()
+            self.assertIsInstance(rng, MazeRNG, phase)
+
+    def test_json_output(self):
+        out, doc = io.StringIO(), io.StringIO()
+        with redirect_stderr(out), redirect_stdout(doc):
+            main(["--sizes", "4", "--phases", "generate", "solve",
+                  "--no-memory"])
+        document = json.loads(doc.getvalue())
+        self.assertEqual(set(document), {"python", "platform", "results"})
+        self.assertEqual([record["phase"] for record in document["results"]],
+                         ["generate", "solve"])
+        for record in document["results"]:
+            self.assertEqual(set(record), {
+                "phase", "rows", "cols", "backend", "generator", "solver",
+                "seed", "seconds", "peak_bytes"})
+            self.assertIsNone(record["peak_bytes"])
+        # one human readable line per result goes to stderr
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
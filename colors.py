@@ -0,0 +1,22 @@
+# RGB values of the Tk color names the maze code draws with
+RGB = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+    "blue": (0, 0, 255),
+    "goldenrod2": (238, 180, 34),
+    "green2": (0, 238, 0),
+    "violet": (238, 130, 238),
+    "gold3": (205, 173, 0),
+    "red": (255, 0, 0),
+}
+
+def rgb(color: str) -> tuple[int, int, int]:
+    try:
+        return RGB[color]
+    except KeyError:
+        raise Exception(f"No RGB value for color {color!r}") from None
+
+def hex_color(color: str) -> str:
+    """#rrggbb for a Tk color name, Tk names like goldenrod2 mean
+    nothing to SVG or CSS"""
+    return "#%02x%02x%02x" % rgb(color)
@@ -0,0 +1,110 @@
+from collections import deque
+from typing import Any, Optional
+
+import numpy as np
+
+from geometry import CellLocation
+from maze_elements import SolveResult
+from maze_engine import start_location, end_location
+from wall_arrays import wall_arrays, cell_openings
+
+# array passes stop once fewer dead ends than this are left per pass
+CHAIN_WALK_BELOW = 64
+
+def dead_end_fill(grid: Any, start: Optional[CellLocation]=None,
+                  goal: Optional[CellLocation]=None) -> SolveResult:
+    """solves by filling dead ends in whole-array passes
+
+    Every cell with at most one passage, other than start and goal, is a
+    dead end: it is filled and its passage closed, which can make its
+    neighbor a dead end for the next pass.  The first pass sweeps the whole
+    grid; later passes only look at neighbors of the cells just filled.
+    Long corridors would take one pass per cell, so once a pass is down to
+    CHAIN_WALK_BELOW dead ends the rest is filled cell by cell.
+    What is left is the solution corridor (plus any loops in a maze that
+    is not perfect), which a short BFS over unfilled cells walks.
+    expanded counts the filled cells plus the cells that BFS visits.
+    """
+    start = start or start_location(grid)
+    goal = goal or end_location(grid)
+    rows, cols = grid.cell_rows, grid.cell_cols
+    horz, vert = wall_arrays(grid)
+    # flat, writable per-direction openings; offsets step to the neighbor
+    openings = [np.ascontiguousarray(opening).ravel()
+                for opening in cell_openings(horz, vert)]
+    directions = _directions(*openings, cols)
+    north, south, east, west = openings
+    degree = (north.astype(np.int8) + south + east + west).astype(np.int8)
+    protected = np.zeros(rows * cols, dtype=bool)
+    protected[start.row * cols + start.col] = True
+    protected[goal.row * cols + goal.col] = True
+    filled = np.zeros(rows * cols, dtype=bool)
+
+    dead = np.flatnonzero((degree <= 1) & ~protected)
+    while dead.size >= CHAIN_WALK_BELOW:
+        filled[dead] = True
+        touched = []
+        for opening, opposite, offset in directions:
+            leaving = dead[opening[dead]]
+            opening[leaving] = False
+            # each dead cell has one neighbor per direction, no repeats
+            neigh = leaving + offset
+            opposite[neigh] = False
+            degree[neigh] -= 1
+            touched.append(neigh)
+        candidates = np.unique(np.concatenate(touched))
+        dead = candidates[(degree[candidates] <= 1) & ~filled[candidates]
+                          & ~protected[candidates]]
+
+    # a few long corridors are left, which would take a pass per cell;
+    # they are filled one cell at a time on plain lists instead
+    directions = _directions(*(opening.tolist() for opening in openings),
+                             cols)
+    degree, filled, protected = (degree.tolist(), filled.tolist(),
+                                 protected.tolist())
+    stack = dead.tolist()
+    while stack:
+        cell = stack.pop()
+        filled[cell] = True
+        for opening, opposite, offset in directions:
+            if opening[cell]:
+                opening[cell] = False
+                neigh = cell + offset
+                opposite[neigh] = False
+                degree[neigh] -= 1
+                if (degree[neigh] <= 1 and not filled[neigh]
+                        and not protected[neigh]):
+                    stack.append(neigh)
+
+    path, visited = _corridor_path(start, goal, cols, directions, filled)
+    return SolveResult(path=path, expanded=sum(filled) + visited)
+
+def _directions(north: Any, south: Any, east: Any, west: Any,
+                cols: int) -> tuple:
+    """(opening, opposite opening, neighbor offset) for each direction"""
+    return ((north, south, -cols), (south, north, cols),
+            (east, west, 1), (west, east, -1))
+
+def _corridor_path(start: CellLocation, goal: CellLocation, cols: int,
+                   directions: tuple, filled: list[bool]
+                   ) -> tuple[list[CellLocation], int]:
+    start_id = start.row * cols + start.col
+    goal_id = goal.row * cols + goal.col
+    parents = {start_id: None}
+    queue = deque([start_id])
+    visited = 0
+    while queue:
+        cell = queue.popleft()
+        visited += 1
+        if cell == goal_id:
+            path = []
+            while cell is not None:
+                path.append(CellLocation(row=cell // cols, col=cell % cols))
+                cell = parents[cell]
+            return path[::-1], visited
+        for opening, _, offset in directions:
+            neigh = cell + offset
+            if opening[cell] and not filled[neigh] and neigh not in parents:
+                parents[neigh] = cell
+                queue.append(neigh)
+    return [], visited
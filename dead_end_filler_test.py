@@ -0,0 +1,110 @@
+import unittest
+import random
+from unittest import mock
+
+import dead_end_filler
+from dead_end_filler import dead_end_fill
+from generators import generate
+from geometry import CellLocation
+from maze_engine import get_reachable_neighbors
+from packed_grid import PackedVCWGrid
+from solvers import bfs
+from vcw_grid import VCWGrid
+from wall_arrays import wall_arrays, cell_openings, open_degree
+
+def open_loops(grid, count: int, rng: random.Random) -> None:
+    """knocks out count interior walls, so the maze has loops"""
+    rows, cols = grid.cell_rows, grid.cell_cols
+    while count:
+        loc = CellLocation(row=rng.randrange(rows - 1),
+                           col=rng.randrange(cols - 1))
+        wall = rng.choice((grid.get_east_wall, grid.get_south_wall))(loc)
+        if wall.solid:
+            wall.solid = False
+            count -= 1
+
+class Tests(unittest.TestCase):
+    def assertRoute(self, grid, result, start, goal):
+        self.assertEqual(result.path[0], start)
+        self.assertEqual(result.path[-1], goal)
+        for a, b in zip(result.path, result.path[1:]):
+            self.assertIn(b, get_reachable_neighbors(grid, a))
+        self.assertEqual(result.length, bfs(grid, start, goal).length)
+
+    def test_openings_match_the_wall_getters(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate(7, 9, "kruskal", rng=random.Random(2),
+                            grid_class=grid_class)
+            horz, vert = wall_arrays(grid)
+            north, south, east, west = cell_openings(horz, vert)
+            degree = open_degree(horz, vert)
+            for row in range(7):
+                for col in range(9):
+                    loc = CellLocation(row=row, col=col)
+                    self.assertEqual(horz[row, col],
+                                     grid.get_north_wall(loc).solid)
+                    self.assertEqual(horz[row + 1, col],
+                                     grid.get_south_wall(loc).solid)
+                    self.assertEqual(vert[row, col],
+                                     grid.get_west_wall(loc).solid)
+                    self.assertEqual(vert[row, col + 1],
+                                     grid.get_east_wall(loc).solid)
+                    # the entrance and exit are not passages
+                    flags = (north[row, col], south[row, col],
+                             east[row, col], west[row, col])
+                    self.assertEqual(flags, (
+                        row > 0 and not grid.get_north_wall(loc).solid,
+                        row < 6 and not grid.get_south_wall(loc).solid,
+                        col < 8 and not grid.get_east_wall(loc).solid,
+                        col > 0 and not grid.get_west_wall(loc).solid))
+                    self.assertEqual(degree[row, col], sum(flags))
+
+    def test_maze_with_loops(self):
+        rng = random.Random(4)
+        grid = generate(20, 25, "kruskal", rng=rng)
+        open_loops(grid, 60, rng)
+        result = dead_end_fill(grid)
+        self.assertRoute(grid, result, CellLocation(row=0, col=0),
+                         CellLocation(row=19, col=24))
+
+    def test_custom_start_and_goal(self):
+        grid = generate(15, 18, "backtracker", rng=random.Random(9))
+        start, goal = CellLocation(row=3, col=12), CellLocation(row=11, col=2)
+        self.assertRoute(grid, dead_end_fill(grid, start, goal), start, goal)
+        self.assertRoute(grid, dead_end_fill(grid, goal, start), goal, start)
+
+    def test_dead_end_start_and_goal_are_kept(self):
+        grid = generate(15, 18, "prim", rng=random.Random(5))
+        degree = open_degree(*wall_arrays(grid))
+        dead_ends = [CellLocation(row=row, col=col)
+                     for row in range(15) for col in range(18)
+                     if degree[row, col] == 1]
+        start, goal = dead_ends[3], dead_ends[-3]
+        self.assertRoute(grid, dead_end_fill(grid, start, goal), start, goal)
+
+    def test_array_and_list_phases_agree(self):
+        rng = random.Random(8)
+        grid = generate(40, 45, "backtracker", rng=rng)
+        open_loops(grid, 20, rng)
+        expected = dead_end_fill(grid)
+        # 1 keeps the array passes going to the end, a huge threshold
+        # leaves everything to the cell-by-cell list phase
+        for threshold in (1, 10**9):
+            with mock.patch.object(dead_end_filler, "CHAIN_WALK_BELOW",
+                                   threshold):
+                self.assertEqual(dead_end_fill(grid), expected, threshold)
+        self.assertRoute(grid, expected, CellLocation(row=0, col=0),
+                         CellLocation(row=39, col=44))
+
+    def test_unsolvable(self):
+        grid = generate(6, 6, "kruskal", rng=random.Random(1))
+        for col in range(6):
+            grid.get_south_wall(CellLocation(row=2, col=col)).solid = True
+        for threshold in (1, 10**9):
+            with mock.patch.object(dead_end_filler, "CHAIN_WALK_BELOW",
+                                   threshold):
+                self.assertFalse(dead_end_fill(grid).solved)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+from array import array
+from collections import deque
+from typing import Any, Optional
+
+from geometry import CellLocation
+from maze_engine import end_location
+
+class DistanceField:
+    """BFS distances and parents from one destination cell, as flat arrays
+
+    distance[cell_id] is the number of moves to the destination (-1 when
+    unreachable) and parent[cell_id] the next cell id on the way there
+    (-1 at the destination), cell_id being row*cell_cols+col.  A route
+    query just follows parents, so it costs O(route length).
+    """
+    def __init__(self, grid: Any, destination: CellLocation) -> None:
+        self.cell_rows = grid.cell_rows
+        self.cell_cols = grid.cell_cols
+        self.destination = destination
+        self.wall_version = grid.wall_version
+        num_cells = grid.cell_rows * grid.cell_cols
+        self.distance = array("i", [-1]) * num_cells
+        self.parent = array("i", [-1]) * num_cells
+        self._fill(grid)
+
+    def cell_id(self, loc: CellLocation) -> int:
+        return loc.row * self.cell_cols + loc.col
+
+    def cell_location(self, cell_id: int) -> CellLocation:
+        row, col = divmod(cell_id, self.cell_cols)
+        return CellLocation(row=row, col=col)
+
+    def _fill(self, grid: Any) -> None:
+        distance, parent = self.distance, self.parent
+        cell_sides = grid.size.cell_sides
+        wall_is_solid = grid.wall_is_solid
+        start = self.cell_id(self.destination)
+        distance[start] = 0
+        queue = deque([start])
+        while queue:
+            curr_id = queue.popleft()
+            for neigh_id, wall_id in cell_sides(curr_id):
+                if (distance[neigh_id] == -1
+                        and not wall_is_solid(wall_id)):
+                    distance[neigh_id] = distance[curr_id] + 1
+                    parent[neigh_id] = curr_id
+                    queue.append(neigh_id)
+
+    def is_current(self, grid: Any) -> bool:
+        return (grid.wall_version == self.wall_version
+                and grid.cell_rows == self.cell_rows
+                and grid.cell_cols == self.cell_cols)
+
+    def distance_from(self, loc: CellLocation) -> int:
+        return self.distance[self.cell_id(loc)]
+
+    def route_from(self, loc: CellLocation) -> list[CellLocation]:
+        """cells from loc to the destination inclusive, [] if unreachable"""
+        cell_id = self.cell_id(loc)
+        if self.distance[cell_id] == -1:
+            return []
+        route = []
+        while cell_id != -1:
+            route.append(self.cell_location(cell_id))
+            cell_id = self.parent[cell_id]
+        return route
+
+def distance_field(grid: Any,
+                   destination: Optional[CellLocation]=None) -> DistanceField:
+    """the grid's cached field for destination (the exit by default)
+
+    The field lives on the grid and is rebuilt only when the grid's
+    wall_version has moved on since it was computed.
+    """
+    destination = destination or end_location(grid)
+    field = getattr(grid, "_distance_field", None)
+    if (field is None or field.destination != destination
+            or not field.is_current(grid)):
+        field = DistanceField(grid, destination)
+        grid._distance_field = field
+    return field
+
+def route_to_exit(grid: Any, loc: CellLocation) -> list[CellLocation]:
+    return distance_field(grid).route_from(loc)
@@ -0,0 +1,46 @@
+import unittest
+import random
+
+from distance_field import distance_field, route_to_exit
+from generators import generate
+from geometry import CellLocation
+from packed_grid import PackedVCWGrid
+from solvers import bfs
+from vcw_grid import VCWGrid
+
+class Tests(unittest.TestCase):
+    def test_routes_match_bfs(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate(9, 11, "prim", rng=random.Random(5),
+                            grid_class=grid_class)
+            exit_loc = CellLocation(row=8, col=10)
+            for loc in (CellLocation(row=0, col=0), CellLocation(row=4, col=7),
+                        exit_loc):
+                self.assertEqual(route_to_exit(grid, loc),
+                                 bfs(grid, start=loc, goal=exit_loc).path)
+
+    def test_field_is_cached_until_walls_change(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate(6, 6, rng=random.Random(1), grid_class=grid_class)
+            field = distance_field(grid)
+            self.assertIs(distance_field(grid), field)
+            grid.get_east_wall(CellLocation(row=2, col=2)).path_color = "blue"
+            self.assertIs(distance_field(grid), field)
+            wall = grid.get_east_wall(CellLocation(row=2, col=2))
+            wall.solid = not wall.solid
+            self.assertIsNot(distance_field(grid), field)
+            field = distance_field(grid)
+            grid.set_wall_solid(0, True)
+            self.assertIsNot(distance_field(grid), field)
+
+    def test_unreachable_cell(self):
+        grid = generate(4, 4, rng=random.Random(2))
+        loc = CellLocation(row=0, col=0)
+        grid.get_east_wall(loc).solid = True
+        grid.get_south_wall(loc).solid = True
+        self.assertEqual(route_to_exit(grid, loc), [])
+        self.assertEqual(distance_field(grid).distance_from(loc), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
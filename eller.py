@@ -0,0 +1,100 @@
+import random
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional, TextIO
+
+from geometry import CellLocation
+
+@dataclass
+class EllerRow:
+    """one finished row of an Eller's maze
+
+    east_solid[c] is the wall between columns c and c+1 (cell_cols-1 of
+    them), south_solid[c] the wall under column c.  The west/east edges of
+    the maze are always solid and are not stored.
+    """
+    row: int
+    east_solid: list[bool]
+    south_solid: list[bool]
+    last: bool=False
+
+def eller_rows(cell_cols: int, cell_rows: Optional[int]=None,
+               rng=random) -> Iterator[EllerRow]:
+    """yields an Eller's-algorithm maze one row at a time
+
+    Only the set labels for the current row are kept, so memory is O(cols)
+    however many rows are produced.  With cell_rows=None the generator
+    never ends; every prefix is still a valid maze body, but only a
+    bounded run gets the closing last row that joins all remaining sets.
+    """
+    next_set = 0
+    row_sets: list[Optional[int]] = [None] * cell_cols
+    row = 0
+    while cell_rows is None or row < cell_rows:
+        last_row = cell_rows is not None and row == cell_rows - 1
+        members: dict[int, list[int]] = {}
+        for col in range(cell_cols):
+            if row_sets[col] is None:
+                row_sets[col] = next_set
+                next_set += 1
+            members.setdefault(row_sets[col], []).append(col)
+
+        east_solid = [True] * (cell_cols - 1)
+        for col in range(cell_cols - 1):
+            left, right = row_sets[col], row_sets[col + 1]
+            if left == right or not (last_row or rng.random() < 0.5):
+                continue
+            east_solid[col] = False
+            # relabel the smaller set into the larger one
+            if len(members[left]) < len(members[right]):
+                left, right = right, left
+            moved = members.pop(right)
+            for member in moved:
+                row_sets[member] = left
+            members[left].extend(moved)
+
+        south_solid = [True] * cell_cols
+        next_row_sets: list[Optional[int]] = [None] * cell_cols
+        if not last_row:
+            for set_id, cols in members.items():
+                dropped = [col for col in cols if rng.random() < 0.5]
+                if not dropped:
+                    dropped = [rng.choice(cols)]
+                for col in dropped:
+                    south_solid[col] = False
+                    next_row_sets[col] = set_id
+        yield EllerRow(row=row, east_solid=east_solid,
+                       south_solid=south_solid, last=last_row)
+        row_sets = next_row_sets
+        row += 1
+
+def eller_into_grid(grid: Any, rng=random) -> None:
+    """carves an Eller's maze into any grid with the VCWGrid wall API"""
+    for eller_row in eller_rows(grid.cell_cols, grid.cell_rows, rng):
+        for col in range(grid.cell_cols):
+            loc = CellLocation(row=eller_row.row, col=col)
+            if col < grid.cell_cols - 1 and not eller_row.east_solid[col]:
+                grid.get_east_wall(loc).solid = False
+            if not eller_row.south_solid[col]:
+                grid.get_south_wall(loc).solid = False
+
+def write_ascii(rows: Iterator[EllerRow], cell_cols: int, fh: TextIO,
+                open_entrance: bool=True) -> int:
+    """streams rows to fh as +--+ / |  | text, returns rows written
+
+    The exit in the bottom right is opened on the last row, which only
+    bounded row iterators produce.
+    """
+    top = ["+"] + ["  +" if open_entrance and col == 0 else "--+"
+                   for col in range(cell_cols)]
+    fh.write("".join(top) + "\n")
+    count = 0
+    for count, eller_row in enumerate(rows, start=1):
+        body = "".join("  |" if solid else "   "
+                       for solid in eller_row.east_solid)
+        fh.write("|" + body + "  |\n")
+        south_solid = list(eller_row.south_solid)
+        if eller_row.last and open_entrance:
+            south_solid[-1] = False
+        bottom = ["+"] + ["--+" if solid else "  +" for solid in south_solid]
+        fh.write("".join(bottom) + "\n")
+    return count
@@ -0,0 +1,40 @@
+import unittest
+import io
+import itertools
+import random
+
+from eller import eller_rows, eller_into_grid, write_ascii
+from maze_engine import build_grid, remove_entrance_and_exit
+from maze_engine_test import count_open_walls
+from solvers import bfs
+
+class Tests(unittest.TestCase):
+    def test_eller_grid_is_perfect_maze(self):
+        for seed in range(10):
+            grid = build_grid(9, 13)
+            remove_entrance_and_exit(grid)
+            eller_into_grid(grid, rng=random.Random(seed))
+            self.assertEqual(count_open_walls(grid), 9 * 13 - 1 + 2)
+            self.assertTrue(bfs(grid).solved)
+
+    def test_eller_unbounded_rows(self):
+        rows = list(itertools.islice(eller_rows(5, rng=random.Random(1)), 50))
+        self.assertEqual([r.row for r in rows], list(range(50)))
+        self.assertFalse(any(r.last for r in rows))
+        for eller_row in rows:
+            self.assertEqual(len(eller_row.east_solid), 4)
+            self.assertFalse(all(eller_row.south_solid))
+
+    def test_eller_ascii_stream(self):
+        out = io.StringIO()
+        written = write_ascii(eller_rows(4, 3, rng=random.Random(2)), 4, out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(written, 3)
+        self.assertEqual(len(lines), 1 + 2 * 3)
+        self.assertTrue(lines[0].startswith("+  +"))
+        self.assertTrue(lines[-1].endswith("+  +"))
+        self.assertEqual({len(line) for line in lines}, {3 * 4 + 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
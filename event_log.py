@@ -0,0 +1,204 @@
+import struct
+from array import array
+from typing import Any, BinaryIO, Iterator, Optional
+
+from geometry import CellLocation
+from maze_engine import (MazeObserver, FORWARD_PASS_COLOR, BACKTRACK_COLOR,
+                         get_wallpath_between_cell_locations,
+                         headless_wall_path)
+from maze_file import pack_walls
+from maze_size import MazeSize
+from packed_grid import PackedVCWGrid
+
+# File layout, all little endian:
+#   header   magic, version, rows, cols, event count (see HEADER)
+#   horz     starting wall bitmaps, exactly as in maze_file
+#   vert
+#   events   EVENT records: a code byte, then the from cell id
+# The code byte is kind << 2 | direction of the to cell, with STEP_END
+# set on the last event of an engine step.  A step with no events is a
+# lone STEP record.
+MAGIC = b"VCWL"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIIQ")
+EVENT = struct.Struct("<BI")
+
+WALL_REMOVED = 0
+CELL_ENTERED = 1
+BACKTRACKED = 2
+CARVE_BACKTRACKED = 3   # backtracked() while carving, no wall involved
+STEP = 4
+STEP_END = 0x80
+
+# (row, col) offset for each direction code
+DIRECTIONS = ((-1, 0), (1, 0), (0, 1), (0, -1))
+
+class EventRecorder(MazeObserver):
+    """records engine events into a compact log, then passes them on
+
+    Recording costs one small struct per event, so generation and solving
+    run at full speed with nothing drawn; EventLog/ReplayState play the
+    result back later.
+    """
+    def __init__(self, grid: Any, inner: Optional[MazeObserver]=None) -> None:
+        self.cell_rows = grid.cell_rows
+        self.cell_cols = grid.cell_cols
+        self.horz_bits, self.vert_bits = pack_walls(grid)
+        self.inner = inner or MazeObserver()
+        self.events = bytearray()
+        self.num_events = 0
+        self._step_open = False
+
+    def _record(self, kind: int, from_loc: CellLocation,
+                to_loc: CellLocation) -> None:
+        direction = DIRECTIONS.index((to_loc.row - from_loc.row,
+                                      to_loc.col - from_loc.col))
+        self.events += EVENT.pack(kind << 2 | direction,
+                                  from_loc.row * self.cell_cols + from_loc.col)
+        self.num_events += 1
+        self._step_open = True
+
+    def wall_removed(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self._record(WALL_REMOVED, from_loc, to_loc)
+        self.inner.wall_removed(wall, from_loc, to_loc)
+
+    def cell_entered(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self._record(CELL_ENTERED, from_loc, to_loc)
+        self.inner.cell_entered(wall, from_loc, to_loc)
+
+    def backtracked(self, wall: Any, from_loc: CellLocation,
+                    to_loc: CellLocation) -> None:
+        self._record(BACKTRACKED if wall is not None else CARVE_BACKTRACKED,
+                     from_loc, to_loc)
+        self.inner.backtracked(wall, from_loc, to_loc)
+
+    def step(self) -> None:
+        if not self._step_open:
+            self.events += EVENT.pack(STEP << 2, 0)
+            self.num_events += 1
+        self.events[-EVENT.size] |= STEP_END
+        self._step_open = False
+        self.inner.step()
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(MAGIC, VERSION, self.cell_rows, self.cell_cols,
+                             self.num_events)
+        return header + self.horz_bits + self.vert_bits + self.events
+
+    def write(self, fh: BinaryIO) -> None:
+        fh.write(self.to_bytes())
+
+class EventLog:
+    """a parsed log; step_ends[s] is the event index just past step s"""
+    def __init__(self, data: Any) -> None:
+        if len(data) < HEADER.size:
+            raise Exception("Event log is too short for a header")
+        magic, version, rows, cols, num_events = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception(f"Not an event log, magic was {magic!r}")
+        if version != VERSION:
+            raise Exception(f"Unsupported event log version {version}")
+        size = MazeSize(cell_rows=rows, cell_cols=cols)
+        horz_bytes = (size.num_horz_walls + 7) // 8
+        vert_bytes = (size.num_vert_walls + 7) // 8
+        view = memoryview(data)
+        walls_end = HEADER.size + horz_bytes + vert_bytes
+        events_end = walls_end + num_events * EVENT.size
+        if len(data) < events_end:
+            raise Exception(f"Event log is {len(data)} bytes, "
+                            f"expected {events_end}")
+        self.cell_rows = rows
+        self.cell_cols = cols
+        self.num_events = num_events
+        self.horz_bits = view[HEADER.size:HEADER.size + horz_bytes]
+        self.vert_bits = view[HEADER.size + horz_bytes:walls_end]
+        self.events = view[walls_end:events_end]
+        self.step_ends = array("I")
+        for idx, (code, _) in enumerate(EVENT.iter_unpack(self.events)):
+            if code & STEP_END:
+                self.step_ends.append(idx + 1)
+
+    @property
+    def num_steps(self) -> int:
+        return len(self.step_ends)
+
+    def event(self, idx: int) -> tuple[int, CellLocation, CellLocation]:
+        """(kind, from_loc, to_loc) of event idx"""
+        code, cell_id = EVENT.unpack_from(self.events, idx * EVENT.size)
+        row, col = divmod(cell_id, self.cell_cols)
+        delta_row, delta_col = DIRECTIONS[code & 0b11]
+        return ((code & ~STEP_END) >> 2, CellLocation(row=row, col=col),
+                CellLocation(row=row + delta_row, col=col + delta_col))
+
+    def step_events(self, step: int
+                    ) -> Iterator[tuple[int, CellLocation, CellLocation]]:
+        begin = self.step_ends[step - 1] if step else 0
+        for idx in range(begin, self.step_ends[step]):
+            yield self.event(idx)
+
+def load_event_log(path: str) -> EventLog:
+    with open(path, "rb") as fh:
+        return EventLog(fh.read())
+
+class ReplayState:
+    """the maze as it stood after any step of a log, on a PackedVCWGrid
+
+    Moving forward applies events one step at a time.  Every
+    keyframe_every steps a snapshot of the walls and path colors is kept,
+    so seek() to an earlier step (or far ahead) restores the nearest
+    snapshot at or before it and replays at most keyframe_every steps.
+    """
+    def __init__(self, log: EventLog, keyframe_every: int=1000,
+                 wall_factory=headless_wall_path) -> None:
+        self.log = log
+        self.keyframe_every = keyframe_every
+        self.grid = PackedVCWGrid(log.cell_rows, log.cell_cols)
+        self.grid.populate_walls(wall_factory)
+        self.grid.horz_wall_bits[:] = log.horz_bits
+        self.grid.vert_wall_bits[:] = log.vert_bits
+        self.step = 0
+        self.keyframes: dict[int, tuple] = {0: self.grid.snapshot()}
+
+    def _apply(self, kind: int, from_loc: CellLocation,
+               to_loc: CellLocation) -> Any:
+        """applies one event, returns the wall it changed (or None)"""
+        if kind in (CARVE_BACKTRACKED, STEP):
+            return None
+        wall = get_wallpath_between_cell_locations(self.grid, from_loc, to_loc)
+        if kind == WALL_REMOVED:
+            wall.solid = False
+        elif kind == CELL_ENTERED:
+            wall.path_color = FORWARD_PASS_COLOR
+        else:
+            wall.path_color = BACKTRACK_COLOR
+        return wall
+
+    def advance(self, steps: int=1) -> list[Any]:
+        """moves forward up to steps steps, returns the walls changed"""
+        changed = []
+        target = min(self.step + steps, self.log.num_steps)
+        while self.step < target:
+            for event in self.log.step_events(self.step):
+                if (wall := self._apply(*event)) is not None:
+                    changed.append(wall)
+            self.step += 1
+            if (self.step % self.keyframe_every == 0
+                    and self.step not in self.keyframes):
+                self.keyframes[self.step] = self.grid.snapshot()
+        return changed
+
+    def seek(self, step: int) -> None:
+        step = max(0, min(step, self.log.num_steps))
+        keyframe = step - step % self.keyframe_every
+        while keyframe not in self.keyframes:
+            keyframe -= self.keyframe_every
+        if step < self.step or keyframe > self.step:
+            self.grid.restore(self.keyframes[keyframe])
+            self.step = keyframe
+        self.advance(step - self.step)
+
+    @property
+    def finished(self) -> bool:
+        return self.step >= self.log.num_steps
@@ -0,0 +1,50 @@
+import unittest
+import random
+
+from event_log import EventRecorder, EventLog, ReplayState
+from maze_engine import (build_grid, remove_entrance_and_exit,
+                         remove_walls_to_maze, run_maze)
+from maze_file import pack_walls
+from wall_arrays import path_color_arrays
+
+def recorded_maze(rows: int, cols: int, seed: int) -> tuple:
+    grid = build_grid(rows, cols)
+    remove_entrance_and_exit(grid)
+    recorder = EventRecorder(grid)
+    remove_walls_to_maze(grid, random.Random(seed), recorder)
+    return grid, EventLog(recorder.to_bytes())
+
+def color_names(grid) -> list:
+    horz, vert, palette = path_color_arrays(grid)
+    return [palette[code] for code in list(horz.ravel()) + list(vert.ravel())]
+
+class Tests(unittest.TestCase):
+    def test_replay_reaches_the_carved_maze(self):
+        grid, log = recorded_maze(12, 15, 4)
+        self.assertEqual(log.num_steps, log.num_events)
+        state = ReplayState(log)
+        state.advance(log.num_steps + 10)
+        self.assertTrue(state.finished)
+        self.assertEqual(pack_walls(state.grid), pack_walls(grid))
+
+    def test_replay_reaches_the_solved_colors(self):
+        grid, _ = recorded_maze(8, 9, 2)
+        recorder = EventRecorder(grid)
+        run_maze(grid, random.Random(5), recorder)
+        state = ReplayState(EventLog(recorder.to_bytes()))
+        state.seek(state.log.num_steps)
+        self.assertEqual(color_names(state.grid), color_names(grid))
+
+    def test_seek_matches_playing_forward(self):
+        _, log = recorded_maze(10, 10, 7)
+        state = ReplayState(log, keyframe_every=16)
+        state.advance(log.num_steps)
+        for step in (150, 3, 64, 0, 99):
+            straight = ReplayState(log, keyframe_every=log.num_steps + 1)
+            straight.advance(step)
+            state.seek(step)
+            self.assertEqual(state.step, step)
+            self.assertEqual(state.grid.snapshot(), straight.grid.snapshot())
+
+if __name__ == "__main__":
+    unittest.main()
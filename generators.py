@@ -0,0 +1,134 @@
+import random
+from time import perf_counter
+from typing import Any, Callable
+
+from eller import eller_into_grid
+from maze_engine import (build_grid, remove_entrance_and_exit,
+                         remove_walls_to_maze)
+from maze_rng import MazeRNG
+from vcw_grid import VCWGrid
+
+# Cells are numbered row * cell_cols + col.  Generators here only ever
+# knock down the east or south wall of a cell: Kruskal and Prim collect
+# the cells whose wall they open and hand them to grid.open_walls in one
+# go, so the grid is not called once per wall.  An edge is 2*cell for
+# the cell's east wall and 2*cell+1 for its south wall.
+
+def backtracker(grid: Any, rng=random) -> None:
+    """the original randomized depth first carve from maze_engine"""
+    remove_walls_to_maze(grid, rng)
+
+def kruskal(grid: Any, rng=random) -> None:
+    """randomized Kruskal over a union-find of cell ids, by size with
+    path halving"""
+    cols = grid.cell_cols
+    num_cells = grid.cell_rows * cols
+    edges = [2 * cell for cell in range(num_cells) if cell % cols != cols - 1]
+    edges.extend(range(1, 2 * (num_cells - cols), 2))
+    rng.shuffle(edges)
+    parent = list(range(num_cells))
+    size = [1] * num_cells
+    opened: list[int] = []
+    remaining = num_cells - 1
+    for edge in edges:
+        if not remaining:
+            break
+        # a and b walk up to their roots, halving the path as they go
+        a = edge >> 1
+        b = a + cols if edge & 1 else a + 1
+        while parent[a] != a:
+            parent[a] = a = parent[parent[a]]
+        while parent[b] != b:
+            parent[b] = b = parent[parent[b]]
+        if a != b:
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+            opened.append(edge)
+            remaining -= 1
+    grid.open_walls([edge >> 1 for edge in opened if not edge & 1],
+                    [edge >> 1 for edge in opened if edge & 1])
+
+def prim(grid: Any, rng=random) -> None:
+    """randomized Prim, frontier kept in a flat list with swap-remove"""
+    cols = grid.cell_cols
+    num_cells = grid.cell_rows * cols
+    last_row = num_cells - cols
+    OUT, FRONTIER, IN = 0, 1, 2
+    state = bytearray(num_cells)
+    frontier: list[int] = []
+    opened: list[int] = []
+    randrange = rng.randrange
+
+    cell = randrange(num_cells)
+    while True:
+        state[cell] = IN
+        # neighbors join the frontier in N, S, E, W order
+        col = cell % cols
+        for neigh, inside in ((cell - cols, cell >= cols),
+                              (cell + cols, cell < last_row),
+                              (cell + 1, col < cols - 1),
+                              (cell - 1, col > 0)):
+            if inside and state[neigh] == OUT:
+                state[neigh] = FRONTIER
+                frontier.append(neigh)
+        if not frontier:
+            break
+        idx = randrange(len(frontier))
+        cell = frontier[idx]
+        frontier[idx] = frontier[-1]
+        frontier.pop()
+        # edges to the maze cells next to it, again N, S, E, W
+        col = cell % cols
+        joined = []
+        if cell >= cols and state[cell - cols] == IN:
+            joined.append(2 * (cell - cols) + 1)
+        if cell < last_row and state[cell + cols] == IN:
+            joined.append(2 * cell + 1)
+        if col < cols - 1 and state[cell + 1] == IN:
+            joined.append(2 * cell)
+        if col > 0 and state[cell - 1] == IN:
+            joined.append(2 * (cell - 1))
+        opened.append(joined[randrange(len(joined))])
+    grid.open_walls([edge >> 1 for edge in opened if not edge & 1],
+                    [edge >> 1 for edge in opened if edge & 1])
+
+def eller(grid: Any, rng=random) -> None:
+    eller_into_grid(grid, rng)
+
+GENERATORS: dict[str, Callable[..., None]] = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+    "eller": eller,
+}
+
+def get_generator(name: str) -> Callable[..., None]:
+    try:
+        return GENERATORS[name]
+    except KeyError:
+        raise Exception(f"Unknown generator {name!r}, "
+                        f"expected one of {sorted(GENERATORS)}") from None
+
+def generate(cell_rows: int, cell_cols: int, generator: str="backtracker",
+             rng=random, grid_class=VCWGrid, **grid_kwargs) -> Any:
+    """builds a grid, opens entrance and exit and carves it with generator"""
+    carve = get_generator(generator)
+    grid = build_grid(cell_rows, cell_cols, grid_class=grid_class,
+                      **grid_kwargs)
+    remove_entrance_and_exit(grid)
+    carve(grid, rng)
+    return grid
+
+def time_generators(cell_rows: int, cell_cols: int, seed: int=0,
+                    names=None, grid_class=VCWGrid) -> dict[str, float]:
+    """seconds each generator takes on a fresh grid of the given size"""
+    timings = {}
+    for name in names or GENERATORS:
+        grid = build_grid(cell_rows, cell_cols, grid_class=grid_class)
+        carve = get_generator(name)
+        start = perf_counter()
+        carve(grid, MazeRNG(seed))
+        timings[name] = perf_counter() - start
+    return timings
@@ -0,0 +1,70 @@
+import unittest
+import random
+
+from generators import GENERATORS, generate, get_generator
+from maze_engine import build_grid
+from maze_engine_test import border_intact, count_open_walls
+from maze_file import pack_walls
+from packed_grid import PackedVCWGrid
+from solvers import bfs
+from vcw_grid import VCWGrid
+
+class Tests(unittest.TestCase):
+    def test_every_generator_makes_perfect_maze(self):
+        for name in GENERATORS:
+            for grid_class in (VCWGrid, PackedVCWGrid):
+                # one column or one row make east and south ids ambiguous
+                for rows, cols in ((11, 17), (4, 1), (1, 5)):
+                    grid = generate(rows, cols, name, rng=random.Random(3),
+                                    grid_class=grid_class)
+                    case = (name, grid_class, rows, cols)
+                    self.assertEqual(count_open_walls(grid),
+                                     rows * cols - 1 + 2, case)
+                    self.assertTrue(border_intact(grid), case)
+                    self.assertTrue(bfs(grid).solved, case)
+
+    def test_open_walls_matches_open_wall_between(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            for rows, cols in ((5, 7), (4, 1)):
+                bulk = build_grid(rows, cols, grid_class=grid_class)
+                one_by_one = build_grid(rows, cols, grid_class=grid_class)
+                east = [cell for cell in range(0, rows * cols, 2)
+                        if cell % cols < cols - 1]
+                south = list(range(1, (rows - 1) * cols, 3))
+                version = bulk.wall_version
+                bulk.open_walls(east, south)
+                self.assertGreater(bulk.wall_version, version)
+                for cell in east:
+                    one_by_one.open_wall_between(cell, cell + 1)
+                for cell in south:
+                    one_by_one.open_wall_between(cell, cell + cols)
+                self.assertEqual(pack_walls(bulk), pack_walls(one_by_one),
+                                 (grid_class, rows, cols))
+
+    def test_generators_are_reproducible(self):
+        for name in GENERATORS:
+            walls = []
+            for _ in range(2):
+                grid = generate(8, 8, name, rng=random.Random(11),
+                                grid_class=PackedVCWGrid)
+                walls.append(bytes(grid._horz) + bytes(grid._vert))
+            self.assertEqual(walls[0], walls[1], name)
+
+    def test_backends_carve_the_same_walls(self):
+        for name in ("kruskal", "prim"):
+            solid = []
+            for grid_class in (VCWGrid, PackedVCWGrid):
+                grid = generate(6, 9, name, rng=random.Random(4),
+                                grid_class=grid_class)
+                walls = []
+                grid.map_walls(lambda w: walls.append(w.solid))
+                solid.append(walls)
+            self.assertEqual(solid[0], solid[1], name)
+
+    def test_unknown_generator(self):
+        with self.assertRaises(Exception):
+            get_generator("sidewinder")
+
+
+if __name__ == "__main__":
+    unittest.main()
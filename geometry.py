@@ -1,4 +1,3 @@
-from tkinter import Tk, BOTH, Canvas
 from typing import Any, Self
 from dataclasses import dataclass
 
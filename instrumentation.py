@@ -0,0 +1,132 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional
+
+from geometry import CellLocation
+from maze_engine import MazeObserver
+
+@dataclass
+class PhaseReport:
+    name: str
+    seconds: float = 0.0
+    counters: dict[str, int] = field(default_factory=dict)
+
+@dataclass
+class RunReport:
+    phases: list[PhaseReport]
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(phase.seconds for phase in self.phases)
+
+    @property
+    def totals(self) -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for phase in self.phases:
+            for name, value in phase.counters.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"phases": [asdict(phase) for phase in self.phases],
+                "total_seconds": self.total_seconds,
+                "totals": self.totals}
+
+    def format(self) -> str:
+        lines = []
+        for phase in self.phases:
+            counters = ", ".join(f"{name}={value}" for name, value
+                                 in sorted(phase.counters.items()))
+            lines.append(f"{phase.name:<24}{phase.seconds:10.4f} s  {counters}")
+        lines.append(f"{'total':<24}{self.total_seconds:10.4f} s")
+        return "\n".join(lines)
+
+class Instrumentation:
+    """wall clock per phase plus counters attributed to the running phase
+
+    Counters come from count() calls, usually via InstrumentingObserver,
+    and from sources: callables returning running totals (e.g. a Window's
+    item and redraw counts) that are sampled at the start and end of each
+    phase so the phase gets the difference.  on_step, when given, is
+    called as on_step(phase_name, phase_counters) on every engine step.
+    """
+    def __init__(self, on_step: Optional[Callable[[str, dict], None]]=None
+                 ) -> None:
+        self.on_step = on_step
+        self.phases: list[PhaseReport] = []
+        self.current: Optional[PhaseReport] = None
+        self._sources: list[Callable[[], dict[str, int]]] = []
+
+    def add_source(self, source: Callable[[], dict[str, int]]) -> None:
+        self._sources.append(source)
+
+    def _sample_sources(self) -> dict[str, int]:
+        sample: dict[str, int] = {}
+        for source in self._sources:
+            sample.update(source())
+        return sample
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseReport]:
+        outer = self.current
+        report = PhaseReport(name=name)
+        self.phases.append(report)
+        self.current = report
+        before = self._sample_sources()
+        start = perf_counter()
+        try:
+            yield report
+        finally:
+            report.seconds = perf_counter() - start
+            for counter, value in self._sample_sources().items():
+                if delta := value - before.get(counter, 0):
+                    self.count(counter, delta)
+            self.current = outer
+
+    def steps_in_phase(self, name: str, steps: Iterator[Any]) -> Iterator[Any]:
+        """steps run inside phase name, for generators driven a step at a
+        time (e.g. by Window.animate) rather than by a with block"""
+        with self.phase(name):
+            return (yield from steps)
+
+    def count(self, counter: str, amount: int=1) -> None:
+        if self.current is None:
+            return
+        counters = self.current.counters
+        counters[counter] = counters.get(counter, 0) + amount
+
+    def step(self) -> None:
+        self.count("steps")
+        if self.on_step and self.current is not None:
+            self.on_step(self.current.name, self.current.counters)
+
+    def report(self) -> RunReport:
+        return RunReport(phases=list(self.phases))
+
+class InstrumentingObserver(MazeObserver):
+    """counts engine events into an Instrumentation, then passes them on"""
+    def __init__(self, instrumentation: Instrumentation,
+                 inner: Optional[MazeObserver]=None) -> None:
+        self.instrumentation = instrumentation
+        self.inner = inner or MazeObserver()
+
+    def wall_removed(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.instrumentation.count("walls_removed")
+        self.instrumentation.count("cells_visited")
+        self.inner.wall_removed(wall, from_loc, to_loc)
+
+    def cell_entered(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.instrumentation.count("cells_visited")
+        self.inner.cell_entered(wall, from_loc, to_loc)
+
+    def backtracked(self, wall: Any, from_loc: CellLocation,
+                    to_loc: CellLocation) -> None:
+        self.instrumentation.count("backtracks")
+        self.inner.backtracked(wall, from_loc, to_loc)
+
+    def step(self) -> None:
+        self.instrumentation.step()
+        self.inner.step()
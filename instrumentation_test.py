@@ -0,0 +1,57 @@
+import unittest
+import random
+
+from instrumentation import Instrumentation, InstrumentingObserver
+from maze_engine import (build_grid, remove_entrance_and_exit,
+                         remove_walls_to_maze, remove_walls_steps, run_maze)
+
+class Tests(unittest.TestCase):
+    def test_counters_are_per_phase(self):
+        steps_seen = []
+        instrumentation = Instrumentation(
+            on_step=lambda phase, counters: steps_seen.append(phase))
+        grid = build_grid(6, 7)
+        remove_entrance_and_exit(grid)
+        with instrumentation.phase("generate"):
+            remove_walls_to_maze(grid, random.Random(2),
+                                 InstrumentingObserver(instrumentation))
+        with instrumentation.phase("solve"):
+            run_maze(grid, random.Random(2),
+                     InstrumentingObserver(instrumentation))
+        generate, solve = instrumentation.report().phases
+        self.assertEqual(generate.counters["walls_removed"], 6 * 7 - 1)
+        self.assertEqual(generate.counters["backtracks"], 6 * 7 - 1)
+        self.assertNotIn("walls_removed", solve.counters)
+        self.assertEqual(set(steps_seen), {"generate", "solve"})
+        self.assertEqual(len(steps_seen),
+                         generate.counters["steps"] + solve.counters["steps"])
+
+    def test_sources_record_deltas(self):
+        totals = {"redraws": 10}
+        instrumentation = Instrumentation()
+        instrumentation.add_source(lambda: dict(totals))
+        with instrumentation.phase("draw"):
+            totals["redraws"] += 5
+        with instrumentation.phase("idle"):
+            pass
+        report = instrumentation.report()
+        self.assertEqual(report.phases[0].counters, {"redraws": 5})
+        self.assertEqual(report.phases[1].counters, {})
+        self.assertEqual(report.as_dict()["totals"], {"redraws": 5})
+
+    def test_steps_in_phase_spans_a_stepped_generator(self):
+        instrumentation = Instrumentation()
+        grid = build_grid(4, 5)
+        remove_entrance_and_exit(grid)
+        steps = instrumentation.steps_in_phase("generate", remove_walls_steps(
+            grid, random.Random(3), InstrumentingObserver(instrumentation)))
+        next(steps)
+        self.assertEqual(instrumentation.current.name, "generate")
+        for _ in steps:
+            pass
+        self.assertIsNone(instrumentation.current)
+        generate, = instrumentation.report().phases
+        self.assertEqual(generate.counters["walls_removed"], 4 * 5 - 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,301 +1,297 @@
+"""generate and solve a maze, animated in a Tk window or headless
+
+    python main.py 20 27
+    python main.py 500 500 --seed 7 --generator kruskal --solver astar \\
+        --headless --output maze.png
+    python main.py 30 40 --headless --record run.vcwl
+    python main.py --replay run.vcwl
+
+Importing this module does nothing.  tkinter is only loaded when a window
+is asked for, so headless runs and worker processes never touch a
+display.  --output picks the format from the extension: .png/.ppm
+(needs numpy), .svg or .vcwm (maze_file).
+"""
+import argparse
+import os
 import random
-from time import sleep
-from pprint import pp
-
-from geometry import Point, Line, CellLocation
-from vcw_grid import VCWGrid, VCWGridLoc
-from maze_elements import Cell, Vertex, WallPath
-from screen_coordinate_calculator import ScreenCoordinatCalculator
-from window import Window
-
-from maze_size import MazeSize
-DEBUG = 0
-
-if DEBUG:
-    NUM_ROWS     = 6
-    NUM_COLS     = 8
-    CELL_SIZE    = 85
-    BORDER_WIDTH = 25
-    random.seed(42)
-elif DEBUG is None:
-    # silly trick for quick running with no output to logging
-    NUM_ROWS     = 8
-    NUM_COLS     = 11
-    CELL_SIZE    = 35
-    BORDER_WIDTH = 25
-    random.seed(4177)
-else:
-    NUM_ROWS     = 20
-    NUM_COLS     = 27
-    CELL_SIZE    = 35
-    BORDER_WIDTH = 5
-    seed = random.randint(1, 65536)
-    random.seed(seed)
-    print("seed=",seed)
-
-maze_size = MazeSize(cell_rows=NUM_ROWS, cell_cols=NUM_COLS)
-
-print(maze_size.vertex_cols)
-
-class GridToScreenTranslator:
-    def __init__(self, num_rows: int, num_cols: int,
-                 cell_size_in_pixels: int,
-                 border_width_in_pixels: int) -> None:
-        self.cell_rows = num_rows
-        self.cell_cols = num_cols
-        self.vertex_rows = num_rows + 1
-        self.vertex_cols = num_cols + 1
-        if cell_size_in_pixels % 2 == 0: # even sizes have no center pixel
-            cell_size_in_pixels += 1
-        self.cell_size = cell_size_in_pixels
-        self.half_cell = cell_size_in_pixels//2
-        self.upper_corner = Point(x=border_width_in_pixels, 
-                                  y=border_width_in_pixels)
-        screen_width = (2 * border_width_in_pixels
-            + num_cols * cell_size_in_pixels)
-        screen_height = (2 * border_width_in_pixels
-            + num_rows * cell_size_in_pixels)
-        self.size = { "width": screen_width, "height": screen_height }
-        self.vertex_grid = self.create_vertex_coordinates()
-
-    def create_vertex_coordinates(self):
-        vertex_grid = []
-        for row in range(self.vertex_rows):
-            new_row = []
-            for col in range(self.vertex_cols):
-                x_coord = self.upper_corner.x + col * self.cell_size
-                y_coord = self.upper_corner.y + row * self.cell_size
-                new_row.append(Point(x=x_coord, y=y_coord))
-            vertex_grid.append(new_row)
-        return vertex_grid
-
-    def cell_center_point(self, loc: CellLocation) -> Point:
-        x_coord = ( self.upper_corner.x
-                  + loc.col * self.cell_size
-                  + self.half_cell
-                  + 1)
-        y_coord = ( self.upper_corner.y
-                  + loc.row * self.cell_size
-                  + self.half_cell
-                  + 1)
-        return Point(x=x_coord, y=y_coord)
-
-    def get_line_for_wall(self, indexes: VCWGridLoc) -> Line:
-        if indexes.row % 2 == 0: # horz_wall
-            horz_row = indexes.row//2
-            horz_start_col = indexes.col//2
-            horz_end_col = horz_start_col + 1
-            if DEBUG:
-                print(f"HW({horz_start_col=},{horz_end_col=}), {horz_row=}")
-            return Line(start=self.vertex_grid[horz_row][horz_start_col],
-                        end=self.vertex_grid[horz_row][horz_end_col])
-        else:
-            vert_start_row = indexes.row//2
-            vert_end_row = vert_start_row + 1
-            vert_col = indexes.col//2
-            if DEBUG:
-                print(f"VW:({vert_start_row=},{vert_end_row=}),{vert_col=}")
-            return Line(start=self.vertex_grid[vert_start_row][vert_col],
-                        end=self.vertex_grid[vert_end_row][vert_col])
-
-    def get_line_for_path(self, indexes: VCWGridLoc) -> Line:
-        vert = self.vertex_grid[indexes.row//2][indexes.col//2]
-        if indexes.row % 2 == 0: # vert_path
-            x        = vert.x + self.half_cell
-            first_y  = vert.y - self.half_cell
-            second_y = vert.y + self.half_cell
-            first_point  = Point(x=x, y=first_y)
-            second_point = Point(x=x, y=second_y)
-        else:
-            first_x  = vert.x - self.half_cell
-            second_x = vert.x + self.half_cell
-            y        = vert.y + self.half_cell
-            first_point  = Point(x=first_x, y=y)
-            second_point = Point(x=second_x, y=y)
-        return Line(start=first_point, end=second_point)
-
-    def generate_wall_path_line(self, grid_idx: VCWGridLoc) -> WallPath:
-        return WallPath(wall=self.get_line_for_wall(grid_idx),
-                        path=self.get_line_for_path(grid_idx))
-
-screen = GridToScreenTranslator(num_rows=NUM_ROWS, num_cols=NUM_COLS,
-                                cell_size_in_pixels=CELL_SIZE,
-                                border_width_in_pixels=BORDER_WIDTH)
-win = Window(**screen.size)
-
-if DEBUG:
-    print(screen.vertex_grid)
-
-def remove_entrance_and_exit(maze: VCWGrid) -> None:
-    maze.get_north_wall(CellLocation(row=0, col=0)).solid = False
-    maze.get_south_wall(CellLocation(row=screen.cell_rows-1, 
-                                     col=screen.cell_cols-1)).solid = False
-
-def draw_walls_and_paths(wall_path: WallPath):
-    if not wall_path:
-        return
-    if wall_path.solid:
-        win.draw_line(wall_path.wall, "black")
+from typing import Any, Optional
+
+from generators import GENERATORS, get_generator
+from geometry import CellLocation
+from instrumentation import Instrumentation, InstrumentingObserver
+from maze_elements import Cell
+from maze_engine import (build_grid, get_wallpath_between_cell_locations,
+                         remove_entrance_and_exit, remove_walls_steps,
+                         remove_walls_to_maze, run_maze, run_maze_steps)
+from maze_rng import MazeRNG
+from packed_grid import PackedVCWGrid
+from screen_coordinate_calculator import GridToScreenTranslator
+from solvers import SOLVERS
+from vcw_grid import VCWGrid
+
+SOLVER_NAMES = ("run_maze", *sorted(SOLVERS))
+OUTPUT_FORMATS = (".png", ".ppm", ".svg", ".vcwm")
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int, nargs="?", default=20)
+    parser.add_argument("cols", type=int, nargs="?", default=27)
+    parser.add_argument("--seed", type=int,
+                        help="random seed, picked and printed if not given")
+    parser.add_argument("--generator", choices=sorted(GENERATORS),
+                        default="backtracker")
+    parser.add_argument("--solver", choices=SOLVER_NAMES, default="run_maze")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, just generate, solve and --output")
+    parser.add_argument("--output", help="also save the solved maze here")
+    parser.add_argument("--record",
+                        help="write the engine's events to this log")
+    parser.add_argument("--replay",
+                        help="play back a --record log instead of a maze")
+    parser.add_argument("--zoomable", action="store_true",
+                        help="pan/zoom view, used anyway for mazes larger "
+                             "than the screen")
+    parser.add_argument("--cell-size", type=int, default=35)
+    parser.add_argument("--border", type=int, default=5)
+    args = parser.parse_args(argv)
+    if args.output:
+        extension = os.path.splitext(args.output)[1].lower()
+        if extension not in OUTPUT_FORMATS:
+            parser.error(f"--output must end in one of {OUTPUT_FORMATS}")
+    if args.replay and args.headless:
+        parser.error("--replay needs a window, it cannot be --headless")
+    if args.seed is None:
+        args.seed = random.randint(1, 65536)
+    return args
+
+def record_from(grid: Any, args: argparse.Namespace,
+                observer: Any=None) -> Any:
+    """observer wrapped in an EventRecorder when --record is given, the
+    log starting from the walls grid has now"""
+    if not args.record:
+        return observer
+    from event_log import EventRecorder
+    return EventRecorder(grid, observer)
+
+def save_recording(observer: Any, args: argparse.Namespace) -> None:
+    if args.record:
+        with open(args.record, "wb") as fh:
+            observer.write(fh)
+
+def solve(grid: Any, solver: str, rng=random,
+          observer: Any=None) -> tuple[bool, list]:
+    """(solved, route); run_maze paints its route onto the walls instead"""
+    if solver == "run_maze":
+        return run_maze(grid, rng, observer), []
+    result = SOLVERS[solver](grid)
+    return result.solved, result.path
+
+def save_output(grid: Any, path: str, route: Optional[list]=None,
+                screen: Any=None, seed: int=0, generator: str="") -> None:
+    """writes grid to path in the format its extension names"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".png", ".ppm"):
+        from raster import render, save_image
+        save_image(render(grid, screen, route=route), path)
+    elif extension == ".svg":
+        from svg_export import save_svg
+        save_svg(grid, path, screen=screen, route=route)
+    elif extension == ".vcwm":
+        from maze_file import save_maze
+        save_maze(grid, path, seed=seed, generator=generator)
     else:
-        if color := wall_path.path_color:
-            win.draw_line(wall_path.path, color)
-
-def get_unvisited_neighbors(grid: VCWGrid, 
-                            loc: CellLocation) -> list[CellLocation]:
-    def cell_is_not_visited(loc: CellLocation) -> bool:
-        return not maze_grid.get_cell(loc).visited
-    raw_neighs = maze_grid.get_adjacent_cell_locations(loc)
-    result = list(filter(cell_is_not_visited, raw_neighs))
-    return result
-
-def remove_wall_with_render(wall: WallPath):
-    wall.solid = False
-    win.draw_line(wall.wall, "white")
-
-def get_wallpath_between_cell_locations(from_loc: CellLocation, 
-                                        to_loc: CellLocation) -> WallPath:
-    delta_row_col = to_loc.row - from_loc.row, to_loc.col - from_loc.col
-    match delta_row_col:
-        case (-1, 0): # North
-            if DEBUG:
-                print(f"North")
-            return maze_grid.get_north_wall(from_loc)
-        case (1, 0): # South
-            if DEBUG:
-                print(f"South")
-            return maze_grid.get_south_wall(from_loc)
-        case (0, -1): # 
-            if DEBUG:
-                print(f"West")
-            return maze_grid.get_west_wall(from_loc)
-        case (0, 1):
-            if DEBUG:
-                print(f"East")
-            return maze_grid.get_east_wall(from_loc)
-
-def remove_walls_to_maze():
-    start = CellLocation(row=screen.cell_rows-1, col=screen.cell_cols-1)
-    path_walked = [start]
-    curr_cell = start
-    while True:
-        maze_grid.get_cell(curr_cell).visited = True
-        viable_neighbors = get_unvisited_neighbors(maze_grid, curr_cell)
-        if viable_neighbors:
-            if DEBUG:
-                print(f"{viable_neighbors=}")
-            next_cell = random.choice(viable_neighbors)
-            if DEBUG:
-                print(f"{next_cell=}")
-            between = get_wallpath_between_cell_locations(curr_cell, next_cell)
-            if DEBUG:
-                print(f"{between=}")
-            
-            remove_wall_with_render(between)
-            path_walked.append(next_cell)
-            curr_cell = next_cell
-        else:
-            path_walked.pop()            
-            if not path_walked:   # empty path means we are done
-                break
-            curr_cell = path_walked[-1]
-        win.redraw()
-
-def mark_cell_unvisited(cell: Cell) -> None:
-    cell.visited = False
-
-def run_maze() -> bool:
-    def get_reachable_unvisited_neighbors(
-            loc: CellLocation) -> list[CellLocation]:
-        def path_exists_between(neigh):
-            between: WallPath = get_wallpath_between_cell_locations(loc, neigh)
-            wall_between_is_solid = between.solid
-            return not wall_between_is_solid
-        unvisited = get_unvisited_neighbors(maze_grid, loc)
-        return list(filter(path_exists_between, unvisited))
-
-    def color_backtrack_path_backtrack_color(from_loc: CellLocation, 
-                                             to_loc: CellLocation) -> None:
-        backtrack_color = "goldenrod2"
-        wall_between = get_wallpath_between_cell_locations(from_loc, to_loc)
-        wall_between.path_color = backtrack_color
-        win.draw_line(wall_between.path, backtrack_color)
-
-    def color_forward_path_forward_pass_color(from_loc: CellLocation, 
-                                              to_loc: CellLocation) -> None:
-        forward_pass_color = "blue"
-        wall_between = get_wallpath_between_cell_locations(from_loc, to_loc)
-        wall_between.path_color = forward_pass_color
-        win.draw_line(wall_between.path, forward_pass_color)
-
-    start = CellLocation(row=0, col=0)
-    destination_cell = CellLocation(row=screen.cell_rows-1, 
-                                    col=screen.cell_cols-1)
-    path_walked = [start]
-    curr_cell = start
-    while True:
-        sleep(0.1)
-        maze_grid.get_cell(curr_cell).visited = True
-        viable_neighbors = get_reachable_unvisited_neighbors(curr_cell)
-        if curr_cell == destination_cell:
+        raise Exception(f"Don't know how to write {path!r}, "
+                        f"expected one of {OUTPUT_FORMATS}")
+
+def run_headless(args: argparse.Namespace) -> bool:
+    rng = MazeRNG(args.seed)
+    grid = build_grid(args.rows, args.cols, grid_class=PackedVCWGrid)
+    remove_entrance_and_exit(grid)
+    # only backtracker carves through the engine, so only it is recorded
+    if args.generator == "backtracker":
+        observer = record_from(grid, args)
+        remove_walls_to_maze(grid, rng, observer)
+    else:
+        get_generator(args.generator)(grid, rng)
+        observer = record_from(grid, args)
+    solved, route = solve(grid, args.solver, rng, observer)
+    print("Maze solved" if solved else "Maze is not solvable")
+    save_recording(observer, args)
+    if args.output:
+        save_output(grid, args.output, route, seed=args.seed,
+                    generator=args.generator)
+    return solved
+
+def run_gui(args: argparse.Namespace) -> None:
+    """builds the maze on screen, animating backtracker and run_maze
+
+    A maze that fits the screen is drawn whole, one canvas item per wall.
+    A larger one, or any with --zoomable, goes in a window the size of the
+    screen through a MazeView, which only draws what is in sight.
+    """
+    from window import Window
+
+    # GridToScreenTranslator's sizing, without its per-vertex table
+    cell_size = args.cell_size | 1
+    width = 2 * args.border + args.cols * cell_size
+    height = 2 * args.border + args.rows * cell_size
+    win = Window(1, 1)
+    screen_width, screen_height = win.screen_size()
+    if args.zoomable or width > screen_width or height > screen_height:
+        win.resize(min(width, screen_width), min(height, screen_height))
+        run_zoomable(args, win)
+    else:
+        win.resize(width, height)
+        run_full_canvas(args, win, GridToScreenTranslator(
+            num_rows=args.rows, num_cols=args.cols,
+            cell_size_in_pixels=args.cell_size,
+            border_width_in_pixels=args.border))
+
+def run_zoomable(args: argparse.Namespace, win: Any) -> None:
+    """drag pans, the wheel zooms; steps run as fast as frames allow"""
+    from maze_view import MazeView
+
+    rng = MazeRNG(args.seed)
+    instrumentation = Instrumentation()
+    with instrumentation.phase("grid_construction"):
+        grid = build_grid(args.rows, args.cols, grid_class=PackedVCWGrid)
+    remove_entrance_and_exit(grid)
+    view = MazeView(win.canvas, grid, cell_pixels=args.cell_size)
+    view.bind()
+    observer = InstrumentingObserver(instrumentation, view.observer())
+
+    def carved(_: Any=None) -> None:
+        view.invalidate()
+        win.after(500, start_solving)
+
+    def start_solving() -> None:
+        if args.solver == "run_maze":
+            win.animate(instrumentation.steps_in_phase("run_maze",
+                run_maze_steps(grid, rng, observer)), on_done=finished)
+            return
+        with instrumentation.phase(args.solver):
+            result = SOLVERS[args.solver](grid)
+        # MazeView shows path colors, so the route is painted on the walls
+        for a, b in zip(result.path, result.path[1:]):
+            get_wallpath_between_cell_locations(grid, a, b).path_color = "red"
+        finished(result.solved, result.path)
+
+    def finished(solved: bool, route: Optional[list]=None) -> None:
+        view.invalidate()
+        print("Maze solved" if solved else "Maze is not solvable")
+        print(instrumentation.report().format())
+        save_recording(observer, args)
+        if args.output:
+            save_output(grid, args.output, route, seed=args.seed,
+                        generator=args.generator)
+
+    if args.generator == "backtracker":
+        observer = record_from(grid, args, observer)
+        win.animate(instrumentation.steps_in_phase("remove_walls_to_maze",
+            remove_walls_steps(grid, rng, observer)), on_done=carved)
+    else:
+        with instrumentation.phase(args.generator):
+            get_generator(args.generator)(grid, rng)
+        observer = record_from(grid, args, observer)
+        carved()
+    win.wait_for_close()
+
+def run_full_canvas(args: argparse.Namespace, win: Any, screen: Any) -> None:
+    from tk_drawing import TkMazeObserver, draw_wall_path
+
+    rng = MazeRNG(args.seed)
+    instrumentation = Instrumentation()
+    instrumentation.add_source(win.counters)
+
+    def draw_dot(loc: CellLocation, name: str) -> None:
+        win.draw_point(screen.cell_center_point(loc), "blue",
+                       width=screen.half_cell // 2, key=("dot", name))
+
+    observer = InstrumentingObserver(instrumentation, TkMazeObserver(win))
+
+    with instrumentation.phase("grid_construction"):
+        grid = VCWGrid(cell_rows=screen.cell_rows, cell_cols=screen.cell_cols)
+        grid.populate_cells(lambda loc: Cell(loc=loc, visited=False))
+    with instrumentation.phase("populate_walls"):
+        grid.populate_walls(screen.generate_wall_path_line)
+    draw_dot(CellLocation(row=0, col=0), "start")
+    remove_entrance_and_exit(grid)
+    with instrumentation.phase("map_walls_draw"):
+        grid.map_walls(lambda wall: draw_wall_path(win, wall))
+
+    def carved(_: Any=None) -> None:
+        with instrumentation.phase("map_walls_redraw"):
+            grid.map_walls(lambda wall: draw_wall_path(win, wall))
+        win.redraw(force=True)
+        win.after(500, start_solving)
+
+    def start_solving() -> None:
+        draw_dot(CellLocation(row=0, col=0), "start")
+        if args.solver == "run_maze":
+            win.animate(instrumentation.steps_in_phase("run_maze",
+                run_maze_steps(grid, rng, observer)),
+                interval_ms=100, on_done=finished)
+            return
+        with instrumentation.phase(args.solver):
+            result = SOLVERS[args.solver](grid)
+        for idx, (a, b) in enumerate(zip(result.path, result.path[1:])):
+            wall = get_wallpath_between_cell_locations(grid, a, b)
+            win.draw_line(wall.path, "red", key=("route", idx))
+        finished(result.solved, result.path)
+
+    def finished(solved: bool, route: Optional[list]=None) -> None:
+        if solved:
             print("Maze solved")
-            return True
-        if viable_neighbors:
-            next_cell = random.choice(viable_neighbors)
-            color_forward_path_forward_pass_color(curr_cell, next_cell)
-            path_walked.append(next_cell)
-            curr_cell = next_cell
+            draw_dot(CellLocation(row=screen.cell_rows - 1,
+                                  col=screen.cell_cols - 1), "end")
+            win.redraw(force=True)
         else:
-            prev_cell = path_walked.pop()
-            if not path_walked:
-                print("Maze is not solvable")
-                return False
-            curr_cell = path_walked[-1]
-            color_backtrack_path_backtrack_color(prev_cell, curr_cell)
-        win.redraw()
-
-def draw_start_location_dot():
-    width = screen.half_cell//2
-    start_coord = screen.cell_center_point(CellLocation(row=0,col=0))
-    win.draw_point(start_coord, "blue", width=width)
-
-def draw_end_location_dot():
-    width = screen.half_cell//2
-    end_coord = screen.cell_center_point(CellLocation(row=screen.cell_rows-1,
-                                                      col=screen.cell_cols-1))
-    win.draw_point(end_coord, "blue", width=width)
-
-maze_grid = VCWGrid(cell_rows=screen.cell_rows, cell_cols=screen.cell_cols)
-if DEBUG:
-    print("------------------------------------------ start -")
-    pp(maze_grid._grid)
-    print("------------------------------------------ end ---")
-maze_grid.populate_walls(screen.generate_wall_path_line)
-if DEBUG:
-    print("------------------------------------------ start -")
-    print(maze_grid._grid)
-    print("------------------------------------------ end ---")
-for cell_loc in maze_grid.cells_locs():
-    maze_grid.set_cell(cell_loc, Cell(loc=cell_loc, visited=False))
-draw_start_location_dot()
-remove_entrance_and_exit(maze_grid)
-maze_grid.map_walls(draw_walls_and_paths)
-remove_walls_to_maze()
-maze_grid.map_walls(draw_walls_and_paths)
-maze_grid.map_cells(mark_cell_unvisited)
-if DEBUG:
-    pp(maze_grid._grid)
-    win.draw_line(maze_grid.get_north_wall(
-        CellLocation(row=2, col=1)).wall, "green2")
-    win.draw_line(maze_grid.get_south_wall(
-        CellLocation(row=2, col=1)).wall, "blue")
-    win.draw_line(maze_grid.get_east_wall(
-        CellLocation(row=2, col=1)).wall, "violet")
-    win.draw_line(maze_grid.get_west_wall(
-        CellLocation(row=2, col=1)).wall, "gold3")
-win.redraw()
-sleep(0.5)
-draw_start_location_dot()
-if run_maze():
-    draw_end_location_dot()
-win.wait_for_close()
+            print("Maze is not solvable")
+        print(instrumentation.report().format())
+        save_recording(observer, args)
+        if args.output:
+            save_output(grid, args.output, route, screen=screen,
+                        seed=args.seed, generator=args.generator)
+
+    if args.generator == "backtracker":
+        observer = record_from(grid, args, observer)
+        win.animate(instrumentation.steps_in_phase("remove_walls_to_maze",
+            remove_walls_steps(grid, rng, observer)), on_done=carved)
+    else:
+        with instrumentation.phase(args.generator):
+            get_generator(args.generator)(grid, rng)
+        observer = record_from(grid, args, observer)
+        carved()
+    win.wait_for_close()
+
+def run_replay(args: argparse.Namespace) -> None:
+    """plays a --record log: space pauses, arrows scrub, +/- set speed"""
+    from event_log import load_event_log
+    from replay_player import ReplayPlayer
+    from window import Window
+
+    log = load_event_log(args.replay)
+    screen = GridToScreenTranslator(num_rows=log.cell_rows,
+                                    num_cols=log.cell_cols,
+                                    cell_size_in_pixels=args.cell_size,
+                                    border_width_in_pixels=args.border)
+    win = Window(**screen.size)
+    player = ReplayPlayer(win, log, screen)
+    player.bind_keys()
+    player.draw_all()
+    player.play()
+    win.wait_for_close()
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.replay:
+        run_replay(args)
+        return
+    print("seed=", args.seed)
+    if args.headless:
+        run_headless(args)
+    else:
+        run_gui(args)
 
+if __name__ == "__main__":
+    main()
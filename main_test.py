@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from main import main, parse_args
+from event_log import ReplayState, load_event_log
+from maze_file import load_maze, pack_walls
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+class Tests(unittest.TestCase):
+    def test_import_and_headless_run_skip_tkinter(self):
+        code = ("import sys, main; main.main(['6', '7', '--seed', '3', "
+                "'--headless']); print('tkinter' in sys.modules)")
+        out = subprocess.run([sys.executable, "-c", code], cwd=HERE,
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.splitlines()[-1], "False")
+        self.assertIn("Maze solved", out.stdout)
+
+    def test_headless_output_by_extension(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            svg = os.path.join(tmp, "maze.svg")
+            main(["9", "11", "--seed", "5", "--headless", "--solver", "bfs",
+                  "--output", svg])
+            with open(svg) as fh:
+                self.assertIn("<polyline", fh.read())
+            vcwm = os.path.join(tmp, "maze.vcwm")
+            main(["9", "11", "--seed", "5", "--generator", "eller",
+                  "--headless", "--output", vcwm])
+            grid, header = load_maze(vcwm, use_mmap=False)
+            self.assertEqual((grid.cell_rows, grid.cell_cols), (9, 11))
+            self.assertEqual((header.seed, header.generator), (5, "eller"))
+
+    def test_recorded_log_replays_to_the_saved_maze(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = os.path.join(tmp, "run.vcwl")
+            vcwm = os.path.join(tmp, "maze.vcwm")
+            main(["7", "8", "--seed", "2", "--headless", "--record", log_path,
+                  "--output", vcwm])
+            state = ReplayState(load_event_log(log_path))
+            state.seek(state.log.num_steps)
+            grid, _ = load_maze(vcwm, use_mmap=False)
+            self.assertEqual(pack_walls(state.grid), pack_walls(grid))
+
+    def test_output_extension_is_checked(self):
+        with self.assertRaises(SystemExit):
+            parse_args(["4", "4", "--output", "maze.gif"])
+
+if __name__ == "__main__":
+    unittest.main()
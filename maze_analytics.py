@@ -0,0 +1,127 @@
+"""difficulty statistics for mazes, from their wall arrays
+
+    python maze_analytics.py mazes.bin > stats.jsonl
+
+reads a batch.py output file and prints one JSON record per maze.
+"""
+import argparse
+import json
+from dataclasses import dataclass, asdict
+from typing import Any
+
+import numpy as np
+
+from batch import iter_batch
+from dead_end_filler import dead_end_fill
+from maze_engine import start_location, end_location
+from wall_arrays import wall_arrays, open_degree
+
+@dataclass
+class MazeAnalysis:
+    cell_rows: int
+    cell_cols: int
+    dead_ends: int
+    # degree_histogram[n] is the number of cells with passages to n others
+    degree_histogram: list[int]
+    longest_corridor: int
+    longest_straight_run: int
+    solution_length: int
+    solution_fraction: float
+
+    @property
+    def junctions(self) -> int:
+        """cells where the way branches, three or four passages"""
+        return sum(self.degree_histogram[3:])
+
+def _longest_run(passages: np.ndarray) -> int:
+    """longest run of True along the rows of a 2d bool array"""
+    rows, cols = passages.shape
+    # a False column on each side keeps runs from joining across rows
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = passages
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1)
+    if not starts.size:
+        return 0
+    return int((np.flatnonzero(edges == -1) - starts).max())
+
+def _largest_component(num_nodes: int, a: np.ndarray, b: np.ndarray) -> int:
+    """node count of the biggest connected component of edges a[i]-b[i]
+
+    Each round hooks every root onto the smallest root across its edges,
+    then jumps pointers until each node points at its root, so a long
+    chain takes a few rounds rather than one per node.
+    """
+    if not num_nodes:
+        return 0
+    label = np.arange(num_nodes)
+    while a.size:
+        root_a, root_b = label[a], label[b]
+        apart = root_a != root_b
+        if not apart.any():
+            break
+        root_a, root_b = root_a[apart], root_b[apart]
+        low = np.minimum(root_a, root_b)
+        np.minimum.at(label, root_a, low)
+        np.minimum.at(label, root_b, low)
+        while True:
+            jumped = label[label]
+            if np.array_equal(jumped, label):
+                break
+            label = jumped
+    return int(np.bincount(label).max())
+
+def _longest_corridor(horz: np.ndarray, vert: np.ndarray,
+                      degree: np.ndarray) -> int:
+    """most cells in an unbranched chain of two-passage cells"""
+    rows, cols = degree.shape
+    chain = degree == 2
+    ids = np.arange(rows * cols).reshape(rows, cols)
+    # passages joining two chain cells, east then south
+    east = ~vert[:, 1:-1] & chain[:, :-1] & chain[:, 1:]
+    south = ~horz[1:-1, :] & chain[:-1, :] & chain[1:, :]
+    a = np.concatenate((ids[:, :-1][east], ids[:-1, :][south]))
+    b = np.concatenate((ids[:, 1:][east], ids[1:, :][south]))
+    # renumber the chain cells 0..n-1 so labels stay small
+    compact = np.cumsum(chain.ravel()) - 1
+    return _largest_component(int(chain.sum()), compact[a], compact[b])
+
+def analyze(grid: Any) -> MazeAnalysis:
+    """dead ends, branching, corridors and solution of a grid
+
+    Start and end are not counted as dead ends, since each also opens to
+    the outside.  longest_corridor is the most cells in a chain of cells
+    with exactly two passages, the way runs without a choice to make;
+    longest_straight_run is the most cells crossed in a straight line,
+    through junctions too.  The solution comes from dead_end_fill, so
+    solution_length is in moves and 0 when there is no route.
+    """
+    horz, vert = wall_arrays(grid)
+    degree = open_degree(horz, vert)
+    dead = degree == 1
+    for loc in (start_location(grid), end_location(grid)):
+        dead[loc.row, loc.col] = False
+    run = max(_longest_run(~vert[:, 1:-1]), _longest_run((~horz[1:-1, :]).T))
+    solution = dead_end_fill(grid)
+    return MazeAnalysis(
+        cell_rows=grid.cell_rows, cell_cols=grid.cell_cols,
+        dead_ends=int(dead.sum()),
+        degree_histogram=np.bincount(degree.ravel(), minlength=5).tolist(),
+        longest_corridor=_longest_corridor(horz, vert, degree),
+        longest_straight_run=run + 1,
+        solution_length=solution.length,
+        solution_fraction=len(solution.path) / degree.size)
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("batch_file")
+    args = parser.parse_args(argv)
+    with open(args.batch_file, "rb") as fh:
+        data = fh.read()
+    for grid, header in iter_batch(data):
+        record = {"seed": header.seed, "generator": header.generator,
+                  **asdict(analyze(grid))}
+        print(json.dumps(record))
+
+if __name__ == "__main__":
+    main()
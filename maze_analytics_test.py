@@ -0,0 +1,67 @@
+import unittest
+import random
+
+from generators import generate
+from geometry import CellLocation
+from maze_analytics import analyze
+from maze_engine import build_grid, remove_entrance_and_exit
+from solvers import bfs
+
+def longest_chain(grid) -> int:
+    """flood fill over cells with two passages, one chain at a time"""
+    num_cells = grid.cell_rows * grid.cell_cols
+    def passages(cell):
+        return [neigh for neigh, wall in grid.size.cell_sides(cell)
+                if not grid.wall_is_solid(wall)]
+    chain = {cell for cell in range(num_cells) if len(passages(cell)) == 2}
+    best, seen = 0, set()
+    for cell in chain:
+        if cell in seen:
+            continue
+        seen.add(cell)
+        todo, size = [cell], 0
+        while todo:
+            size += 1
+            for neigh in passages(todo.pop()):
+                if neigh in chain and neigh not in seen:
+                    seen.add(neigh)
+                    todo.append(neigh)
+        best = max(best, size)
+    return best
+
+class Tests(unittest.TestCase):
+    def test_straight_corridor(self):
+        grid = build_grid(1, 5)
+        remove_entrance_and_exit(grid)
+        for col in range(4):
+            grid.get_east_wall(CellLocation(row=0, col=col)).solid = False
+        stats = analyze(grid)
+        self.assertEqual(stats.dead_ends, 0)
+        self.assertEqual(stats.degree_histogram, [0, 2, 3, 0, 0])
+        # the two end cells have one passage each, so are not corridor
+        self.assertEqual(stats.longest_corridor, 3)
+        self.assertEqual(stats.longest_straight_run, 5)
+        self.assertEqual(stats.solution_length, 4)
+        self.assertEqual(stats.solution_fraction, 1.0)
+
+    def test_matches_cell_by_cell_counts(self):
+        grid = generate(14, 19, "kruskal", rng=random.Random(6))
+        stats = analyze(grid)
+        degrees = [0] * 5
+        for row in range(14):
+            for col in range(19):
+                loc = CellLocation(row=row, col=col)
+                walls = [grid.get_north_wall(loc), grid.get_south_wall(loc),
+                         grid.get_east_wall(loc), grid.get_west_wall(loc)]
+                border = [row == 0, row == 13, col == 18, col == 0]
+                degrees[sum(not wall.solid and not edge
+                            for wall, edge in zip(walls, border))] += 1
+        self.assertEqual(stats.degree_histogram, degrees)
+        self.assertEqual(stats.longest_corridor, longest_chain(grid))
+        self.assertEqual(stats.junctions, degrees[3] + degrees[4])
+        self.assertEqual(stats.solution_length, bfs(grid).length)
+        self.assertEqual(stats.solution_fraction,
+                         (bfs(grid).length + 1) / (14 * 19))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from batch import generate_one
+from maze_file import HEADER, MazeHeader, maze_from_bytes
+from packed_grid import PackedVCWGrid
+
+CacheKey = tuple[int, int, int, str]
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.disk_hits) / self.lookups \
+            if self.lookups else 0.0
+
+class MazeCache:
+    """generated mazes keyed by (rows, cols, seed, generator)
+
+    A miss generates the maze the way batch does, from its own
+    MazeRNG(seed), so a cached maze is the one generation would
+    have built.  Mazes are kept as maze_file records: in memory in an LRU
+    bounded by max_bytes of wall bitmaps, and, given a directory, as
+    .vcwm files in an LRU bounded by max_disk_bytes, used by file mtime.
+    Memory evictions stay on disk, so a later lookup reads the file
+    instead of carving again.
+
+    get() always builds a fresh, writable PackedVCWGrid from the record,
+    so solving or editing it never changes what the cache hands out next.
+    """
+    def __init__(self, max_bytes: int=64 * 2**20,
+                 directory: Optional[str]=None,
+                 max_disk_bytes: int=1024 * 2**20) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = CacheStats()
+        self.wall_bytes = 0
+        self._records: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self.disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_disk()
+
+    def _scan_disk(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".vcwm"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._disk[name] = size
+            self.disk_bytes += size
+        self._trim_disk()
+
+    def _file_name(self, key: CacheKey) -> str:
+        rows, cols, seed, generator = key
+        return f"{rows}x{cols}-{generator}-{seed}.vcwm"
+
+    def _remember(self, key: CacheKey, record: bytes) -> None:
+        size = len(record) - HEADER.size
+        if size > self.max_bytes:
+            return
+        self._records[key] = record
+        self.wall_bytes += size
+        while self.wall_bytes > self.max_bytes:
+            _, evicted = self._records.popitem(last=False)
+            self.wall_bytes -= len(evicted) - HEADER.size
+            self.stats.evictions += 1
+
+    def _read_disk(self, key: CacheKey) -> Optional[bytes]:
+        name = self._file_name(key)
+        if self.directory is None or name not in self._disk:
+            return None
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as fh:
+                record = fh.read()
+            header = MazeHeader.unpack(record)
+        except Exception:
+            self._forget_disk(name)
+            return None
+        if ((header.cell_rows, header.cell_cols, header.seed,
+             header.generator) != key or len(record) != header.file_size):
+            self._forget_disk(name)
+            return None
+        self._touch_disk(key)
+        return record
+
+    def _touch_disk(self, key: CacheKey) -> None:
+        """marks the key's file most recently used, in order and mtime"""
+        name = self._file_name(key)
+        if self.directory is None or name not in self._disk:
+            return
+        self._disk.move_to_end(name)
+        try:
+            os.utime(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            self.disk_bytes -= self._disk.pop(name)
+
+    def _write_disk(self, key: CacheKey, record: bytes) -> None:
+        if self.directory is None or len(record) > self.max_disk_bytes:
+            return
+        name = self._file_name(key)
+        path = os.path.join(self.directory, name)
+        # written aside and renamed, so a reader never sees half a file
+        with open(path + ".tmp", "wb") as fh:
+            fh.write(record)
+        os.replace(path + ".tmp", path)
+        self.disk_bytes += len(record) - self._disk.pop(name, 0)
+        self._disk[name] = len(record)
+        self._trim_disk()
+
+    def _forget_disk(self, name: str) -> None:
+        self.disk_bytes -= self._disk.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def _trim_disk(self) -> None:
+        while self.disk_bytes > self.max_disk_bytes:
+            self._forget_disk(next(iter(self._disk)))
+            self.stats.disk_evictions += 1
+
+    def record(self, cell_rows: int, cell_cols: int, seed: int,
+               generator: str="backtracker") -> bytes:
+        """the maze_file record for a key, generating it on a miss"""
+        key = (cell_rows, cell_cols, seed, generator)
+        if (record := self._records.get(key)) is not None:
+            self._records.move_to_end(key)
+            self._touch_disk(key)
+            self.stats.hits += 1
+            return record
+        if (record := self._read_disk(key)) is not None:
+            self.stats.disk_hits += 1
+        else:
+            self.stats.misses += 1
+            record = generate_one(cell_rows, cell_cols, generator, seed)
+            self._write_disk(key, record)
+        self._remember(key, record)
+        return record
+
+    def get(self, cell_rows: int, cell_cols: int, seed: int,
+            generator: str="backtracker") -> PackedVCWGrid:
+        grid, _ = maze_from_bytes(bytearray(
+            self.record(cell_rows, cell_cols, seed, generator)))
+        return grid
+
+    def clear(self) -> None:
+        """drops the memory tier, the disk tier is kept"""
+        self._records.clear()
+        self.wall_bytes = 0
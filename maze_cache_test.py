@@ -0,0 +1,62 @@
+import unittest
+import os
+import tempfile
+
+from batch import generate_one
+from maze_cache import MazeCache
+from maze_engine import run_maze
+from maze_file import HEADER, pack_walls
+
+class Tests(unittest.TestCase):
+    def test_hits_return_the_generated_maze_as_a_copy(self):
+        cache = MazeCache()
+        grid = cache.get(8, 9, 4, "prim")
+        self.assertEqual(b"".join(pack_walls(grid)),
+                         generate_one(8, 9, "prim", 4)[HEADER.size:])
+        run_maze(grid)
+        solid = next(wall_id for wall_id in range(10)
+                     if grid.wall_is_solid(wall_id))
+        grid.set_wall_solid(solid, False)
+        again = cache.get(8, 9, 4, "prim")
+        self.assertTrue(again.wall_is_solid(solid))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 1))
+
+    def test_memory_is_bounded_by_wall_bytes(self):
+        record_walls = len(generate_one(10, 10, "kruskal", 0)) - HEADER.size
+        cache = MazeCache(max_bytes=2 * record_walls)
+        for seed in (1, 2, 3, 1):
+            cache.get(10, 10, seed, "kruskal")
+        self.assertLessEqual(cache.wall_bytes, 2 * record_walls)
+        self.assertEqual(cache.stats.misses, 4)
+        self.assertEqual(cache.stats.evictions, 2)
+        cache.get(10, 10, 3, "kruskal")
+        self.assertEqual(cache.stats.hits, 1)
+
+    def test_disk_tier_survives_a_new_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = MazeCache(directory=tmp)
+            expected = pack_walls(first.get(12, 7, 9))
+            second = MazeCache(directory=tmp)
+            self.assertEqual(pack_walls(second.get(12, 7, 9)), expected)
+            self.assertEqual((second.stats.disk_hits, second.stats.misses),
+                             (1, 0))
+            size = second.disk_bytes
+            small = MazeCache(directory=tmp, max_disk_bytes=size)
+            small.get(12, 7, 10)
+            self.assertEqual(small.stats.disk_evictions, 1)
+            self.assertEqual(os.listdir(tmp), ["12x7-backtracker-10.vcwm"])
+
+    def test_memory_hits_keep_the_file_fresh(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            record = len(generate_one(10, 10, "backtracker", 1))
+            cache = MazeCache(max_bytes=100, directory=tmp,
+                              max_disk_bytes=4 * record)
+            for seed in (1, 2, 1, 3, 1, 4, 5, 1):
+                cache.get(10, 10, seed)
+            self.assertIn("10x10-backtracker-1.vcwm", os.listdir(tmp))
+            restarted = MazeCache(directory=tmp, max_disk_bytes=4 * record)
+            restarted.get(10, 10, 1)
+            self.assertEqual(restarted.stats.disk_hits, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,20 +1,140 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
+from typing import Any
 
 from geometry import Point, Line, CellLocation
 
-@dataclass
 class WallPath:
-    wall: Line
-    path: Line
-    solid: bool=True
-    path_color: str=None
+    """one wall of a VCWGrid, with the line drawn for it and for the path
+
+    loc is the wall's VCWGridLoc, when the factory knows it.  grid is the
+    grid the wall was placed in, set by the grid; setting solid then bumps
+    its wall_version.  Nothing else is hooked, so building one is cheap.
+    """
+    __slots__ = ("wall", "path", "_solid", "path_color", "loc", "grid")
+
+    def __init__(self, wall: Line, path: Line, solid: bool=True,
+                 path_color: str=None, loc: Any=None, grid: Any=None) -> None:
+        self.wall = wall
+        self.path = path
+        self._solid = solid
+        self.path_color = path_color
+        self.loc = loc
+        self.grid = grid
+
+    @property
+    def solid(self) -> bool:
+        return self._solid
+
+    @solid.setter
+    def solid(self, value: bool) -> None:
+        self._solid = value
+        if self.grid is not None:
+            self.grid.wall_version += 1
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, WallPath):
+            return NotImplemented
+        return ((self.wall, self.path, self.solid, self.path_color, self.loc)
+                == (other.wall, other.path, other.solid, other.path_color,
+                    other.loc))
+
+    def __repr__(self) -> str:
+        return (f"WallPath(wall={self.wall}, path={self.path}, "
+                f"solid={self.solid}, path_color={self.path_color!r}, "
+                f"loc={self.loc})")
 
-@dataclass
 class Cell:
-    loc: CellLocation
-    visited: bool
+    """one cell of a VCWGrid
+
+    grid is the grid the cell was placed in, set by the grid; visited
+    then reads and writes the grid's visits, as PackedCell.visited does.
+    Before that it is a plain flag.
+    """
+    __slots__ = ("loc", "grid", "_visited")
+
+    def __init__(self, loc: CellLocation, visited: bool,
+                 grid: Any=None) -> None:
+        self.loc = loc
+        self.grid = grid
+        self._visited = False
+        self.visited = visited
+
+    @property
+    def visited(self) -> bool:
+        if self.grid is None:
+            return self._visited
+        return self.grid.visits.is_visited(self.loc.row * self.grid.cell_cols
+                                           + self.loc.col)
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        if self.grid is None:
+            self._visited = value
+        else:
+            self.grid.visits.mark(self.loc.row * self.grid.cell_cols
+                                  + self.loc.col, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Cell):
+            return NotImplemented
+        return (self.loc, self.visited) == (other.loc, other.visited)
+
+    def __repr__(self) -> str:
+        return f"Cell(loc={self.loc}, visited={self.visited})"
 
 @dataclass(frozen=True)
 class Vertex:
     point: Point
 
+@dataclass
+class SolveResult:
+    """path runs start..goal inclusive and is empty when there is no route"""
+    path: list[CellLocation] = field(default_factory=list)
+    expanded: int = 0
+
+    @property
+    def solved(self) -> bool:
+        return bool(self.path)
+
+    @property
+    def length(self) -> int:
+        """number of moves, one less than the number of cells on the path"""
+        return max(len(self.path) - 1, 0)
+
+class VisitEpochs:
+    """per-cell visited flags that clear in O(1)
+
+    A cell is visited when its stamp equals the current epoch, so
+    new_traversal() forgets every visit by bumping the epoch instead of
+    sweeping the cells.  Stamps are zeroed only when the epoch would
+    overflow the typecode, and are not allocated until first needed.
+    """
+    def __init__(self, num_cells: int, typecode: str="I") -> None:
+        self.num_cells = num_cells
+        self.typecode = typecode
+        self.stamps: Any = None
+        self.epoch = 1
+        self._last_epoch = (1 << (8 * array(typecode).itemsize)) - 1
+
+    def allocate(self) -> Any:
+        """the stamps, made on first use"""
+        if self.stamps is None:
+            self.stamps = array(self.typecode, [0]) * self.num_cells
+        return self.stamps
+
+    def new_traversal(self) -> None:
+        if self.epoch == self._last_epoch:
+            if self.stamps is not None:
+                self.stamps[:] = array(self.typecode, [0]) * self.num_cells
+            self.epoch = 0
+        self.epoch += 1
+
+    def is_visited(self, cell_id: int) -> bool:
+        return self.stamps is not None and self.stamps[cell_id] == self.epoch
+
+    def mark(self, cell_id: int, visited: bool=True) -> None:
+        if visited:
+            self.allocate()[cell_id] = self.epoch
+        elif self.stamps is not None:
+            self.stamps[cell_id] = 0
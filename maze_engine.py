@@ -0,0 +1,197 @@
+import random
+from typing import Any, Iterator, Optional
+
+from geometry import CellLocation
+from maze_elements import Cell, WallPath
+from vcw_grid import VCWGrid, VCWGridLoc
+
+FORWARD_PASS_COLOR = "blue"
+BACKTRACK_COLOR = "goldenrod2"
+
+class MazeObserver:
+    """hooks called by the engine as it works, all no-ops by default
+
+    The engine never draws anything itself; a front end subclasses this and
+    renders whatever it cares about.  `wall` is the WallPath (or grid view)
+    between from_loc and to_loc; it is None for backtracked() while
+    carving, since no wall changes then.
+    """
+    def wall_removed(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        pass
+
+    def cell_entered(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        pass
+
+    def backtracked(self, wall: Any, from_loc: CellLocation,
+                    to_loc: CellLocation) -> None:
+        pass
+
+    def step(self) -> None:
+        pass
+
+def headless_wall_path(grid_idx: VCWGridLoc) -> WallPath:
+    return WallPath(wall=None, path=None, loc=grid_idx)
+
+def build_grid(cell_rows: int, cell_cols: int,
+               wall_factory=headless_wall_path, grid_class=VCWGrid) -> Any:
+    grid = grid_class(cell_rows=cell_rows, cell_cols=cell_cols)
+    grid.populate_walls(wall_factory)
+    grid.populate_cells(lambda loc: Cell(loc=loc, visited=False))
+    return grid
+
+def start_location(grid: Any) -> CellLocation:
+    return CellLocation(row=0, col=0)
+
+def end_location(grid: Any) -> CellLocation:
+    return CellLocation(row=grid.cell_rows-1, col=grid.cell_cols-1)
+
+def remove_entrance_and_exit(grid: Any) -> None:
+    grid.get_north_wall(start_location(grid)).solid = False
+    grid.get_south_wall(end_location(grid)).solid = False
+
+def mark_cell_unvisited(cell: Cell) -> None:
+    cell.visited = False
+
+def cell_id(grid: Any, loc: CellLocation) -> int:
+    return loc.row * grid.cell_cols + loc.col
+
+def cell_location(grid: Any, cell: int) -> CellLocation:
+    row, col = divmod(cell, grid.cell_cols)
+    return CellLocation(row=row, col=col)
+
+def get_wallpath_between_cell_locations(grid: Any, from_loc: CellLocation,
+                                        to_loc: CellLocation) -> WallPath:
+    delta_row_col = to_loc.row - from_loc.row, to_loc.col - from_loc.col
+    match delta_row_col:
+        case (-1, 0): # North
+            return grid.get_north_wall(from_loc)
+        case (1, 0): # South
+            return grid.get_south_wall(from_loc)
+        case (0, -1): # West
+            return grid.get_west_wall(from_loc)
+        case (0, 1): # East
+            return grid.get_east_wall(from_loc)
+    raise Exception(f"Cells are not adjacent {from_loc} {to_loc}")
+
+def get_reachable_neighbors(grid: Any,
+                            loc: CellLocation) -> list[CellLocation]:
+    return [cell_location(grid, neigh)
+            for neigh, wall in grid.size.cell_sides(cell_id(grid, loc))
+            if not grid.wall_is_solid(wall)]
+
+def _start_traversal(grid: Any) -> tuple[Any, int]:
+    """forgets every visit and hands back the raw stamps and epoch, so
+    the loops below can test visited without a method call"""
+    grid.new_traversal()
+    return grid.visits.allocate(), grid.visits.epoch
+
+def remove_walls_steps(grid: Any, rng=random,
+                       observer: Optional[MazeObserver]=None) -> Iterator[None]:
+    """randomized depth first carve, yielding once per step
+
+    Starts a new traversal of the grid's visited flags, so it needs no
+    reset beforehand and leaves none to do afterwards.
+
+    Works on cell and wall ids through grid.size.cell_sides(); locations
+    and wall objects are only made for the observer.
+    """
+    cell_sides = grid.size.cell_sides
+    stamps, epoch = _start_traversal(grid)
+    curr_cell = cell_id(grid, end_location(grid))
+    path_walked = [curr_cell]
+    while True:
+        stamps[curr_cell] = epoch
+        # sides keep the N, S, E, W order get_adjacent_cell_locations has
+        viable = [side for side in cell_sides(curr_cell)
+                  if stamps[side[0]] != epoch]
+        if viable:
+            next_cell, wall = rng.choice(viable)
+            grid.set_wall_solid(wall, False)
+            if observer:
+                observer.wall_removed(grid.wall_at(wall),
+                                      cell_location(grid, curr_cell),
+                                      cell_location(grid, next_cell))
+            path_walked.append(next_cell)
+            curr_cell = next_cell
+        else:
+            prev_cell = path_walked.pop()
+            if not path_walked:   # empty path means we are done
+                return
+            curr_cell = path_walked[-1]
+            if observer:
+                observer.backtracked(None, cell_location(grid, prev_cell),
+                                     cell_location(grid, curr_cell))
+        if observer:
+            observer.step()
+        yield
+
+def run_maze_steps(grid: Any, rng=random,
+                   observer: Optional[MazeObserver]=None) -> Iterator[None]:
+    """randomized depth first solve, yielding once per step
+
+    The generator's return value (StopIteration.value) is True when the
+    destination was reached.  Like remove_walls_steps it starts a new
+    traversal, so back to back solves need no visited reset in between.
+    """
+    cell_sides = grid.size.cell_sides
+    wall_is_solid = grid.wall_is_solid
+    stamps, epoch = _start_traversal(grid)
+    curr_cell = cell_id(grid, start_location(grid))
+    destination_cell = cell_id(grid, end_location(grid))
+    path_walked = [curr_cell]
+    walls_walked = []   # walls_walked[i] joins path_walked[i] and [i+1]
+    while True:
+        stamps[curr_cell] = epoch
+        if curr_cell == destination_cell:
+            return True
+        viable = [(neigh, wall) for neigh, wall in cell_sides(curr_cell)
+                  if stamps[neigh] != epoch and not wall_is_solid(wall)]
+        if viable:
+            next_cell, wall = rng.choice(viable)
+            grid.set_path_color(wall, FORWARD_PASS_COLOR)
+            if observer:
+                observer.cell_entered(grid.wall_at(wall),
+                                      cell_location(grid, curr_cell),
+                                      cell_location(grid, next_cell))
+            path_walked.append(next_cell)
+            walls_walked.append(wall)
+            curr_cell = next_cell
+        else:
+            prev_cell = path_walked.pop()
+            if not path_walked:
+                return False
+            curr_cell = path_walked[-1]
+            wall = walls_walked.pop()
+            grid.set_path_color(wall, BACKTRACK_COLOR)
+            if observer:
+                observer.backtracked(grid.wall_at(wall),
+                                     cell_location(grid, prev_cell),
+                                     cell_location(grid, curr_cell))
+        if observer:
+            observer.step()
+        yield
+
+def run_to_completion(steps: Iterator[None]) -> Any:
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+def remove_walls_to_maze(grid: Any, rng=random,
+                         observer: Optional[MazeObserver]=None) -> None:
+    run_to_completion(remove_walls_steps(grid, rng, observer))
+
+def run_maze(grid: Any, rng=random,
+             observer: Optional[MazeObserver]=None) -> bool:
+    return run_to_completion(run_maze_steps(grid, rng, observer))
+
+def generate_maze(cell_rows: int, cell_cols: int, rng=random,
+                  observer: Optional[MazeObserver]=None, **grid_kwargs) -> Any:
+    """builds a grid, opens entrance and exit and carves it"""
+    grid = build_grid(cell_rows, cell_cols, **grid_kwargs)
+    remove_entrance_and_exit(grid)
+    remove_walls_to_maze(grid, rng, observer)
+    return grid
@@ -0,0 +1,130 @@
+import unittest
+import random
+
+from geometry import CellLocation
+from maze_elements import Cell, VisitEpochs
+from maze_engine import (MazeObserver, build_grid, generate_maze,
+                         get_wallpath_between_cell_locations, run_maze)
+from packed_grid import PackedVCWGrid
+from vcw_grid import VCWGrid
+
+def count_open_walls(grid) -> int:
+    opened = []
+    grid.map_walls(lambda w: opened.append(not w.solid))
+    return sum(opened)
+
+def border_intact(grid) -> bool:
+    """every outer wall is solid except the entrance and the exit"""
+    rows, cols = grid.cell_rows, grid.cell_cols
+    walls = []
+    for col in range(cols):
+        walls.append(grid.get_north_wall(CellLocation(row=0, col=col)))
+        walls.append(grid.get_south_wall(CellLocation(row=rows - 1, col=col)))
+    for row in range(rows):
+        walls.append(grid.get_west_wall(CellLocation(row=row, col=0)))
+        walls.append(grid.get_east_wall(CellLocation(row=row, col=cols - 1)))
+    return sum(not wall.solid for wall in walls) == 2 and not (
+        grid.get_north_wall(CellLocation(row=0, col=0)).solid
+        or grid.get_south_wall(CellLocation(row=rows - 1, col=cols - 1)).solid)
+
+class CountingObserver(MazeObserver):
+    def __init__(self):
+        self.removed = 0
+        self.steps = 0
+
+    def wall_removed(self, wall, from_loc, to_loc):
+        self.removed += 1
+
+    def step(self):
+        self.steps += 1
+
+class Tests(unittest.TestCase):
+    def test_generate_is_perfect_maze(self):
+        for grid_class in (None, PackedVCWGrid):
+            kwargs = {"grid_class": grid_class} if grid_class else {}
+            grid = generate_maze(7, 9, rng=random.Random(5), **kwargs)
+            # a spanning tree over 63 cells plus entrance and exit
+            self.assertEqual(count_open_walls(grid), 7 * 9 - 1 + 2)
+            self.assertTrue(run_maze(grid, rng=random.Random(6)))
+
+    def test_observer_sees_every_removal(self):
+        observer = CountingObserver()
+        generate_maze(5, 6, rng=random.Random(1), observer=observer)
+        self.assertEqual(observer.removed, 5 * 6 - 1)
+        self.assertGreater(observer.steps, observer.removed)
+
+    def test_same_seed_same_maze(self):
+        first = generate_maze(6, 6, rng=random.Random(42))
+        second = generate_maze(6, 6, rng=random.Random(42))
+        walls_first, walls_second = [], []
+        first.map_walls(lambda w: walls_first.append(w.solid))
+        second.map_walls(lambda w: walls_second.append(w.solid))
+        self.assertEqual(walls_first, walls_second)
+
+    def test_cell_sides_match_the_wall_getters(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = build_grid(3, 4, grid_class=grid_class)
+            for loc in grid.cells_locs():
+                sides = grid.size.cell_sides(loc.row * 4 + loc.col)
+                adjacent = grid.get_adjacent_cell_locations(loc)
+                self.assertEqual([neigh for neigh, _ in sides],
+                                 [neigh.row * 4 + neigh.col
+                                  for neigh in adjacent])
+                for (_, wall), neigh in zip(sides, adjacent):
+                    self.assertEqual(grid.wall_at(wall).loc,
+                        get_wallpath_between_cell_locations(
+                            grid, loc, neigh).loc)
+
+    def test_back_to_back_solves_need_no_reset(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate_maze(9, 9, random.Random(2), grid_class=grid_class)
+            epoch = grid.visits.epoch
+            self.assertTrue(run_maze(grid, random.Random(3)))
+            self.assertTrue(run_maze(grid, random.Random(4)))
+            self.assertEqual(grid.visits.epoch, epoch + 2)
+
+    def test_visit_epochs_wrap_around(self):
+        visits = VisitEpochs(3, "B")
+        self.assertFalse(visits.is_visited(0))
+        visits.mark(0)
+        self.assertTrue(visits.is_visited(0))
+        for _ in range(300):
+            visits.new_traversal()
+            self.assertFalse(visits.is_visited(0))
+            visits.mark(0)
+        self.assertTrue(visits.is_visited(0))
+        visits.mark(0, False)
+        self.assertFalse(visits.is_visited(0))
+
+    def test_stamps_wait_for_the_first_visit(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = build_grid(4, 5, grid_class=grid_class)
+            for _ in range(300):
+                grid.new_traversal()
+            grid.get_cell(CellLocation(row=1, col=1)).visited = False
+            self.assertIsNone(grid.visits.stamps, grid_class)
+            self.assertFalse(grid.cell_visited(6), grid_class)
+            grid.set_cell_visited(6, True)
+            self.assertTrue(grid.cell_visited(6), grid_class)
+
+    def test_cells_read_through_to_visits(self):
+        corner = CellLocation(row=4, col=5)
+        loose = Cell(loc=corner, visited=True)
+        self.assertTrue(loose.visited)
+        self.assertEqual(loose, Cell(loc=corner, visited=True))
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate_maze(5, 6, random.Random(1),
+                                 grid_class=grid_class)
+            run_maze(grid, random.Random(1))
+            cell = grid.get_cell(corner)
+            self.assertTrue(cell.visited, grid_class)
+            cell.visited = False
+            self.assertFalse(grid.cell_visited(4 * 6 + 5), grid_class)
+            grid.new_traversal()
+            grid.get_cell(CellLocation(row=0, col=1)).visited = True
+            self.assertTrue(grid.cell_visited(1), grid_class)
+            self.assertFalse(grid.get_cell(corner).visited, grid_class)
+
+
+if __name__ == "__main__":
+    unittest.main()
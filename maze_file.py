@@ -0,0 +1,150 @@
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+from maze_size import MazeSize
+from packed_grid import PackedVCWGrid
+
+# File layout, all little endian:
+#   header   magic, version, rows, cols, seed, generator name (see HEADER)
+#   horz     (rows+1)*cols wall bits, row major, bit i in byte i//8 at i%8
+#   vert     rows*(cols+1) wall bits, same packing
+# A set bit is a solid wall, exactly the PackedVCWGrid bitmaps.
+MAGIC = b"VCWM"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIIq16s")
+
+@dataclass(frozen=True)
+class MazeHeader:
+    cell_rows: int
+    cell_cols: int
+    seed: int = 0
+    generator: str = ""
+    version: int = VERSION
+
+    @property
+    def size(self) -> MazeSize:
+        return MazeSize(cell_rows=self.cell_rows, cell_cols=self.cell_cols)
+
+    @property
+    def horz_bytes(self) -> int:
+        return (self.size.num_horz_walls + 7) // 8
+
+    @property
+    def vert_bytes(self) -> int:
+        return (self.size.num_vert_walls + 7) // 8
+
+    @property
+    def file_size(self) -> int:
+        return HEADER.size + self.horz_bytes + self.vert_bytes
+
+    def pack(self) -> bytes:
+        name = self.generator.encode("ascii")
+        if len(name) > 16:
+            raise Exception(f"Generator name too long for header {name!r}")
+        return HEADER.pack(MAGIC, self.version, self.cell_rows,
+                           self.cell_cols, self.seed, name)
+
+    def unpack(data: Any) -> "MazeHeader":
+        if len(data) < HEADER.size:
+            raise Exception("Maze data is too short for a header")
+        magic, version, rows, cols, seed, name = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise Exception(f"Not a maze file, magic was {magic!r}")
+        if version != VERSION:
+            raise Exception(f"Unsupported maze file version {version}")
+        return MazeHeader(cell_rows=rows, cell_cols=cols, seed=seed,
+                          generator=name.rstrip(b"\0").decode("ascii"),
+                          version=version)
+
+def _pack_bits(flags: list[bool]) -> bytes:
+    bits = bytearray((len(flags) + 7) // 8)
+    for idx, flag in enumerate(flags):
+        if flag:
+            bits[idx >> 3] |= 1 << (idx & 7)
+    return bytes(bits)
+
+def pack_walls(grid: Any) -> tuple[bytes, bytes]:
+    """horizontal and vertical wall bitmaps for any grid with map_walls
+
+    map_walls walks the VCW rows top to bottom: even rows hold cell_cols
+    horizontal walls, odd rows cell_cols+1 vertical ones, so splitting its
+    output by row gives both kinds in the row-major order the bitmaps use.
+    """
+    if isinstance(grid, PackedVCWGrid):
+        return bytes(grid.horz_wall_bits), bytes(grid.vert_wall_bits)
+    solid: list[bool] = []
+    grid.map_walls(lambda wall: solid.append(wall.solid))
+    horz: list[bool] = []
+    vert: list[bool] = []
+    pos = 0
+    for row in range(2 * grid.cell_rows + 1):
+        if row % 2 == 0:
+            horz.extend(solid[pos:pos + grid.cell_cols])
+            pos += grid.cell_cols
+        else:
+            vert.extend(solid[pos:pos + grid.cell_cols + 1])
+            pos += grid.cell_cols + 1
+    return _pack_bits(horz), _pack_bits(vert)
+
+def maze_to_bytes(grid: Any, seed: int=0, generator: str="") -> bytes:
+    header = MazeHeader(cell_rows=grid.cell_rows, cell_cols=grid.cell_cols,
+                        seed=seed, generator=generator)
+    horz, vert = pack_walls(grid)
+    return header.pack() + horz + vert
+
+def maze_from_bytes(data: Any,
+                    buffer: Any=None) -> tuple[PackedVCWGrid, MazeHeader]:
+    """builds a grid that shares data's memory when data is writable
+
+    Pass a memoryview to avoid copies; bytes give a read-only grid.
+    buffer is handed to the grid to close with it (see PackedVCWGrid).
+    """
+    header = MazeHeader.unpack(data)
+    if len(data) < header.file_size:
+        raise Exception(f"Maze data is {len(data)} bytes, "
+                        f"expected {header.file_size}")
+    view = memoryview(data)
+    horz_end = HEADER.size + header.horz_bytes
+    grid = PackedVCWGrid(header.cell_rows, header.cell_cols,
+                         horz_bits=view[HEADER.size:horz_end],
+                         vert_bits=view[horz_end:header.file_size],
+                         buffer=buffer)
+    view.release()
+    return grid, header
+
+def write_maze(grid: Any, fh: BinaryIO, seed: int=0,
+               generator: str="") -> None:
+    header = MazeHeader(cell_rows=grid.cell_rows, cell_cols=grid.cell_cols,
+                        seed=seed, generator=generator)
+    horz, vert = pack_walls(grid)
+    fh.write(header.pack())
+    fh.write(horz)
+    fh.write(vert)
+
+def save_maze(grid: Any, path: str, seed: int=0, generator: str="") -> None:
+    with open(path, "wb") as fh:
+        write_maze(grid, fh, seed, generator)
+
+def load_maze(path: str, use_mmap: bool=True,
+              writable: bool=False) -> tuple[PackedVCWGrid, MazeHeader]:
+    """opens a maze file, by default memory mapped and read-only
+
+    With use_mmap the wall bitmaps are never read into Python objects;
+    wall lookups page the file in on demand.  writable=True maps it
+    read/write so wall changes go straight back to the file.  Visited and
+    path colors always live in memory.  The grid owns the mapping: close
+    it, or use it as a context manager, to unmap the file.
+    """
+    with open(path, "r+b" if writable else "rb") as fh:
+        if not use_mmap:
+            data = bytearray(fh.read())
+            return maze_from_bytes(data)
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        mapped = mmap.mmap(fh.fileno(), 0, access=access)
+    try:
+        return maze_from_bytes(mapped, buffer=mapped)
+    except Exception:
+        mapped.close()
+        raise
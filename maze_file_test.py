@@ -0,0 +1,76 @@
+import unittest
+import os
+import random
+import tempfile
+
+from generators import generate
+from geometry import CellLocation
+from maze_file import (MazeHeader, load_maze, maze_from_bytes, maze_to_bytes,
+                       save_maze)
+from packed_grid import PackedVCWGrid
+from solvers import bfs
+from vcw_grid import VCWGrid
+
+def solid_walls(grid) -> list[bool]:
+    walls = []
+    grid.map_walls(lambda w: walls.append(w.solid))
+    return walls
+
+class Tests(unittest.TestCase):
+    def test_backends_pack_the_same(self):
+        packed = []
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate(7, 5, "kruskal", rng=random.Random(9),
+                            grid_class=grid_class)
+            packed.append(maze_from_bytes(maze_to_bytes(grid))[0])
+        self.assertEqual(solid_walls(packed[0]), solid_walls(packed[1]))
+
+    def test_bytes_round_trip(self):
+        grid = generate(9, 12, rng=random.Random(1))
+        data = maze_to_bytes(grid, seed=1, generator="backtracker")
+        loaded, header = maze_from_bytes(data)
+        self.assertEqual(header, MazeHeader(cell_rows=9, cell_cols=12, seed=1,
+                                            generator="backtracker"))
+        self.assertEqual(len(data), header.file_size)
+        self.assertEqual(solid_walls(grid), solid_walls(loaded))
+
+    def test_mmap_round_trip(self):
+        grid = generate(20, 30, "prim", rng=random.Random(2),
+                        grid_class=PackedVCWGrid)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.vcwm")
+            save_maze(grid, path, seed=2, generator="prim")
+            loaded, header = load_maze(path)
+            with loaded:
+                self.assertEqual(header.generator, "prim")
+                self.assertEqual(solid_walls(grid), solid_walls(loaded))
+                self.assertEqual(bfs(grid).path, bfs(loaded).path)
+                with self.assertRaises(TypeError):
+                    loaded.open_wall_between(0, 1)
+                mapping = loaded.buffer
+            self.assertTrue(mapping.closed)
+            self.assertIsNone(loaded.buffer)
+
+    def test_writable_mmap_writes_through_until_closed(self):
+        grid = generate(6, 7, "kruskal", rng=random.Random(3),
+                        grid_class=PackedVCWGrid)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "maze.vcwm")
+            save_maze(grid, path)
+            loaded, _ = load_maze(path, writable=True)
+            loaded.open_wall_between(0, 1)
+            loaded.close()
+            loaded.close()
+            with self.assertRaises(ValueError):
+                loaded.wall_is_solid(0)
+            reread, _ = load_maze(path, use_mmap=False)
+            self.assertFalse(reread.get_east_wall(
+                CellLocation(row=0, col=0)).solid)
+
+    def test_bad_magic(self):
+        with self.assertRaises(Exception):
+            maze_from_bytes(b"NOPE" + bytes(64))
+
+
+if __name__ == "__main__":
+    unittest.main()
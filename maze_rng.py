@@ -0,0 +1,67 @@
+import random as _random
+from itertools import chain
+from typing import Any, Iterator, MutableSequence, Optional, Sequence
+
+BLOCK_SIZE = 4096
+
+class MazeRNG:
+    """per-maze random stream, drawn from pre-generated blocks of floats
+
+    Stands in for random.Random wherever a generator or the engine takes
+    an rng: random(), randrange(), choice() and shuffle().  Floats in
+    [0, 1) are made block_size at a time by random.Random and handed out
+    from a plain list, so a draw costs an iterator step instead of a
+    method call.
+
+    Every draw is fixed by the seed, the same with or without numpy, so
+    the seed batch, maze_file and maze_cache store is enough to rebuild
+    a maze anywhere.  use_numpy=True fills the blocks from a numpy
+    Generator instead, which is faster but gives another stream for the
+    same seed; nothing that stores seeds uses it.
+    """
+    def __init__(self, seed: Optional[int]=None,
+                 block_size: int=BLOCK_SIZE,
+                 use_numpy: bool=False) -> None:
+        self.seed = seed
+        self.block_size = block_size
+        self._numpy = use_numpy
+        if use_numpy:
+            import numpy as np
+            self._generator = np.random.default_rng(seed)
+            self._block = self._numpy_block
+        else:
+            self._generator = _random.Random(seed)
+            self._block = self._stdlib_block
+        self._floats = chain.from_iterable(self._blocks())
+        self.random = self._floats.__next__
+
+    def _numpy_block(self) -> list[float]:
+        return self._generator.random(self.block_size).tolist()
+
+    def _stdlib_block(self) -> list[float]:
+        draw = self._generator.random
+        return [draw() for _ in range(self.block_size)]
+
+    def _blocks(self) -> Iterator[list[float]]:
+        while True:
+            yield self._block()
+
+    def randrange(self, start: int, stop: Optional[int]=None) -> int:
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise Exception(f"Empty range for randrange({start}, {stop})")
+        return start + int(self.random() * (stop - start))
+
+    def choice(self, seq: Sequence[Any]) -> Any:
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, items: MutableSequence[Any]) -> None:
+        """shuffles in place, with one bulk permutation under numpy"""
+        if self._numpy:
+            order = self._generator.permutation(len(items)).tolist()
+            items[:] = [items[idx] for idx in order]
+            return
+        for idx in range(len(items) - 1, 0, -1):
+            other = int(self.random() * (idx + 1))
+            items[idx], items[other] = items[other], items[idx]
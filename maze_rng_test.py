@@ -0,0 +1,44 @@
+import unittest
+import random
+
+from generators import GENERATORS, generate
+from maze_file import pack_walls
+from maze_rng import MazeRNG
+from packed_grid import PackedVCWGrid
+from solvers import bfs
+
+def draws(rng: MazeRNG) -> list:
+    items = list(range(20))
+    rng.shuffle(items)
+    return ([rng.randrange(7) for _ in range(50)]
+            + [rng.choice("abc") for _ in range(50)]
+            + [rng.randrange(3, 5), rng.random()] + items)
+
+class Tests(unittest.TestCase):
+    def test_streams_repeat_from_the_seed_across_blocks(self):
+        for use_numpy in (True, False):
+            first = draws(MazeRNG(8, block_size=16, use_numpy=use_numpy))
+            again = draws(MazeRNG(8, block_size=16, use_numpy=use_numpy))
+            self.assertEqual(first, again)
+            self.assertNotEqual(
+                first, draws(MazeRNG(9, block_size=16, use_numpy=use_numpy)))
+            self.assertTrue(all(0 <= n < 7 for n in first[:50]))
+            self.assertIn(first[100], (3, 4))
+            self.assertEqual(sorted(first[-20:]), list(range(20)))
+
+    def test_default_stream_does_not_depend_on_numpy(self):
+        # seeds are stored in batch, maze_file and maze_cache keys, so the
+        # default stream must be the stdlib one wherever a maze is rebuilt
+        rng, reference = MazeRNG(8, block_size=16), random.Random(8)
+        self.assertEqual([rng.random() for _ in range(40)],
+                         [reference.random() for _ in range(40)])
+
+    def test_generators_take_a_maze_rng(self):
+        for name in GENERATORS:
+            grids = [generate(9, 13, name, rng=MazeRNG(5),
+                              grid_class=PackedVCWGrid) for _ in range(2)]
+            self.assertEqual(pack_walls(grids[0]), pack_walls(grids[1]), name)
+            self.assertTrue(bfs(grids[0]).solved, name)
+
+if __name__ == "__main__":
+    unittest.main()
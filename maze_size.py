@@ -30,3 +30,37 @@ class MazeSize:
     def vert_wall_cols(self):
         return self.cell_cols + 1
 
+
+    @property
+    def num_cells(self):
+        return self.cell_rows * self.cell_cols
+
+    @property
+    def num_horz_walls(self):
+        return self.horz_wall_rows * self.horz_wall_cols
+
+    @property
+    def num_vert_walls(self):
+        return self.vert_wall_rows * self.vert_wall_cols
+
+    def cell_sides(self, cell: int) -> list[tuple[int, int]]:
+        """(neighbor id, wall id) for each cell next to cell, N, S, E, W
+
+        Worked out from the ids alone, so no per-cell table is kept.
+        Cell ids are row*cell_cols+col.  Wall ids number the horizontal
+        walls row major, then the vertical walls row major after them.
+        """
+        cols = self.cell_cols
+        row, col = divmod(cell, cols)
+        # vertical rows are one wall longer than cell rows
+        west_wall = (self.cell_rows + 1) * cols + cell + row
+        sides = []
+        if row > 0:
+            sides.append((cell - cols, cell))
+        if row < self.cell_rows - 1:
+            sides.append((cell + cols, cell + cols))
+        if col < cols - 1:
+            sides.append((cell + 1, west_wall + 1))
+        if col > 0:
+            sides.append((cell - 1, west_wall))
+        return sides
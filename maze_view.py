@@ -0,0 +1,289 @@
+import base64
+import io
+from math import floor
+from time import monotonic
+from typing import Any, Optional
+
+from geometry import CellLocation
+from maze_engine import MazeObserver
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _horz_wall(grid: Any, row: int, col: int) -> Any:
+    """horizontal wall on vertex row row, 0..cell_rows"""
+    if row < grid.cell_rows:
+        return grid.get_north_wall(CellLocation(row=row, col=col))
+    return grid.get_south_wall(CellLocation(row=row - 1, col=col))
+
+def _vert_wall(grid: Any, row: int, col: int) -> Any:
+    """vertical wall on vertex col col, 0..cell_cols"""
+    if col < grid.cell_cols:
+        return grid.get_west_wall(CellLocation(row=row, col=col))
+    return grid.get_east_wall(CellLocation(row=row, col=col - 1))
+
+def tile_wall_runs(grid: Any, row0: int, col0: int, row1: int, col1: int
+                   ) -> tuple[list[tuple], list[tuple]]:
+    """solid wall runs and path segments owned by cells [row0, row1) x
+    [col0, col1), in cell units (x is the column, y the row)
+
+    A tile owns the north and west walls of its cells, plus the south and
+    east walls on the maze's outer edge, so tiles never draw a wall twice.
+    Walls run as (x0, y0, x1, y1); paths as (x0, y0, x1, y1, color) from
+    cell center to cell center.
+    """
+    walls: list[tuple] = []
+    paths: list[tuple] = []
+    last_row = row1 + (row1 == grid.cell_rows)
+    last_col = col1 + (col1 == grid.cell_cols)
+    for row in range(row0, last_row):
+        start = None
+        for col in range(col0, col1):
+            wall = _horz_wall(grid, row, col)
+            if wall.solid:
+                if start is None:
+                    start = col
+                continue
+            if start is not None:
+                walls.append((start, row, col, row))
+                start = None
+            if 0 < row < grid.cell_rows and (color := wall.path_color):
+                paths.append((col + 0.5, row - 0.5, col + 0.5, row + 0.5,
+                              color))
+        if start is not None:
+            walls.append((start, row, col1, row))
+    for col in range(col0, last_col):
+        start = None
+        for row in range(row0, row1):
+            wall = _vert_wall(grid, row, col)
+            if wall.solid:
+                if start is None:
+                    start = row
+                continue
+            if start is not None:
+                walls.append((col, start, col, row))
+                start = None
+            if 0 < col < grid.cell_cols and (color := wall.path_color):
+                paths.append((col - 0.5, row + 0.5, col + 0.5, row + 0.5,
+                              color))
+        if start is not None:
+            walls.append((col, start, col, row1))
+    return walls, paths
+
+class MazeView:
+    """zoomable, pannable view of a grid on a Tk canvas
+
+    Only the part of the maze inside the canvas gets canvas items.  Cells
+    are bucketed into tile_cells square tiles.  Each visible tile is drawn
+    once as merged wall runs under its own tag. Panning moves the existing
+    items and draws only the tiles that scrolled into view. Tiles that
+    scrolled out are deleted.  Below min_vector_pixels per cell, the maze is
+    shown as one image instead, rasterized by raster.render (needs numpy).
+
+    The view does not watch the grid.  Changes made through the engine
+    reach it through observer(); anything else should call invalidate().
+    """
+    def __init__(self, canvas: Any, grid: Any, cell_pixels: float=20.0,
+                 tile_cells: int=32, min_vector_pixels: float=4.0,
+                 wall_width: int=2, raster_interval: float=0.5) -> None:
+        self.canvas = canvas
+        self.grid = grid
+        self.scale = cell_pixels
+        self.tile_cells = tile_cells
+        self.min_vector_pixels = min_vector_pixels
+        self.wall_width = wall_width
+        self.raster_interval = raster_interval
+        # cell coordinates of the canvas's top left corner
+        self.left = 0.0
+        self.top = 0.0
+        self._tiles: set[tuple[int, int]] = set()
+        self._dirty: set[tuple[int, int]] = set()
+        self._pixels: Any = None
+        self._pixels_stale = False
+        self._rendered_at = 0.0
+        self._photo: Any = None
+        self._drag: Optional[tuple[int, int]] = None
+
+    def canvas_size(self) -> tuple[int, int]:
+        return (max(self.canvas.winfo_width(), 1),
+                max(self.canvas.winfo_height(), 1))
+
+    def visible_cells(self) -> tuple[int, int, int, int]:
+        """(row0, col0, row1, col1) of the cells on screen, row1/col1 past
+        the end"""
+        width, height = self.canvas_size()
+        row0 = max(floor(self.top), 0)
+        col0 = max(floor(self.left), 0)
+        row1 = min(floor(self.top + height / self.scale) + 1,
+                   self.grid.cell_rows)
+        col1 = min(floor(self.left + width / self.scale) + 1,
+                   self.grid.cell_cols)
+        return row0, col0, max(row1, row0), max(col1, col0)
+
+    def visible_tiles(self) -> set[tuple[int, int]]:
+        row0, col0, row1, col1 = self.visible_cells()
+        size = self.tile_cells
+        return {(tile_row, tile_col)
+                for tile_row in range(row0 // size, (row1 + size - 1) // size)
+                for tile_col in range(col0 // size, (col1 + size - 1) // size)}
+
+    def _tag(self, tile: tuple[int, int]) -> str:
+        return f"tile_{tile[0]}_{tile[1]}"
+
+    def _draw_tile(self, tile: tuple[int, int]) -> None:
+        size = self.tile_cells
+        row0, col0 = tile[0] * size, tile[1] * size
+        walls, paths = tile_wall_runs(
+            self.grid, row0, col0, min(row0 + size, self.grid.cell_rows),
+            min(col0 + size, self.grid.cell_cols))
+        tags = ("maze", self._tag(tile))
+        scale, left, top = self.scale, self.left, self.top
+        for x0, y0, x1, y1 in walls:
+            self.canvas.create_line((x0 - left) * scale, (y0 - top) * scale,
+                                    (x1 - left) * scale, (y1 - top) * scale,
+                                    width=self.wall_width, fill="black",
+                                    tags=tags)
+        for x0, y0, x1, y1, color in paths:
+            self.canvas.create_line((x0 - left) * scale, (y0 - top) * scale,
+                                    (x1 - left) * scale, (y1 - top) * scale,
+                                    width=self.wall_width, fill=color,
+                                    tags=tags)
+
+    def _clear_tiles(self) -> None:
+        self.canvas.delete("maze")
+        self._tiles.clear()
+
+    def _show_image(self, force: bool) -> None:
+        from tkinter import PhotoImage
+        from raster import render, write_png
+        # a whole-maze render is costly, so while the engine runs it is
+        # redone at most every raster_interval seconds
+        if self._pixels is None or (self._pixels_stale and (
+                force or monotonic() - self._rendered_at
+                >= self.raster_interval)):
+            self._pixels = render(self.grid)
+            self._pixels_stale = False
+            self._rendered_at = monotonic()
+        width, height = self.canvas_size()
+        # the render has one pixel per VCW slot, two per cell
+        xs = np.rint(2 * (self.left + np.arange(width) / self.scale))
+        ys = np.rint(2 * (self.top + np.arange(height) / self.scale))
+        rows, cols = self._pixels.shape[:2]
+        inside = ((ys >= 0) & (ys < rows))[:, None] \
+            & ((xs >= 0) & (xs < cols))[None, :]
+        view = self._pixels[np.clip(ys, 0, rows - 1).astype(int)][
+            :, np.clip(xs, 0, cols - 1).astype(int)]
+        view[~inside] = 255
+        data = io.BytesIO()
+        write_png(view, data, level=1)
+        self._photo = PhotoImage(data=base64.b64encode(data.getvalue()),
+                                 format="png")
+        self.canvas.delete("maze_image")
+        self.canvas.create_image(0, 0, image=self._photo, anchor="nw",
+                                 tags=("maze_image",))
+
+    def refresh(self, force: bool=False) -> None:
+        """brings the canvas up to date with the view and the grid"""
+        if self.scale < self.min_vector_pixels and np is not None:
+            self._clear_tiles()
+            self._dirty.clear()
+            self._show_image(force)
+            return
+        if self._photo is not None:
+            self.canvas.delete("maze_image")
+            self._photo = None
+        wanted = self.visible_tiles()
+        for tile in self._tiles - wanted:
+            self.canvas.delete(self._tag(tile))
+        for tile in self._dirty & self._tiles & wanted:
+            self.canvas.delete(self._tag(tile))
+            self._draw_tile(tile)
+        for tile in wanted - self._tiles:
+            self._draw_tile(tile)
+        self._tiles = wanted
+        self._dirty.clear()
+
+    def invalidate(self) -> None:
+        self._pixels_stale = True
+        self._dirty |= self._tiles
+        self.refresh(force=True)
+
+    def cell_changed(self, loc: CellLocation) -> None:
+        """marks the tile holding loc for redrawing on the next refresh"""
+        self._pixels_stale = True
+        self._dirty.add((loc.row // self.tile_cells,
+                         loc.col // self.tile_cells))
+
+    def pan(self, dx: float, dy: float) -> None:
+        """moves the maze by dx, dy canvas pixels"""
+        self.left -= dx / self.scale
+        self.top -= dy / self.scale
+        self.canvas.move("maze", dx, dy)
+        self.refresh()
+
+    def zoom(self, factor: float, x: float, y: float) -> None:
+        """scales by factor, keeping the point under canvas x, y fixed"""
+        anchor_col = self.left + x / self.scale
+        anchor_row = self.top + y / self.scale
+        self.scale *= factor
+        self.left = anchor_col - x / self.scale
+        self.top = anchor_row - y / self.scale
+        self._clear_tiles()
+        self.refresh()
+
+    def bind(self) -> None:
+        """drag with the left button pans, the wheel zooms at the pointer"""
+        def press(event: Any) -> None:
+            self._drag = (event.x, event.y)
+        def motion(event: Any) -> None:
+            if self._drag is not None:
+                self.pan(event.x - self._drag[0], event.y - self._drag[1])
+                self._drag = (event.x, event.y)
+        def wheel(event: Any) -> None:
+            zoom_in = getattr(event, "delta", 0) > 0 or event.num == 4
+            self.zoom(1.25 if zoom_in else 0.8, event.x, event.y)
+        self.canvas.bind("<ButtonPress-1>", press)
+        self.canvas.bind("<B1-Motion>", motion)
+        self.canvas.bind("<MouseWheel>", wheel)
+        self.canvas.bind("<Button-4>", wheel)
+        self.canvas.bind("<Button-5>", wheel)
+        self.canvas.bind("<Configure>", lambda event: self.refresh())
+
+    def observer(self, refresh_interval: float=1 / 60) -> MazeObserver:
+        return MazeViewObserver(self, refresh_interval)
+
+class MazeViewObserver(MazeObserver):
+    """keeps a MazeView in step with the engine
+
+    The view is refreshed at most once per refresh_interval seconds, so
+    an engine running many steps a frame redraws each dirty tile once.
+    Call view.invalidate() when the run is over to show the last steps.
+    """
+    def __init__(self, view: MazeView, refresh_interval: float=1 / 60) -> None:
+        self.view = view
+        self.refresh_interval = refresh_interval
+        self._refreshed_at = 0.0
+
+    def wall_removed(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.view.cell_changed(from_loc)
+        self.view.cell_changed(to_loc)
+
+    def cell_entered(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.view.cell_changed(from_loc)
+        self.view.cell_changed(to_loc)
+
+    def backtracked(self, wall: Any, from_loc: CellLocation,
+                    to_loc: CellLocation) -> None:
+        if wall is not None:
+            self.view.cell_changed(from_loc)
+            self.view.cell_changed(to_loc)
+
+    def step(self) -> None:
+        now = monotonic()
+        if now - self._refreshed_at >= self.refresh_interval:
+            self._refreshed_at = now
+            self.view.refresh()
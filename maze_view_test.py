@@ -0,0 +1,103 @@
+import unittest
+import random
+
+from generators import generate
+from maze_engine import run_maze
+from maze_view import MazeView, tile_wall_runs
+
+class RecordingCanvas:
+    """just enough of a Tk Canvas to count what a MazeView draws"""
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.items: dict[int, tuple] = {}
+        self.next_item = 0
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def create_line(self, *coords, tags=(), **options) -> int:
+        self.next_item += 1
+        self.items[self.next_item] = tags
+        return self.next_item
+
+    def delete(self, tag: str) -> None:
+        self.items = {item: tags for item, tags in self.items.items()
+                      if tag not in tags}
+
+    def move(self, tag: str, dx: float, dy: float) -> None:
+        pass
+
+def unit_walls(runs: list[tuple]) -> set:
+    walls = set()
+    for x0, y0, x1, y1 in runs:
+        if y0 == y1:
+            walls.update(("h", y0, x) for x in range(x0, x1))
+        else:
+            walls.update(("v", y, x0) for y in range(y0, y1))
+    return walls
+
+def solid_walls(grid) -> set:
+    walls = set()
+    def collect(wall):
+        if wall.solid:
+            kind = "h" if wall.loc.row % 2 == 0 else "v"
+            walls.add((kind, wall.loc.row // 2, wall.loc.col // 2))
+    grid.map_walls(collect)
+    return walls
+
+class Tests(unittest.TestCase):
+    def test_tiles_cover_each_solid_wall_once(self):
+        grid = generate(13, 17, rng=random.Random(3))
+        run_maze(grid, rng=random.Random(4))
+        runs, paths = [], []
+        for row0 in range(0, 13, 5):
+            for col0 in range(0, 17, 5):
+                walls, tile_paths = tile_wall_runs(
+                    grid, row0, col0, min(row0 + 5, 13), min(col0 + 5, 17))
+                runs.extend(walls)
+                paths.extend(tile_paths)
+        self.assertEqual(sum(len(unit_walls([run])) for run in runs),
+                         len(solid_walls(grid)))
+        self.assertEqual(unit_walls(runs), solid_walls(grid))
+        colored = []
+        grid.map_walls(lambda wall: colored.append(wall.path_color)
+                       if wall.path_color else None)
+        self.assertEqual(len(paths), len(colored))
+
+    def test_only_visible_tiles_are_drawn(self):
+        grid = generate(200, 300, "kruskal", rng=random.Random(1))
+        canvas = RecordingCanvas(400, 300)
+        view = MazeView(canvas, grid, cell_pixels=10, tile_cells=16)
+        view.refresh()
+        self.assertEqual(view.visible_cells(), (0, 0, 31, 41))
+        self.assertEqual(len(view._tiles), 2 * 3)
+        tiles = {tags[1] for tags in canvas.items.values()}
+        self.assertEqual(len(tiles), 6)
+        view.pan(-200, 0)
+        self.assertEqual(view.visible_cells(), (0, 20, 31, 61))
+        self.assertEqual({tile[1] for tile in view._tiles}, {1, 2, 3})
+        tiles = {tags[1] for tags in canvas.items.values()}
+        self.assertFalse(any(tag.endswith("_0") for tag in tiles))
+        view.zoom(2.0, 0, 0)
+        self.assertEqual(view.visible_cells(), (0, 20, 16, 41))
+
+    def test_observer_refreshes_at_most_once_per_interval(self):
+        created = {}
+        for interval in (0, 3600):
+            grid = generate(40, 40, rng=random.Random(2))
+            canvas = RecordingCanvas(200, 200)
+            view = MazeView(canvas, grid, cell_pixels=10, tile_cells=8)
+            view.refresh()
+            run_maze(grid, random.Random(2), view.observer(interval))
+            created[interval] = canvas.next_item
+            view.invalidate()
+            self.assertGreater(canvas.next_item, created[interval])
+        # per-step refreshes redraw the same tiles over and over
+        self.assertGreater(created[0], 10 * created[3600])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,337 @@
+from typing import Optional, Any, Callable, Iterable
+
+from geometry import CellLocation, Line
+from maze_elements import VisitEpochs
+from maze_size import MazeSize
+from vcw_grid import VCWGrid, VCWGridLoc
+
+def _bit_bytes(num_bits: int) -> int:
+    return (num_bits + 7) // 8
+
+def _get_bit(bits: bytearray, idx: int) -> bool:
+    return bool(bits[idx >> 3] & (1 << (idx & 7)))
+
+# _CLEAR_BIT[n] keeps every bit of a byte but bit n
+_CLEAR_BIT = tuple(0xFF ^ (1 << bit) for bit in range(8))
+
+def _set_bit(bits: bytearray, idx: int, value: bool) -> None:
+    if value:
+        bits[idx >> 3] |= (1 << (idx & 7))
+    else:
+        bits[idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
+
+# path colors are 2-bit palette indexes, four to a byte
+MAX_PATH_COLORS = 3
+
+def _crumb_bytes(num_crumbs: int) -> int:
+    return (num_crumbs + 3) // 4
+
+def _get_crumb(crumbs: bytearray, idx: int) -> int:
+    return (crumbs[idx >> 2] >> ((idx & 3) * 2)) & 0b11
+
+def _set_crumb(crumbs: bytearray, idx: int, value: int) -> None:
+    shift = (idx & 3) * 2
+    cleared = crumbs[idx >> 2] & ~(0b11 << shift) & 0xFF
+    crumbs[idx >> 2] = cleared | (value << shift)
+
+class PackedWall:
+    """view of one wall slot in a PackedVCWGrid, stands in for WallPath"""
+    __slots__ = ("_grid", "_horizontal", "_index", "loc")
+
+    def __init__(self, grid: "PackedVCWGrid", horizontal: bool,
+                 index: int, loc: VCWGridLoc) -> None:
+        self._grid = grid
+        self._horizontal = horizontal
+        self._index = index
+        self.loc = loc
+
+    @property
+    def solid(self) -> bool:
+        return self._grid._is_solid(self._horizontal, self._index)
+
+    @solid.setter
+    def solid(self, value: bool) -> None:
+        self._grid._set_solid(self._horizontal, self._index, value)
+
+    @property
+    def path_color(self) -> Optional[str]:
+        return self._grid._get_color(self._horizontal, self._index)
+
+    @path_color.setter
+    def path_color(self, value: Optional[str]) -> None:
+        self._grid._set_color(self._horizontal, self._index, value)
+
+    @property
+    def wall(self) -> Line:
+        return self._grid._wall_path_lines(self.loc).wall
+
+    @property
+    def path(self) -> Line:
+        return self._grid._wall_path_lines(self.loc).path
+
+    def __repr__(self) -> str:
+        return (f"PackedWall(loc={self.loc}, solid={self.solid}, "
+                f"path_color={self.path_color!r})")
+
+class PackedCell:
+    """view of one cell slot in a PackedVCWGrid, stands in for Cell"""
+    __slots__ = ("_grid", "_index", "loc")
+
+    def __init__(self, grid: "PackedVCWGrid", index: int,
+                 loc: CellLocation) -> None:
+        self._grid = grid
+        self._index = index
+        self.loc = loc
+
+    @property
+    def visited(self) -> bool:
+        return self._grid.visits.is_visited(self._index)
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        self._grid.visits.mark(self._index, value)
+
+    def __repr__(self) -> str:
+        return f"PackedCell(loc={self.loc}, visited={self.visited})"
+
+class PackedVCWGrid:
+    """VCWGrid work-alike that stores walls as bits instead of objects
+
+    Horizontal walls are numbered row by row, (cell_rows+1) rows of
+    cell_cols walls; vertical walls are cell_rows rows of cell_cols+1
+    walls.  A set bit means the wall is solid.  Path colors are kept as a
+    2-bit palette index per wall, and visited as one byte epoch stamp per
+    cell (see VisitEpochs), allocated only once something visits a cell.
+    The getters hand out small PackedWall/PackedCell views so callers can
+    keep writing `wall.solid = False` and `cell.visited = True`.
+    """
+    def __init__(self, cell_rows: int, cell_cols: int,
+                 horz_bits: Any=None, vert_bits: Any=None,
+                 buffer: Any=None) -> None:
+        """horz_bits/vert_bits can hand in existing wall bitmaps, any
+        writable (or, for read-only use, readable) byte buffer works,
+        e.g. a memoryview over an mmap.  buffer is what they point into,
+        when it needs closing: the grid keeps it alive and close() closes
+        it."""
+        self.cell_rows = cell_rows
+        self.cell_cols = cell_cols
+        self.size = MazeSize(cell_rows=cell_rows, cell_cols=cell_cols)
+        self._row_length = 2 * self.cell_rows + 1
+        self._col_length = 2 * self.cell_cols + 1
+        self._horz = PackedVCWGrid._wall_bits(self.size.num_horz_walls,
+                                              horz_bits)
+        self._vert = PackedVCWGrid._wall_bits(self.size.num_vert_walls,
+                                              vert_bits)
+        self._horz_color = bytearray(_crumb_bytes(self.size.num_horz_walls))
+        self._vert_color = bytearray(_crumb_bytes(self.size.num_vert_walls))
+        self.visits = VisitEpochs(self.size.num_cells, "B")
+        self.wall_version = 0   # bumped on every wall change
+        self._palette: list[Optional[str]] = [None]
+        self._line_factory: Optional[Callable[[VCWGridLoc], Any]] = None
+        self.buffer = buffer
+
+    def close(self) -> None:
+        """lets go of the wall bitmaps and closes buffer, e.g. releasing
+        load_maze's mmap; the grid can't be used afterwards"""
+        for bits in (self._horz, self._vert):
+            if isinstance(bits, memoryview):
+                bits.release()
+        if self.buffer is not None:
+            self.buffer.close()
+            self.buffer = None
+
+    def __enter__(self) -> "PackedVCWGrid":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _wall_bits(num_walls: int, bits: Any) -> Any:
+        if bits is None:
+            return bytearray(b"\xff" * _bit_bytes(num_walls))
+        if len(bits) != _bit_bytes(num_walls):
+            raise Exception(f"Wall bitmap is {len(bits)} bytes, "
+                            f"expected {_bit_bytes(num_walls)}")
+        return bits
+
+    @property
+    def horz_wall_bits(self) -> Any:
+        return self._horz
+
+    @property
+    def vert_wall_bits(self) -> Any:
+        return self._vert
+
+    @property
+    def horz_color_crumbs(self) -> bytearray:
+        return self._horz_color
+
+    @property
+    def vert_color_crumbs(self) -> bytearray:
+        return self._vert_color
+
+    @property
+    def palette(self) -> list[Optional[str]]:
+        """path color names by crumb value, palette[0] is always None"""
+        return self._palette
+
+    # VCWGrid's versions only look at cell_rows/cell_cols
+    cells_locs = VCWGrid.cells_locs
+    get_adjacent_cell_locations = VCWGrid.get_adjacent_cell_locations
+
+    def _is_solid(self, horizontal: bool, idx: int) -> bool:
+        return _get_bit(self._horz if horizontal else self._vert, idx)
+
+    def _set_solid(self, horizontal: bool, idx: int, value: bool) -> None:
+        _set_bit(self._horz if horizontal else self._vert, idx, value)
+        self.wall_version += 1
+
+    def _get_color(self, horizontal: bool, idx: int) -> Optional[str]:
+        colors = self._horz_color if horizontal else self._vert_color
+        return self._palette[_get_crumb(colors, idx)]
+
+    def _set_color(self, horizontal: bool, idx: int,
+                   color: Optional[str]) -> None:
+        try:
+            color_idx = self._palette.index(color)
+        except ValueError:
+            if len(self._palette) > MAX_PATH_COLORS:
+                raise Exception(f"Too many path colors for {color!r}")
+            self._palette.append(color)
+            color_idx = len(self._palette) - 1
+        colors = self._horz_color if horizontal else self._vert_color
+        _set_crumb(colors, idx, color_idx)
+
+    def _wall_path_lines(self, loc: VCWGridLoc) -> Any:
+        if self._line_factory is None:
+            raise Exception("populate_walls was never given a line factory")
+        return self._line_factory(loc)
+
+    def _horz_wall(self, row: int, col: int) -> PackedWall:
+        return PackedWall(self, True, row * self.cell_cols + col,
+                          VCWGridLoc(row=2 * row, col=2 * col + 1))
+
+    def _vert_wall(self, row: int, col: int) -> PackedWall:
+        return PackedWall(self, False, row * (self.cell_cols + 1) + col,
+                          VCWGridLoc(row=2 * row + 1, col=2 * col))
+
+    def map_cells(self, func: Callable[[Any], Any]) -> None:
+        for loc in self.cells_locs():
+            func(self.get_cell(loc))
+
+    def map_walls(self, func: Callable[[Any], Any]):
+        for row in range(0, self._row_length, 1):
+            if row % 2 == 1:
+                for col in range(self.cell_cols + 1):
+                    func(self._vert_wall(row // 2, col))
+            else:
+                for col in range(self.cell_cols):
+                    func(self._horz_wall(row // 2, col))
+
+    def populate_cells(self, func: Callable[[CellLocation], Any]):
+        """cells only have a visited flag here, so this just clears them"""
+        self.new_traversal()
+
+    def populate_walls(self, func: Callable[[VCWGridLoc], Any]):
+        """resets every wall to solid and remembers func for wall/path lines"""
+        self._line_factory = func
+        self.wall_version += 1
+        self._horz[:] = b"\xff" * len(self._horz)
+        self._vert[:] = b"\xff" * len(self._vert)
+        self._horz_color[:] = bytes(len(self._horz_color))
+        self._vert_color[:] = bytes(len(self._vert_color))
+
+    def snapshot(self) -> tuple:
+        """copy of the walls and path colors, for restore()"""
+        return (bytes(self._horz), bytes(self._vert), bytes(self._horz_color),
+                bytes(self._vert_color), tuple(self._palette))
+
+    def restore(self, state: tuple) -> None:
+        horz, vert, horz_color, vert_color, palette = state
+        self._horz[:] = horz
+        self._vert[:] = vert
+        self._horz_color[:] = horz_color
+        self._vert_color[:] = vert_color
+        self._palette[:] = palette
+        self.wall_version += 1
+
+    def is_valid_cell(self, row: int, col: int) -> bool:
+        return (col >= 0 and col < self.cell_cols
+                and row >= 0 and row < self.cell_rows)
+
+    def get_cell(self, loc: CellLocation) -> PackedCell:
+        if not self.is_valid_cell(row=loc.row, col=loc.col):
+            raise Exception(f"Cell index out of range {loc}")
+        return PackedCell(self, loc.row * self.cell_cols + loc.col, loc)
+
+    def set_cell(self, loc: CellLocation, val: Any) -> None:
+        self.get_cell(loc).visited = bool(val.visited)
+
+    def _wall_slot(self, wall_id: int) -> tuple[bool, int]:
+        """wall id to (horizontal, bit index); ids are the horizontal bits
+        followed by the vertical ones"""
+        if wall_id < self.size.num_horz_walls:
+            return True, wall_id
+        return False, wall_id - self.size.num_horz_walls
+
+    def wall_at(self, wall_id: int) -> PackedWall:
+        horizontal, idx = self._wall_slot(wall_id)
+        if horizontal:
+            return self._horz_wall(*divmod(idx, self.cell_cols))
+        return self._vert_wall(*divmod(idx, self.cell_cols + 1))
+
+    def wall_is_solid(self, wall_id: int) -> bool:
+        return self._is_solid(*self._wall_slot(wall_id))
+
+    def set_wall_solid(self, wall_id: int, solid: bool) -> None:
+        self._set_solid(*self._wall_slot(wall_id), solid)
+
+    def set_path_color(self, wall_id: int, color: Optional[str]) -> None:
+        self._set_color(*self._wall_slot(wall_id), color)
+
+    def new_traversal(self) -> None:
+        """marks every cell unvisited, in O(1)"""
+        self.visits.new_traversal()
+
+    def cell_visited(self, cell_id: int) -> bool:
+        return self.visits.is_visited(cell_id)
+
+    def set_cell_visited(self, cell_id: int, visited: bool) -> None:
+        self.visits.mark(cell_id, visited)
+
+    def open_walls(self, east: Iterable[int], south: Iterable[int]) -> None:
+        """VCWGrid.open_walls, clearing the bits in one loop per side"""
+        cols = self.cell_cols
+        vert, horz = self._vert, self._horz
+        for cell in east:
+            # vertical rows are one wall longer than cell rows
+            idx = cell + cell // cols + 1
+            vert[idx >> 3] &= _CLEAR_BIT[idx & 7]
+        for cell in south:
+            idx = cell + cols
+            horz[idx >> 3] &= _CLEAR_BIT[idx & 7]
+        self.wall_version += 1
+
+    def open_wall_between(self, from_id: int, to_id: int) -> None:
+        """VCWGrid.open_wall_between without building any views"""
+        col = from_id % self.cell_cols
+        if to_id == from_id + 1 and col < self.cell_cols - 1:
+            # east wall: vertical rows are one wall longer than cell rows
+            _set_bit(self._vert, from_id + from_id // self.cell_cols + 1, False)
+        elif to_id == from_id + self.cell_cols:
+            _set_bit(self._horz, to_id, False)
+        else:
+            raise Exception(f"Cell {to_id} is not east or south of {from_id}")
+        self.wall_version += 1
+
+    def get_north_wall(self, loc: CellLocation) -> PackedWall:
+        return self._horz_wall(loc.row, loc.col)
+
+    def get_south_wall(self, loc: CellLocation) -> PackedWall:
+        return self._horz_wall(loc.row + 1, loc.col)
+
+    def get_east_wall(self, loc: CellLocation) -> PackedWall:
+        return self._vert_wall(loc.row, loc.col + 1)
+
+    def get_west_wall(self, loc: CellLocation) -> PackedWall:
+        return self._vert_wall(loc.row, loc.col)
@@ -0,0 +1,58 @@
+import unittest
+
+from geometry import CellLocation
+from maze_elements import Cell, WallPath
+from packed_grid import PackedVCWGrid
+
+class Tests(unittest.TestCase):
+    def test_packed_grid_starts_solid(self):
+        grid2x3 = PackedVCWGrid(2, 3)
+        solid = []
+        grid2x3.map_walls(lambda w: solid.append(w.solid))
+        self.assertEqual(len(solid), 3 * 3 + 2 * 4)
+        self.assertTrue(all(solid))
+
+    def test_packed_grid_shared_walls(self):
+        grid2x3 = PackedVCWGrid(2, 3)
+        grid2x3.get_south_wall(CellLocation(row=0, col=1)).solid = False
+        grid2x3.get_west_wall(CellLocation(row=1, col=2)).solid = False
+        self.assertFalse(grid2x3.get_north_wall(CellLocation(row=1, col=1)).solid)
+        self.assertFalse(grid2x3.get_east_wall(CellLocation(row=1, col=1)).solid)
+        self.assertTrue(grid2x3.get_north_wall(CellLocation(row=0, col=1)).solid)
+        self.assertTrue(grid2x3.get_east_wall(CellLocation(row=0, col=1)).solid)
+
+    def test_packed_grid_path_color(self):
+        grid2x3 = PackedVCWGrid(2, 3)
+        wall = grid2x3.get_east_wall(CellLocation(row=0, col=0))
+        self.assertIsNone(wall.path_color)
+        wall.path_color = "blue"
+        grid2x3.get_west_wall(CellLocation(row=1, col=1)).path_color = "goldenrod2"
+        self.assertEqual(
+            grid2x3.get_west_wall(CellLocation(row=0, col=1)).path_color,
+            "blue")
+        self.assertEqual(
+            grid2x3.get_east_wall(CellLocation(row=1, col=0)).path_color,
+            "goldenrod2")
+
+    def test_packed_grid_visited(self):
+        grid2x3 = PackedVCWGrid(2, 3)
+        loc = CellLocation(row=1, col=2)
+        grid2x3.get_cell(loc).visited = True
+        self.assertTrue(grid2x3.get_cell(loc).visited)
+        grid2x3.set_cell(loc, Cell(loc=loc, visited=False))
+        self.assertFalse(grid2x3.get_cell(loc).visited)
+        with self.assertRaises(Exception):
+            grid2x3.get_cell(CellLocation(row=2, col=0))
+
+    def test_packed_grid_lines_from_factory(self):
+        grid2x3 = PackedVCWGrid(2, 3)
+        grid2x3.populate_walls(
+            lambda idx: WallPath(wall=(idx.row, idx.col), path=None))
+        self.assertEqual(
+            grid2x3.get_north_wall(CellLocation(row=1, col=2)).wall, (2, 5))
+        self.assertEqual(
+            grid2x3.get_west_wall(CellLocation(row=1, col=2)).wall, (3, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
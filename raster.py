@@ -0,0 +1,163 @@
+import struct
+import zlib
+from typing import Any, BinaryIO, Optional
+
+import numpy as np
+
+from colors import rgb
+from geometry import CellLocation
+from maze_engine import FORWARD_PASS_COLOR, start_location, end_location
+from wall_arrays import wall_arrays, path_color_arrays
+
+class _Layout:
+    """pixel geometry: vertex (r, c) sits at (top + r*step, left + c*step)
+
+    With a GridToScreenTranslator this is the Tk canvas geometry; without
+    one every vertex, wall and cell of the VCW grid is one pixel.
+    """
+    def __init__(self, grid: Any, screen: Any=None) -> None:
+        rows, cols = grid.cell_rows, grid.cell_cols
+        if screen is None:
+            self.left = self.top = 0
+            self.step, self.half = 2, 1
+            width, height = 2 * cols + 1, 2 * rows + 1
+        else:
+            self.left, self.top = screen.upper_corner.x, screen.upper_corner.y
+            self.step, self.half = screen.cell_size, screen.half_cell
+            # walls on the far edge land one pixel past a zero border
+            width = max(screen.size["width"], self.left + cols * self.step + 1)
+            height = max(screen.size["height"],
+                         self.top + rows * self.step + 1)
+        self.width, self.height = width, height
+
+    def cell_center(self, loc: CellLocation) -> tuple[int, int]:
+        return (self.top + loc.row * self.step + self.half,
+                self.left + loc.col * self.step + self.half)
+
+def _paint_walls(pixels: np.ndarray, layout: _Layout, horz: np.ndarray,
+                 vert: np.ndarray, color: tuple[int, int, int]) -> None:
+    rows, cols = vert.shape[0], horz.shape[1]
+    top, left, step = layout.top, layout.left, layout.step
+    bottom, right = top + rows * step, left + cols * step
+    # every wall line is one strided slice of the whole buffer
+    pixels[top:bottom + 1:step, left:right][np.repeat(horz, step, 1)] = color
+    pixels[top:bottom, left:right + 1:step][np.repeat(vert, step, 0)] = color
+    vertex = np.zeros((rows + 1, cols + 1), dtype=bool)
+    vertex[:, :-1] |= horz
+    vertex[:, 1:] |= horz
+    vertex[:-1, :] |= vert
+    vertex[1:, :] |= vert
+    pixels[top:bottom + 1:step, left:right + 1:step][vertex] = color
+
+def _paint_path_crossings(pixels: np.ndarray, layout: _Layout,
+                          horz: np.ndarray, vert: np.ndarray,
+                          color: tuple[int, int, int]) -> None:
+    """center to center segments through every flagged wall
+
+    Only walls between two cells are looked at, the outer border never
+    carries a path.
+    """
+    rows, cols = vert.shape[0], horz.shape[1]
+    top, left, step, half = layout.top, layout.left, layout.step, layout.half
+    inner_horz = horz[1:-1]
+    inner_vert = vert[:, 1:-1]
+    for offset in range(-half, half + 1):
+        y0 = top + step + offset
+        pixels[y0:y0 + (rows - 1) * step:step,
+               left + half:left + cols * step:step][inner_horz] = color
+        x0 = left + step + offset
+        pixels[top + half:top + rows * step:step,
+               x0:x0 + (cols - 1) * step:step][inner_vert] = color
+
+def _paint_route(pixels: np.ndarray, layout: _Layout,
+                 route: list[CellLocation],
+                 color: tuple[int, int, int]) -> None:
+    if not route:
+        return
+    centers = np.array([layout.cell_center(loc) for loc in route])
+    pixels[centers[:, 0], centers[:, 1]] = color
+    if len(route) < 2:
+        return
+    start, moves = centers[:-1], np.sign(centers[1:] - centers[:-1])
+    along = np.arange(layout.step + 1)
+    ys = start[:, 0, None] + moves[:, 0, None] * along
+    xs = start[:, 1, None] + moves[:, 1, None] * along
+    pixels[ys, xs] = color
+
+def _paint_dot(pixels: np.ndarray, layout: _Layout, loc: CellLocation,
+               color: tuple[int, int, int]) -> None:
+    radius = layout.half // 2
+    y, x = layout.cell_center(loc)
+    offsets = np.arange(-radius, radius + 1)
+    disk = offsets[:, None] ** 2 + offsets[None, :] ** 2 <= radius ** 2
+    pixels[y - radius:y + radius + 1, x - radius:x + radius + 1][disk] = color
+
+def render(grid: Any, screen: Any=None,
+           route: Optional[list[CellLocation]]=None,
+           route_color: str=FORWARD_PASS_COLOR, path_colors: bool=True,
+           dots: bool=True) -> np.ndarray:
+    """rasterizes the maze into a (height, width, 3) uint8 RGB array
+
+    screen is a GridToScreenTranslator for the Tk canvas geometry, None
+    gives one pixel per VCW grid slot.  path_colors paints the colors
+    run_maze leaves on the walls, route (e.g. a SolveResult.path) is
+    drawn on top in route_color, and dots marks start and end like main.
+    """
+    layout = _Layout(grid, screen)
+    pixels = np.full((layout.height, layout.width, 3), 255, dtype=np.uint8)
+    horz, vert = wall_arrays(grid)
+    _paint_walls(pixels, layout, horz, vert, rgb("black"))
+    if path_colors:
+        horz_codes, vert_codes, palette = path_color_arrays(grid)
+        used = [code for code in range(1, len(palette))
+                if palette[code] is not None]
+        # the forward pass goes over backtracking, as it does on screen
+        used.sort(key=lambda code: palette[code] == FORWARD_PASS_COLOR)
+        for code in used:
+            _paint_path_crossings(pixels, layout, horz_codes == code,
+                                  vert_codes == code, rgb(palette[code]))
+    if route:
+        _paint_route(pixels, layout, route, rgb(route_color))
+    if dots:
+        for loc in (start_location(grid), end_location(grid)):
+            _paint_dot(pixels, layout, loc, rgb("blue"))
+    return pixels
+
+def write_ppm(pixels: np.ndarray, fh: BinaryIO) -> None:
+    height, width, _ = pixels.shape
+    fh.write(f"P6\n{width} {height}\n255\n".encode("ascii"))
+    fh.write(np.ascontiguousarray(pixels, dtype=np.uint8).tobytes())
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data)))
+
+def write_png(pixels: np.ndarray, fh: BinaryIO, level: int=6,
+              rows_per_block: int=256) -> None:
+    """8-bit RGB PNG, no filtering, compressed a block of rows at a time"""
+    height, width, _ = pixels.shape
+    fh.write(b"\x89PNG\r\n\x1a\n")
+    fh.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height,
+                                             8, 2, 0, 0, 0)))
+    compressor = zlib.compressobj(level)
+    idat = []
+    for row0 in range(0, height, rows_per_block):
+        block = pixels[row0:row0 + rows_per_block].reshape(-1, width * 3)
+        # each scanline starts with its filter type, 0 is none
+        scanlines = np.zeros((block.shape[0], width * 3 + 1), dtype=np.uint8)
+        scanlines[:, 1:] = block
+        idat.append(compressor.compress(scanlines.tobytes()))
+    idat.append(compressor.flush())
+    fh.write(_png_chunk(b"IDAT", b"".join(idat)))
+    fh.write(_png_chunk(b"IEND", b""))
+
+IMAGE_WRITERS = {".png": write_png, ".ppm": write_ppm}
+
+def save_image(pixels: np.ndarray, path: str) -> None:
+    """writes pixels as PNG or PPM, picked by the file extension"""
+    suffix = path[path.rfind("."):].lower() if "." in path else ""
+    if suffix not in IMAGE_WRITERS:
+        raise Exception(f"Unknown image extension for {path!r}, "
+                        f"expected one of {sorted(IMAGE_WRITERS)}")
+    with open(path, "wb") as fh:
+        IMAGE_WRITERS[suffix](pixels, fh)
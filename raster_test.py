@@ -0,0 +1,63 @@
+import unittest
+import io
+import random
+import struct
+import zlib
+
+import numpy as np
+
+from colors import rgb
+from generators import generate
+from maze_engine import run_maze
+from packed_grid import PackedVCWGrid
+from raster import render, write_png, write_ppm
+from solvers import bfs
+from vcw_grid import VCWGrid
+from wall_arrays import wall_arrays
+
+class Tests(unittest.TestCase):
+    def test_compact_render_marks_solid_walls(self):
+        grid = generate(5, 7, rng=random.Random(2))
+        pixels = render(grid, path_colors=False, dots=False)
+        self.assertEqual(pixels.shape, (11, 15, 3))
+        horz, vert = wall_arrays(grid)
+        black = (pixels == 0).all(axis=2)
+        self.assertTrue((black[0::2, 1::2] == horz).all())
+        self.assertTrue((black[1::2, 0::2] == vert).all())
+        self.assertFalse(black[1::2, 1::2].any())
+
+    def test_backends_render_the_same(self):
+        grids = [generate(6, 9, rng=random.Random(4), grid_class=grid_class)
+                 for grid_class in (VCWGrid, PackedVCWGrid)]
+        for grid in grids:
+            run_maze(grid, rng=random.Random(8))
+        self.assertTrue((render(grids[0]) == render(grids[1])).all())
+
+    def test_route_is_drawn_cell_to_cell(self):
+        grid = generate(6, 6, rng=random.Random(1))
+        route = bfs(grid).path
+        pixels = render(grid, route=route, path_colors=False, dots=False)
+        blue = (pixels == rgb("blue")).all(axis=2)
+        # each cell plus the wall slot between consecutive cells
+        self.assertEqual(int(blue.sum()), 2 * len(route) - 1)
+
+    def test_png_and_ppm_round_trip(self):
+        pixels = render(generate(4, 5, rng=random.Random(3)))
+        height, width, _ = pixels.shape
+        fh = io.BytesIO()
+        write_ppm(pixels, fh)
+        header = f"P6\n{width} {height}\n255\n".encode("ascii")
+        self.assertEqual(fh.getvalue(), header + pixels.tobytes())
+        fh = io.BytesIO()
+        write_png(pixels, fh, rows_per_block=3)
+        data = fh.getvalue()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        idat_len, = struct.unpack(">I", data[33:37])
+        self.assertEqual(data[37:41], b"IDAT")
+        raw = zlib.decompress(data[41:41 + idat_len])
+        scanlines = np.frombuffer(raw, dtype=np.uint8).reshape(height, -1)
+        self.assertFalse(scanlines[:, 0].any())
+        self.assertEqual(scanlines[:, 1:].tobytes(), pixels.tobytes())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from time import monotonic
+from typing import Any
+
+from event_log import EventLog, ReplayState
+from tk_drawing import draw_wall_path
+from window import Window
+
+class ReplayPlayer:
+    """plays an EventLog on a Window without re-running the engine
+
+    Playback runs from Tk after() callbacks, advancing
+    speed * steps_per_second steps per second of wall time and drawing
+    only the walls each step changed.  seek()/scrub() jump through the
+    ReplayState keyframes and then resync every wall on the canvas.
+    steps_per_second defaults to the pace of run_maze's 0.1s step delay.
+    """
+    def __init__(self, window: Window, log: EventLog, screen: Any,
+                 speed: float=1.0, steps_per_second: float=10.0,
+                 keyframe_every: int=1000) -> None:
+        self.window = window
+        self.state = ReplayState(log, keyframe_every,
+                                 wall_factory=screen.generate_wall_path_line)
+        self.speed = speed
+        self.steps_per_second = steps_per_second
+        self.playing = False
+        self._carry = 0.0
+        self._last_tick = 0.0
+        self._run = 0   # bumped per play() so a stale tick chain stops
+        self._frame_ms = max(1, int(1000 / (window.max_fps or 60)))
+
+    def draw_all(self) -> None:
+        self.state.grid.map_walls(
+            lambda wall: draw_wall_path(self.window, wall))
+        self.window.flush()
+
+    def play(self) -> None:
+        if self.playing or self.state.finished:
+            return
+        self.playing = True
+        self._carry = 0.0
+        self._last_tick = monotonic()
+        self._run += 1
+        run = self._run
+        self.window.after(self._frame_ms, lambda: self._tick(run))
+
+    def pause(self) -> None:
+        self.playing = False
+
+    def toggle(self) -> None:
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def _tick(self, run: int) -> None:
+        if not self.playing or run != self._run:
+            return
+        now = monotonic()
+        self._carry += (now - self._last_tick) * self.speed \
+            * self.steps_per_second
+        self._last_tick = now
+        steps = int(self._carry)
+        self._carry -= steps
+        for wall in self.state.advance(steps):
+            draw_wall_path(self.window, wall)
+        self.window.flush()
+        if self.state.finished:
+            self.playing = False
+        else:
+            self.window.after(self._frame_ms, lambda: self._tick(run))
+
+    def seek(self, step: int) -> None:
+        self.state.seek(step)
+        self.draw_all()
+
+    def scrub(self, delta: int) -> None:
+        self.seek(self.state.step + delta)
+
+    def set_speed(self, speed: float) -> None:
+        self.speed = speed
+
+    def bind_keys(self) -> None:
+        """space plays/pauses, arrows scrub, +/- change speed,
+        Home/End jump to either end"""
+        root = self.window.root
+        jump = max(1, int(self.steps_per_second))
+        root.bind("<space>", lambda event: self.toggle())
+        root.bind("<Left>", lambda event: self.scrub(-jump))
+        root.bind("<Right>", lambda event: self.scrub(jump))
+        root.bind("<plus>", lambda event: self.set_speed(self.speed * 2))
+        root.bind("<minus>", lambda event: self.set_speed(self.speed / 2))
+        root.bind("<Home>", lambda event: self.seek(0))
+        root.bind("<End>",
+                  lambda event: self.seek(self.state.log.num_steps))
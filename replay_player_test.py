@@ -0,0 +1,96 @@
+import unittest
+import random
+
+from event_log import EventLog, EventRecorder
+from maze_engine import generate_maze, run_maze
+from replay_player import ReplayPlayer
+from screen_coordinate_calculator import GridToScreenTranslator
+import replay_player
+
+class FakeWindow:
+    """records queued draw calls and after() callbacks instead of Tk"""
+    def __init__(self) -> None:
+        self.max_fps = 60
+        self.callbacks: list = []
+        self.lines: dict = {}
+        self.flushes = 0
+
+    def after(self, delay_ms: int, func) -> None:
+        self.callbacks.append(func)
+
+    def run_callbacks(self) -> None:
+        """runs what is due now; callbacks they schedule wait a round"""
+        due, self.callbacks = self.callbacks, []
+        for func in due:
+            func()
+
+    def draw_line(self, line, fillcolor: str, width: int=2, key=None) -> None:
+        self.lines[key] = fillcolor
+
+    def erase(self, key) -> None:
+        self.lines.pop(key, None)
+
+    def flush(self) -> None:
+        self.flushes += 1
+
+def recorded_log() -> EventLog:
+    grid = generate_maze(6, 7, random.Random(3))
+    recorder = EventRecorder(grid)
+    run_maze(grid, random.Random(3), recorder)
+    return EventLog(recorder.to_bytes())
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.log = recorded_log()
+        self.window = FakeWindow()
+        screen = GridToScreenTranslator(6, 7, 10, 2)
+        self.player = ReplayPlayer(self.window, self.log, screen,
+                                   keyframe_every=8)
+        # each tick then covers exactly steps_per_second steps
+        self.clock = [0.0]
+        self.saved = replay_player.monotonic
+        replay_player.monotonic = lambda: self.clock[0]
+
+    def tearDown(self):
+        replay_player.monotonic = self.saved
+
+    def paths(self) -> int:
+        return sum(key[0] == "path" for key in self.window.lines)
+
+    def test_play_ticks_until_the_end(self):
+        self.player.play()
+        ticks = 0
+        while self.window.callbacks:
+            self.clock[0] += 1.0
+            self.window.run_callbacks()
+            ticks += 1
+        self.assertTrue(self.player.state.finished)
+        self.assertFalse(self.player.playing)
+        expected = -(-self.log.num_steps // 10)
+        self.assertEqual(ticks, expected)
+        self.assertGreater(self.paths(), 0)
+
+    def test_pause_stops_the_tick_chain(self):
+        self.player.play()
+        self.clock[0] += 0.5
+        self.window.run_callbacks()
+        self.assertEqual(self.player.state.step, 5)
+        self.player.pause()
+        self.player.play()
+        self.clock[0] += 1.0
+        # the stale chain from the first play() does nothing
+        self.window.run_callbacks()
+        self.assertEqual(self.player.state.step, 15)
+
+    def test_seek_and_scrub_redraw_the_state(self):
+        self.player.seek(self.log.num_steps)
+        finished = dict(self.window.lines)
+        self.player.scrub(-self.log.num_steps)
+        self.assertEqual(self.player.state.step, 0)
+        self.assertEqual(self.paths(), 0)
+        self.player.scrub(self.log.num_steps + 5)
+        self.assertTrue(self.player.state.finished)
+        self.assertEqual(self.window.lines, finished)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,12 @@
-from tkinter import Tk, BOTH, Canvas
 from typing import Any, Self
-import random
-from time import sleep
 from dataclasses import dataclass
 
 from geometry import Point, Line, CellLocation
 from maze_elements import Cell, Vertex, WallPath
 from vcw_grid import VCWGrid, VCWGridLoc
 
+DEBUG = 0
+
 @dataclass
 class ScreenCoordinatCalculator:
     cell_size_in_pixels: int
@@ -81,3 +80,84 @@ class ScreenCoordinatCalculator:
         return WallPath(wall=self.get_line_for_wall(grid_idx),
                         path=self.get_line_for_path(grid_idx))
 
+class GridToScreenTranslator:
+    def __init__(self, num_rows: int, num_cols: int,
+                 cell_size_in_pixels: int,
+                 border_width_in_pixels: int) -> None:
+        self.cell_rows = num_rows
+        self.cell_cols = num_cols
+        self.vertex_rows = num_rows + 1
+        self.vertex_cols = num_cols + 1
+        if cell_size_in_pixels % 2 == 0: # even sizes have no center pixel
+            cell_size_in_pixels += 1
+        self.cell_size = cell_size_in_pixels
+        self.half_cell = cell_size_in_pixels//2
+        self.upper_corner = Point(x=border_width_in_pixels, 
+                                  y=border_width_in_pixels)
+        screen_width = (2 * border_width_in_pixels
+            + num_cols * cell_size_in_pixels)
+        screen_height = (2 * border_width_in_pixels
+            + num_rows * cell_size_in_pixels)
+        self.size = { "width": screen_width, "height": screen_height }
+        self.vertex_grid = self.create_vertex_coordinates()
+
+    def create_vertex_coordinates(self):
+        vertex_grid = []
+        for row in range(self.vertex_rows):
+            new_row = []
+            for col in range(self.vertex_cols):
+                x_coord = self.upper_corner.x + col * self.cell_size
+                y_coord = self.upper_corner.y + row * self.cell_size
+                new_row.append(Point(x=x_coord, y=y_coord))
+            vertex_grid.append(new_row)
+        return vertex_grid
+
+    def cell_center_point(self, loc: CellLocation) -> Point:
+        x_coord = ( self.upper_corner.x
+                  + loc.col * self.cell_size
+                  + self.half_cell
+                  + 1)
+        y_coord = ( self.upper_corner.y
+                  + loc.row * self.cell_size
+                  + self.half_cell
+                  + 1)
+        return Point(x=x_coord, y=y_coord)
+
+    def get_line_for_wall(self, indexes: VCWGridLoc) -> Line:
+        if indexes.row % 2 == 0: # horz_wall
+            horz_row = indexes.row//2
+            horz_start_col = indexes.col//2
+            horz_end_col = horz_start_col + 1
+            if DEBUG:
+                print(f"HW({horz_start_col=},{horz_end_col=}), {horz_row=}")
+            return Line(start=self.vertex_grid[horz_row][horz_start_col],
+                        end=self.vertex_grid[horz_row][horz_end_col])
+        else:
+            vert_start_row = indexes.row//2
+            vert_end_row = vert_start_row + 1
+            vert_col = indexes.col//2
+            if DEBUG:
+                print(f"VW:({vert_start_row=},{vert_end_row=}),{vert_col=}")
+            return Line(start=self.vertex_grid[vert_start_row][vert_col],
+                        end=self.vertex_grid[vert_end_row][vert_col])
+
+    def get_line_for_path(self, indexes: VCWGridLoc) -> Line:
+        vert = self.vertex_grid[indexes.row//2][indexes.col//2]
+        if indexes.row % 2 == 0: # vert_path
+            x        = vert.x + self.half_cell
+            first_y  = vert.y - self.half_cell
+            second_y = vert.y + self.half_cell
+            first_point  = Point(x=x, y=first_y)
+            second_point = Point(x=x, y=second_y)
+        else:
+            first_x  = vert.x - self.half_cell
+            second_x = vert.x + self.half_cell
+            y        = vert.y + self.half_cell
+            first_point  = Point(x=first_x, y=y)
+            second_point = Point(x=second_x, y=y)
+        return Line(start=first_point, end=second_point)
+
+    def generate_wall_path_line(self, grid_idx: VCWGridLoc) -> WallPath:
+        return WallPath(wall=self.get_line_for_wall(grid_idx),
+                        path=self.get_line_for_path(grid_idx),
+                        loc=grid_idx)
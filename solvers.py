@@ -0,0 +1,138 @@
+import heapq
+from collections import deque
+from importlib.util import find_spec
+from typing import Any, Callable, Optional
+
+from geometry import CellLocation
+from maze_elements import SolveResult
+from maze_engine import get_reachable_neighbors, start_location, end_location
+
+def _walk_parents(parents: dict, loc: CellLocation) -> list[CellLocation]:
+    path = []
+    while loc is not None:
+        path.append(loc)
+        loc = parents[loc]
+    return path
+
+def bfs(grid: Any, start: Optional[CellLocation]=None,
+        goal: Optional[CellLocation]=None) -> SolveResult:
+    start = start or start_location(grid)
+    goal = goal or end_location(grid)
+    parents = {start: None}
+    queue = deque([start])
+    expanded = 0
+    while queue:
+        curr_cell = queue.popleft()
+        expanded += 1
+        if curr_cell == goal:
+            return SolveResult(path=_walk_parents(parents, goal)[::-1],
+                               expanded=expanded)
+        for neigh in get_reachable_neighbors(grid, curr_cell):
+            if neigh not in parents:
+                parents[neigh] = curr_cell
+                queue.append(neigh)
+    return SolveResult(expanded=expanded)
+
+def bidirectional_bfs(grid: Any, start: Optional[CellLocation]=None,
+                      goal: Optional[CellLocation]=None) -> SolveResult:
+    """BFS from both ends, a whole layer at a time from the smaller side"""
+    start = start or start_location(grid)
+    goal = goal or end_location(grid)
+    if start == goal:
+        return SolveResult(path=[start], expanded=1)
+    forward = {start: None}
+    backward = {goal: None}
+    forward_dist = {start: 0}
+    backward_dist = {goal: 0}
+    forward_layer = [start]
+    backward_layer = [goal]
+    expanded = 0
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            layer, parents, dist = forward_layer, forward, forward_dist
+            other_dist = backward_dist
+        else:
+            layer, parents, dist = backward_layer, backward, backward_dist
+            other_dist = forward_dist
+        next_layer = []
+        best_meet, best_len = None, None
+        for curr_cell in layer:
+            expanded += 1
+            for neigh in get_reachable_neighbors(grid, curr_cell):
+                if neigh in parents:
+                    continue
+                parents[neigh] = curr_cell
+                dist[neigh] = dist[curr_cell] + 1
+                next_layer.append(neigh)
+                if neigh in other_dist:
+                    total = dist[neigh] + other_dist[neigh]
+                    if best_len is None or total < best_len:
+                        best_meet, best_len = neigh, total
+        if best_meet is not None:
+            path = (_walk_parents(forward, best_meet)[::-1]
+                    + _walk_parents(backward, best_meet)[1:])
+            return SolveResult(path=path, expanded=expanded)
+        if parents is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    return SolveResult(expanded=expanded)
+
+def manhattan(a: CellLocation, b: CellLocation) -> int:
+    return abs(a.row - b.row) + abs(a.col - b.col)
+
+def astar(grid: Any, start: Optional[CellLocation]=None,
+          goal: Optional[CellLocation]=None,
+          heuristic: Callable[[CellLocation, CellLocation], int]=manhattan
+          ) -> SolveResult:
+    start = start or start_location(grid)
+    goal = goal or end_location(grid)
+    parents = {start: None}
+    cost = {start: 0}
+    closed = set()
+    tie_break = 0   # CellLocation is not orderable, keep heap entries unique
+    heap = [(heuristic(start, goal), tie_break, start)]
+    expanded = 0
+    while heap:
+        _, _, curr_cell = heapq.heappop(heap)
+        if curr_cell in closed:
+            continue
+        closed.add(curr_cell)
+        expanded += 1
+        if curr_cell == goal:
+            return SolveResult(path=_walk_parents(parents, goal)[::-1],
+                               expanded=expanded)
+        next_cost = cost[curr_cell] + 1
+        for neigh in get_reachable_neighbors(grid, curr_cell):
+            if neigh in closed or next_cost >= cost.get(neigh, next_cost + 1):
+                continue
+            cost[neigh] = next_cost
+            parents[neigh] = curr_cell
+            tie_break += 1
+            heapq.heappush(heap, (next_cost + heuristic(neigh, goal),
+                                  tie_break, neigh))
+    return SolveResult(expanded=expanded)
+
+SOLVERS: dict[str, Callable[..., SolveResult]] = {
+    "bfs": bfs,
+    "bidirectional_bfs": bidirectional_bfs,
+    "astar": astar,
+}
+
+def get_solver(name: str) -> Callable[..., SolveResult]:
+    try:
+        return SOLVERS[name]
+    except KeyError:
+        raise Exception(f"Unknown solver {name!r}, "
+                        f"expected one of {sorted(SOLVERS)}") from None
+
+def dead_end_fill(grid: Any, start: Optional[CellLocation]=None,
+                  goal: Optional[CellLocation]=None) -> SolveResult:
+    """dead_end_filler.dead_end_fill, imported on first use so that
+    importing solvers does not load numpy"""
+    from dead_end_filler import dead_end_fill
+    return dead_end_fill(grid, start, goal)
+
+# dead end filling needs numpy, the rest does not
+if find_spec("numpy") is not None:
+    SOLVERS["dead_end_fill"] = dead_end_fill
@@ -0,0 +1,43 @@
+import unittest
+import random
+
+from geometry import CellLocation
+from maze_engine import build_grid, generate_maze, get_reachable_neighbors
+from solvers import SOLVERS, get_solver
+
+class Tests(unittest.TestCase):
+    def test_solvers_agree_on_shortest_length(self):
+        for seed in range(5):
+            grid = generate_maze(12, 15, rng=random.Random(seed))
+            lengths = {name: solver(grid).length
+                       for name, solver in SOLVERS.items()}
+            self.assertEqual(len(set(lengths.values())), 1, lengths)
+
+    def test_solver_path_is_connected(self):
+        grid = generate_maze(10, 10, rng=random.Random(3))
+        for name, solver in SOLVERS.items():
+            result = solver(grid)
+            self.assertEqual(result.path[0], CellLocation(row=0, col=0))
+            self.assertEqual(result.path[-1], CellLocation(row=9, col=9))
+            for a, b in zip(result.path, result.path[1:]):
+                self.assertIn(b, get_reachable_neighbors(grid, a), name)
+            self.assertGreaterEqual(result.expanded, len(result.path) - 1)
+
+    def test_open_grid_has_manhattan_length(self):
+        grid = build_grid(4, 6)
+        grid.map_walls(lambda w: setattr(w, "solid", False))
+        for solver in SOLVERS.values():
+            self.assertEqual(solver(grid).length, 3 + 5)
+
+    def test_unsolvable(self):
+        grid = build_grid(3, 3)
+        for solver in SOLVERS.values():
+            self.assertFalse(solver(grid).solved)
+
+    def test_unknown_solver(self):
+        with self.assertRaises(Exception):
+            get_solver("teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+from typing import Any, Optional, TextIO
+
+from colors import hex_color
+from geometry import CellLocation
+from maze_engine import FORWARD_PASS_COLOR, start_location, end_location
+
+class SvgRunWriter:
+    """map_walls callback that writes merged wall and path runs as it goes
+
+    map_walls walks the VCW rows top to bottom.  Along a row, adjacent
+    solid horizontal walls join into one run, as do adjacent path
+    crossings through vertical walls.  Down a column, runs are kept open
+    from one row to the next: vertical walls in odd rows, path crossings
+    through horizontal walls in even rows.  A run is written as one
+    <path> the moment it ends, so memory is O(cell_cols) whatever the
+    maze size, and output grows with the number of runs, not walls.
+    """
+    def __init__(self, fh: TextIO, cell_cols: int, left: float, top: float,
+                 step: float, half: float, path_colors: bool=True) -> None:
+        self.fh = fh
+        self.cell_cols = cell_cols
+        self.left = left
+        self.top = top
+        self.step = step
+        self.half = half
+        self.path_colors = path_colors
+        self.runs_written = 0
+        self._row_run: Optional[tuple[Any, int]] = None   # (color, start)
+        self._wall_runs: dict[int, int] = {}              # col -> start row
+        self._path_runs: dict[int, tuple[Any, int]] = {}  # col -> (color, start)
+
+    def _x(self, vertex_col: float) -> float:
+        return self.left + vertex_col * self.step
+
+    def _y(self, vertex_row: float) -> float:
+        return self.top + vertex_row * self.step
+
+    def _write(self, x: float, y: float, end: float, horizontal: bool,
+               color: Any) -> None:
+        stroke = "" if color is None else f' stroke="{hex_color(color)}"'
+        move = "H" if horizontal else "V"
+        self.fh.write(f'<path{stroke} d="M{x:g} {y:g}{move}{end:g}"/>\n')
+        self.runs_written += 1
+
+    def _end_row_run(self, vertex_row: int, end_col: int) -> None:
+        """writes the row's open run, which covers up to end_col"""
+        if self._row_run is None:
+            return
+        color, start = self._row_run
+        self._row_run = None
+        if color is None:   # walls between vertices
+            self._write(self._x(start), self._y(vertex_row), self._x(end_col),
+                        True, None)
+        else:               # path between the centers either side
+            self._write(self._x(start) - self.half,
+                        self._y(vertex_row) + self.half,
+                        self._x(end_col) + self.half, True, color)
+
+    def _end_wall_run(self, col: int, end_row: int) -> None:
+        start = self._wall_runs.pop(col)
+        self._write(self._x(col), self._y(start), self._y(end_row), False,
+                    None)
+
+    def _end_path_run(self, col: int, end_row: int) -> None:
+        color, start = self._path_runs.pop(col)
+        self._write(self._x(col) + self.half, self._y(start) - self.half,
+                    self._y(end_row) + self.half, False, color)
+
+    def _horizontal_wall(self, wall: Any, row: int, col: int) -> None:
+        if wall.solid:
+            if self._row_run is None:
+                self._row_run = (None, col)
+        else:
+            self._end_row_run(row, col)
+        color = self.path_colors and not wall.solid and wall.path_color
+        pending = self._path_runs.get(col)
+        if pending and pending[0] != color:
+            self._end_path_run(col, row - 1)
+            pending = None
+        if color and not pending:
+            self._path_runs[col] = (color, row)
+        if col == self.cell_cols - 1:
+            self._end_row_run(row, col + 1)
+
+    def _vertical_wall(self, wall: Any, row: int, col: int) -> None:
+        if wall.solid:
+            self._wall_runs.setdefault(col, row)
+        elif col in self._wall_runs:
+            self._end_wall_run(col, row)
+        color = self.path_colors and not wall.solid and wall.path_color
+        if self._row_run and self._row_run[0] != color:
+            self._end_row_run(row, col - 1)
+        if color and not self._row_run:
+            self._row_run = (color, col)
+        if col == self.cell_cols:
+            self._end_row_run(row, col)
+
+    def __call__(self, wall: Any) -> None:
+        if wall.loc.row % 2 == 0:
+            self._horizontal_wall(wall, wall.loc.row // 2, wall.loc.col // 2)
+        else:
+            self._vertical_wall(wall, wall.loc.row // 2, wall.loc.col // 2)
+
+    def finish(self, cell_rows: int) -> None:
+        for col in list(self._wall_runs):
+            self._end_wall_run(col, cell_rows)
+        for col in list(self._path_runs):
+            self._end_path_run(col, cell_rows)
+
+def write_svg(grid: Any, fh: TextIO, screen: Any=None, cell_size: int=10,
+              border: int=5, path_colors: bool=True,
+              route: Optional[list[CellLocation]]=None,
+              route_color: str=FORWARD_PASS_COLOR, dots: bool=True) -> int:
+    """streams the maze to fh as SVG, returns the number of runs written
+
+    screen is a GridToScreenTranslator for the Tk canvas geometry,
+    otherwise cells are cell_size units inside a border.  path_colors
+    overlays the colors run_maze left on the walls, and route (e.g. a
+    SolveResult.path) is drawn as one polyline in route_color.
+    """
+    if screen is None:
+        left = top = border
+        step, half = cell_size, cell_size / 2
+        width = 2 * border + grid.cell_cols * cell_size
+        height = 2 * border + grid.cell_rows * cell_size
+    else:
+        left, top = screen.upper_corner.x, screen.upper_corner.y
+        step, half = screen.cell_size, screen.half_cell
+        width, height = screen.size["width"], screen.size["height"]
+    fh.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+             f'height="{height}" viewBox="0 0 {width} {height}">\n'
+             f'<rect width="100%" height="100%" fill="white"/>\n'
+             f'<g fill="none" stroke="black" stroke-width="2" '
+             f'stroke-linecap="square">\n')
+    runs = SvgRunWriter(fh, grid.cell_cols, left, top, step, half,
+                        path_colors)
+    grid.map_walls(runs)
+    runs.finish(grid.cell_rows)
+    if route:
+        points = " ".join(f"{left + loc.col * step + half:g},"
+                          f"{top + loc.row * step + half:g}"
+                          for loc in route)
+        fh.write(f'<polyline stroke="{hex_color(route_color)}" '
+                 f'points="{points}"/>\n')
+    fh.write("</g>\n")
+    if dots:
+        radius = max(half // 2, 1)
+        for loc in (start_location(grid), end_location(grid)):
+            fh.write(f'<circle cx="{left + loc.col * step + half:g}" '
+                     f'cy="{top + loc.row * step + half:g}" r="{radius:g}" '
+                     f'fill="{hex_color("blue")}"/>\n')
+    fh.write("</svg>\n")
+    return runs.runs_written
+
+def save_svg(grid: Any, path: str, **kwargs: Any) -> int:
+    with open(path, "w") as fh:
+        return write_svg(grid, fh, **kwargs)
@@ -0,0 +1,66 @@
+import unittest
+import io
+import random
+import re
+
+from generators import generate
+from maze_engine import run_maze
+from packed_grid import PackedVCWGrid
+from svg_export import write_svg
+from vcw_grid import VCWGrid
+
+RUN = re.compile(r'<path(?: stroke="([^"]+)")? d="M(\d+) (\d+)([HV])(\d+)"/>')
+
+def unit_segments(svg: str, step: int=10) -> dict:
+    """every run split back into cell sized pieces, keyed by stroke"""
+    pieces: dict = {}
+    for stroke, x, y, move, end in RUN.findall(svg):
+        x, y, end = int(x), int(y), int(end)
+        start = x if move == "H" else y
+        for pos in range(start, end, step):
+            piece = ((pos, y, pos + step, y) if move == "H"
+                     else (x, pos, x, pos + step))
+            pieces.setdefault(stroke or "black", set()).add(piece)
+    return pieces
+
+def expected_segments(grid) -> dict:
+    pieces: dict = {}
+    def collect(wall):
+        row, col = wall.loc.row // 2, wall.loc.col // 2
+        x, y = 10 * col, 10 * row
+        if wall.solid:
+            piece = ((x, y, x + 10, y) if wall.loc.row % 2 == 0
+                     else (x, y, x, y + 10))
+            pieces.setdefault("black", set()).add(piece)
+        elif wall.path_color:
+            # center of the cell before the wall to the center after it
+            piece = ((x + 5, y - 5, x + 5, y + 5) if wall.loc.row % 2 == 0
+                     else (x - 5, y + 5, x + 5, y + 5))
+            pieces.setdefault(wall.path_color, set()).add(piece)
+    grid.map_walls(collect)
+    return pieces
+
+class Tests(unittest.TestCase):
+    def test_runs_cover_exactly_the_solid_walls_and_paths(self):
+        for grid_class in (VCWGrid, PackedVCWGrid):
+            grid = generate(7, 9, rng=random.Random(6), grid_class=grid_class)
+            run_maze(grid, rng=random.Random(2))
+            fh = io.StringIO()
+            write_svg(grid, fh, cell_size=10, border=0, dots=False)
+            found = unit_segments(fh.getvalue())
+            expected = expected_segments(grid)
+            self.assertEqual(found.pop("black"), expected.pop("black"))
+            self.assertEqual(found.pop("#0000ff"), expected.pop("blue"))
+            self.assertEqual(found.pop("#eeb422", set()),
+                             expected.pop("goldenrod2", set()))
+            self.assertFalse(found or expected)
+
+    def test_open_grid_is_four_runs(self):
+        grid = generate(5, 5, rng=random.Random(1))
+        grid.map_walls(lambda wall: setattr(wall, "solid", wall.loc.row in
+                                            (0, 10) or wall.loc.col in (0, 10)))
+        fh = io.StringIO()
+        self.assertEqual(write_svg(grid, fh, path_colors=False), 4)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Iterable
+
+from batch import derive_seed
+from generators import kruskal, prim
+from maze_engine import remove_entrance_and_exit
+from maze_rng import MazeRNG
+from maze_size import MazeSize
+from packed_grid import PackedVCWGrid
+
+# Tiles are carved by generators that only touch walls through
+# open_wall_between, so a tile can write straight into the shared buffer.
+TILE_GENERATORS = {"kruskal": kruskal, "prim": prim}
+
+class TileView:
+    """the slice of a shared wall buffer one tile is allowed to carve
+
+    The buffer holds one byte per wall (1 solid, 0 open): every horizontal
+    wall of the whole maze, then every vertical one.  Bytes rather than
+    bits so tiles carving side by side never share a byte.
+    """
+    def __init__(self, buf: Any, size: MazeSize, row0: int, col0: int,
+                 cell_rows: int, cell_cols: int) -> None:
+        self.buf = buf
+        self.size = size
+        self.row0 = row0
+        self.col0 = col0
+        self.cell_rows = cell_rows
+        self.cell_cols = cell_cols
+
+    def open_walls(self, east: Iterable[int], south: Iterable[int]) -> None:
+        """VCWGrid.open_walls with tile cell ids, into the shared buffer"""
+        cols, buf, size = self.cell_cols, self.buf, self.size
+        for cell in east:
+            row, col = divmod(cell, cols)
+            buf[size.num_horz_walls + (row + self.row0) * size.vert_wall_cols
+                + col + self.col0 + 1] = 0
+        for cell in south:
+            row, col = divmod(cell, cols)
+            buf[(row + self.row0 + 1) * size.horz_wall_cols
+                + col + self.col0] = 0
+
+    def open_wall_between(self, from_id: int, to_id: int) -> None:
+        row, col = divmod(from_id, self.cell_cols)
+        # a one column tile has its south neighbor at from_id + 1 too
+        east = to_id == from_id + 1 and col < self.cell_cols - 1
+        row += self.row0
+        col += self.col0
+        if east:
+            idx = (self.size.num_horz_walls
+                   + row * self.size.vert_wall_cols + col + 1)
+        elif to_id == from_id + self.cell_cols:
+            idx = (row + 1) * self.size.horz_wall_cols + col
+        else:
+            raise Exception(f"Cell {to_id} is not east or south of {from_id}")
+        self.buf[idx] = 0
+
+def tile_bounds(cell_rows: int, cell_cols: int, tile_rows: int,
+                tile_cols: int) -> list[tuple[int, int, int, int]]:
+    """(row0, col0, rows, cols) of every tile, row major"""
+    return [(row0, col0, min(tile_rows, cell_rows - row0),
+             min(tile_cols, cell_cols - col0))
+            for row0 in range(0, cell_rows, tile_rows)
+            for col0 in range(0, cell_cols, tile_cols)]
+
+def _carve_tile(job: tuple) -> None:
+    shm_name, cell_rows, cell_cols, bounds, generator, seed = job
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        size = MazeSize(cell_rows=cell_rows, cell_cols=cell_cols)
+        tile = TileView(shm.buf, size, *bounds)
+        TILE_GENERATORS[generator](tile, MazeRNG(seed))
+        del tile
+    finally:
+        shm.close()
+
+def stitch_tiles(buf: Any, size: MazeSize, bounds: list[tuple],
+                 tiles_across: int, rng=random) -> None:
+    """joins the tile trees with one opening per edge of a random tree
+
+    Each tile is already a perfect maze.  Kruskal over the tile adjacency
+    graph picks a spanning tree of tiles, and every edge of it opens one
+    random wall on the shared border, so the whole grid stays a tree.
+    """
+    num_tiles = len(bounds)
+    edges = []
+    for tile in range(num_tiles):
+        if (tile + 1) % tiles_across:
+            edges.append((tile, tile + 1))
+        if tile + tiles_across < num_tiles:
+            edges.append((tile, tile + tiles_across))
+    rng.shuffle(edges)
+    parent = list(range(num_tiles))
+    def find(tile: int) -> int:
+        while parent[tile] != tile:
+            parent[tile] = parent[parent[tile]]
+            tile = parent[tile]
+        return tile
+    for a, b in edges:
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_b] = root_a
+        row0, col0, rows, cols = bounds[a]
+        if b == a + 1 and tiles_across > 1:
+            # border is the east side of tile a
+            row = row0 + rng.randrange(rows)
+            idx = (size.num_horz_walls + row * size.vert_wall_cols
+                   + col0 + cols)
+        else:
+            col = col0 + rng.randrange(cols)
+            idx = (row0 + rows) * size.horz_wall_cols + col
+        buf[idx] = 0
+
+def pack_wall_bytes(wall_bytes: Any) -> bytearray:
+    """one byte per wall down to one bit per wall, PackedVCWGrid order"""
+    # numpy is imported here, in the parent only, so tile workers start
+    # without it
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        flags = np.frombuffer(wall_bytes, dtype=np.uint8)
+        return bytearray(np.packbits(flags, bitorder="little").tobytes())
+    bits = bytearray((len(wall_bytes) + 7) // 8)
+    for idx in range(len(wall_bytes)):
+        if wall_bytes[idx]:
+            bits[idx >> 3] |= 1 << (idx & 7)
+    return bits
+
+def generate_tiled(cell_rows: int, cell_cols: int, tile_rows: int=256,
+                   tile_cols: int=256, seed: int=0,
+                   generator: str="kruskal",
+                   workers: int | None=None) -> PackedVCWGrid:
+    """carves tiles in worker processes, then stitches them into one maze"""
+    if generator not in TILE_GENERATORS:
+        raise Exception(f"Generator {generator!r} cannot carve tiles, "
+                        f"expected one of {sorted(TILE_GENERATORS)}")
+    size = MazeSize(cell_rows=cell_rows, cell_cols=cell_cols)
+    num_walls = size.num_horz_walls + size.num_vert_walls
+    bounds = tile_bounds(cell_rows, cell_cols, tile_rows, tile_cols)
+    tiles_across = (cell_cols + tile_cols - 1) // tile_cols
+    shm = shared_memory.SharedMemory(create=True, size=num_walls)
+    try:
+        buf = shm.buf
+        chunk = b"\x01" * min(num_walls, 1 << 20)
+        for start in range(0, num_walls, len(chunk)):
+            end = min(start + len(chunk), num_walls)
+            buf[start:end] = chunk[:end - start]
+        jobs = [(shm.name, cell_rows, cell_cols, tile, generator,
+                 derive_seed(seed, idx))
+                for idx, tile in enumerate(bounds)]
+        if workers == 1:
+            for job in jobs:
+                _carve_tile(job)
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()
+                                     ) as pool:
+                list(pool.map(_carve_tile, jobs))
+        stitch_tiles(buf, size, bounds, tiles_across,
+                     MazeRNG(derive_seed(seed, len(bounds))))
+        horz = pack_wall_bytes(buf[:size.num_horz_walls])
+        vert = pack_wall_bytes(buf[size.num_horz_walls:num_walls])
+        del buf
+    finally:
+        shm.close()
+        shm.unlink()
+    grid = PackedVCWGrid(cell_rows, cell_cols, horz_bits=horz,
+                         vert_bits=vert)
+    remove_entrance_and_exit(grid)
+    return grid
@@ -0,0 +1,50 @@
+import sys
+import unittest
+from unittest import mock
+
+from maze_engine_test import border_intact, count_open_walls
+from distance_field import distance_field
+from solvers import bfs
+from tiled import generate_tiled, pack_wall_bytes
+
+class Tests(unittest.TestCase):
+    def test_tiled_is_perfect_maze(self):
+        for rows, cols, tile_rows, tile_cols in [(10, 13, 4, 5), (9, 9, 3, 3),
+                                                 (6, 20, 6, 20), (1, 1, 1, 1)]:
+            grid = generate_tiled(rows, cols, tile_rows, tile_cols, seed=4,
+                                  workers=1)
+            self.assertEqual(count_open_walls(grid), rows * cols - 1 + 2)
+            self.assertTrue(bfs(grid).solved)
+
+    def test_one_column_remainder_tiles(self):
+        for rows, cols, tile_rows, tile_cols in [(32, 17, 8, 8),
+                                                 (8, 257, 8, 256),
+                                                 (9, 1, 4, 4)]:
+            grid = generate_tiled(rows, cols, tile_rows, tile_cols, seed=1,
+                                  workers=1)
+            case = (rows, cols, tile_rows, tile_cols)
+            self.assertTrue(border_intact(grid), case)
+            self.assertEqual(count_open_walls(grid), rows * cols - 1 + 2,
+                             case)
+            # a tree spanning every cell: bfs from the start reaches all
+            self.assertNotIn(-1, distance_field(grid).distance, case)
+
+    def test_tiled_same_for_any_worker_count(self):
+        serial = generate_tiled(20, 20, 7, 9, seed=1, workers=1)
+        parallel = generate_tiled(20, 20, 7, 9, seed=1, workers=2)
+        self.assertEqual(bytes(serial.horz_wall_bits),
+                         bytes(parallel.horz_wall_bits))
+        self.assertEqual(bytes(serial.vert_wall_bits),
+                         bytes(parallel.vert_wall_bits))
+
+    def test_pack_wall_bytes_without_numpy(self):
+        wall_bytes = bytes([1, 0, 0, 1, 1, 1, 0, 1, 0, 1, 1])
+        expected = pack_wall_bytes(wall_bytes)
+        # a None entry makes `import numpy` raise ImportError
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            self.assertEqual(pack_wall_bytes(wall_bytes), expected)
+        self.assertEqual(expected, bytearray([0b10111001, 0b110]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+from typing import Any
+
+from geometry import CellLocation
+from maze_engine import MazeObserver
+from window import Window
+
+def wall_key(wall_path: Any) -> tuple:
+    return ("wall", wall_path.loc.row, wall_path.loc.col)
+
+def path_key(wall_path: Any) -> tuple:
+    return ("path", wall_path.loc.row, wall_path.loc.col)
+
+def draw_wall_path(window: Window, wall_path: Any) -> None:
+    """brings the canvas in line with one wall: its line if solid, else
+    its path line when it has a path color"""
+    if not wall_path:
+        return
+    if wall_path.solid:
+        window.draw_line(wall_path.wall, "black", key=wall_key(wall_path))
+    else:
+        window.erase(wall_key(wall_path))
+    if not wall_path.solid and (color := wall_path.path_color):
+        window.draw_line(wall_path.path, color, key=path_key(wall_path))
+    else:
+        window.erase(path_key(wall_path))
+
+class TkMazeObserver(MazeObserver):
+    """renders engine progress onto the Tk window as it happens
+
+    Pacing is up to whoever drives the steps, e.g. Window.animate.
+    """
+    def __init__(self, window: Window) -> None:
+        self.window = window
+
+    def wall_removed(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.window.erase(wall_key(wall))
+
+    def cell_entered(self, wall: Any, from_loc: CellLocation,
+                     to_loc: CellLocation) -> None:
+        self.window.draw_line(wall.path, wall.path_color, key=path_key(wall))
+
+    def backtracked(self, wall: Any, from_loc: CellLocation,
+                    to_loc: CellLocation) -> None:
+        if wall is not None:
+            self.window.draw_line(wall.path, wall.path_color,
+                                  key=path_key(wall))
+
+    def step(self) -> None:
+        self.window.redraw()
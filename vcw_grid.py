@@ -1,7 +1,9 @@
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Iterable
 from geometry import CellLocation
 from dataclasses import dataclass
 from enum import Enum
+from maze_elements import VisitEpochs
+from maze_size import MazeSize
 
 @dataclass(kw_only=True)
 class VCWGridLoc:
@@ -12,7 +14,15 @@ class VCWGrid:
     def __init__(self, cell_rows: int, cell_cols: int) -> None:
         self.cell_rows = cell_rows
         self.cell_cols = cell_cols
+        self.size = MazeSize(cell_rows=cell_rows, cell_cols=cell_cols)
         self._grid = self._create_vertex_cell_wall_grid()
+        # bumped whenever a wall's solid flag changes, see WallPath
+        self.wall_version = 0
+        # walls by wall id (see MazeSize.cell_sides), set by populate_walls
+        self._walls: list[Any] = []
+        # visited flags by cell id; a Cell placed here reads and writes
+        # its visited attribute through them
+        self.visits = VisitEpochs(cell_rows * cell_cols)
 
     def _create_vertex_cell_wall_grid(self) -> list[Any]:
         """creates a grid that is 2x+1 in both dimensions"""
@@ -39,13 +49,29 @@ class VCWGrid:
                 for col in range(1, self._col_length, 2):
                     func(self._grid[row][col])
 
+    def populate_cells(self, func: Callable[[CellLocation], Any]):
+        for loc in self.cells_locs():
+            self.set_cell(loc, func(loc))
+
     def populate_walls(self, func: Callable[[VCWGridLoc], Any]):
+        # horizontal walls then vertical ones is also wall id order
+        self._walls = []
         for row in range(0, self._row_length, 2):
             for col in range(1, self._col_length, 2):
-                self._grid[row][col] = func(VCWGridLoc(row=row, col=col))
+                wall = func(VCWGridLoc(row=row, col=col))
+                self._grid[row][col] = self._owned(wall)
+                self._walls.append(wall)
         for row in range(1, self._row_length, 2):
             for col in range(0, self._col_length, 2):
-                self._grid[row][col] = func(VCWGridLoc(row=row, col=col))
+                wall = func(VCWGridLoc(row=row, col=col))
+                self._grid[row][col] = self._owned(wall)
+                self._walls.append(wall)
+        self.wall_version += 1
+
+    def _owned(self, wall: Any) -> Any:
+        if hasattr(wall, "grid"):
+            wall.grid = self
+        return wall
 
     def scale_location(loc: CellLocation) -> tuple[int, int]:
         grid_row = 2 * loc.row + 1
@@ -66,6 +92,10 @@ class VCWGrid:
         if not self.is_valid_cell(row=loc.row, col=loc.col):
             raise Exception(f"Cell index out of range {loc}")
         grid_row, grid_col = VCWGrid.scale_location(loc)
+        if hasattr(val, "grid"):
+            visited = val.visited
+            val.grid = self
+            val.visited = visited
         self._grid[grid_row][grid_col] = val
 
     def get_north_wall(self, loc: CellLocation) -> Any:
@@ -84,6 +114,55 @@ class VCWGrid:
         cell_row, cell_col = VCWGrid.scale_location(loc)
         return self._grid[cell_row][cell_col-1]
 
+    def wall_at(self, wall_id: int) -> Any:
+        return self._walls[wall_id]
+
+    def wall_is_solid(self, wall_id: int) -> bool:
+        return self._walls[wall_id].solid
+
+    def set_wall_solid(self, wall_id: int, solid: bool) -> None:
+        self._walls[wall_id].solid = solid
+
+    def set_path_color(self, wall_id: int, color: Optional[str]) -> None:
+        self._walls[wall_id].path_color = color
+
+    def new_traversal(self) -> None:
+        """marks every cell unvisited, in O(1)"""
+        self.visits.new_traversal()
+
+    def cell_visited(self, cell_id: int) -> bool:
+        return self.visits.is_visited(cell_id)
+
+    def set_cell_visited(self, cell_id: int, visited: bool) -> None:
+        self.visits.mark(cell_id, visited)
+
+    def open_walls(self, east: Iterable[int], south: Iterable[int]) -> None:
+        """knocks down the east wall of every cell id in east and the
+        south wall of every cell id in south, for generators that work
+        out a whole maze before touching the grid"""
+        cols, walls = self.cell_cols, self._walls
+        # vertical wall ids start after the horizontal ones and their rows
+        # are one wall longer than cell rows
+        first_vert = (self.cell_rows + 1) * cols
+        for cell in east:
+            walls[first_vert + cell + cell // cols + 1].solid = False
+        for cell in south:
+            walls[cell + cols].solid = False
+
+    def open_wall_between(self, from_id: int, to_id: int) -> None:
+        """knocks down the wall between two cells given as row*cell_cols+col
+
+        to_id must be the east or south neighbor of from_id.
+        """
+        row, col = divmod(from_id, self.cell_cols)
+        # with one column the south neighbor is from_id + 1 as well
+        if to_id == from_id + 1 and col < self.cell_cols - 1:
+            self._grid[2 * row + 1][2 * col + 2].solid = False
+        elif to_id == from_id + self.cell_cols:
+            self._grid[2 * row + 2][2 * col + 1].solid = False
+        else:
+            raise Exception(f"Cell {to_id} is not east or south of {from_id}")
+
     def get_adjacent_cell_locations(self, 
                                     loc: CellLocation) -> list[CellLocation]:
         neigh = []
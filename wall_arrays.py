@@ -0,0 +1,78 @@
+from typing import Any
+
+import numpy as np
+
+from maze_file import pack_walls
+from maze_size import MazeSize
+from packed_grid import PackedVCWGrid
+
+def wall_arrays(grid: Any) -> tuple[np.ndarray, np.ndarray]:
+    """the grid's walls as boolean arrays, True meaning solid
+
+    horz is (cell_rows+1, cell_cols): horz[r, c] is the north wall of cell
+    (r, c).  vert is (cell_rows, cell_cols+1): vert[r, c] is its west wall.
+    """
+    size = MazeSize(cell_rows=grid.cell_rows, cell_cols=grid.cell_cols)
+    horz_bits, vert_bits = pack_walls(grid)
+    horz = np.unpackbits(np.frombuffer(horz_bits, dtype=np.uint8),
+                         count=size.num_horz_walls, bitorder="little")
+    vert = np.unpackbits(np.frombuffer(vert_bits, dtype=np.uint8),
+                         count=size.num_vert_walls, bitorder="little")
+    return (horz.reshape(size.horz_wall_rows, size.horz_wall_cols).view(bool),
+            vert.reshape(size.vert_wall_rows, size.vert_wall_cols).view(bool))
+
+def _unpack_crumbs(crumbs: Any, count: int) -> np.ndarray:
+    packed = np.frombuffer(crumbs, dtype=np.uint8)
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    return ((packed[:, None] >> shifts) & 0b11).ravel()[:count]
+
+def path_color_arrays(grid: Any
+                      ) -> tuple[np.ndarray, np.ndarray, list[Any]]:
+    """the walls' path colors as palette codes, shaped like wall_arrays
+
+    Code 0 means no path color, otherwise palette[code] is the color name.
+    """
+    size = MazeSize(cell_rows=grid.cell_rows, cell_cols=grid.cell_cols)
+    if isinstance(grid, PackedVCWGrid):
+        horz = _unpack_crumbs(grid.horz_color_crumbs, size.num_horz_walls)
+        vert = _unpack_crumbs(grid.vert_color_crumbs, size.num_vert_walls)
+        return (horz.reshape(size.horz_wall_rows, size.horz_wall_cols),
+                vert.reshape(size.vert_wall_rows, size.vert_wall_cols),
+                list(grid.palette))
+    palette: list[Any] = [None]
+    codes: list[int] = []
+    def collect(wall: Any) -> None:
+        if wall.path_color not in palette:
+            palette.append(wall.path_color)
+        codes.append(palette.index(wall.path_color))
+    grid.map_walls(collect)
+    # map_walls gives cell_rows blocks of (horizontal row, vertical row)
+    # and then the last horizontal row
+    flat = np.array(codes, dtype=np.uint8)
+    block = size.horz_wall_cols + size.vert_wall_cols
+    body = flat[:size.cell_rows * block].reshape(size.cell_rows, block)
+    horz = np.vstack((body[:, :size.horz_wall_cols],
+                      flat[size.cell_rows * block:][None, :]))
+    return horz, body[:, size.horz_wall_cols:].copy(), palette
+
+def cell_openings(horz: np.ndarray, vert: np.ndarray
+                  ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """per cell (north, south, east, west) open flags, each (rows, cols)
+
+    Openings through the outer border (entrance and exit) are left out so
+    they never count as a passage to another cell.
+    """
+    north = ~horz[:-1, :]
+    south = ~horz[1:, :]
+    west = ~vert[:, :-1]
+    east = ~vert[:, 1:]
+    north[0, :] = False
+    south[-1, :] = False
+    west[:, 0] = False
+    east[:, -1] = False
+    return north, south, east, west
+
+def open_degree(horz: np.ndarray, vert: np.ndarray) -> np.ndarray:
+    """number of neighboring cells each cell has a passage to"""
+    north, south, east, west = cell_openings(horz, vert)
+    return (north.astype(np.int8) + south + east + west).astype(np.int8)
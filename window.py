@@ -1,9 +1,29 @@
 from tkinter import Tk, BOTH, Canvas
+from time import monotonic
+from typing import Any, Callable, Hashable, Iterator, Optional
 
-from geometry import Point, Line 
+from geometry import Point, Line
 
 class Window():
-    def __init__(self, width, height) -> None:
+    """Tk window that queues drawing and presents it in frames
+
+    draw_line/draw_point only queue work.  redraw() turns the queue into
+    canvas items and pumps the Tk event loop, but at most max_fps times a
+    second unless batch_size operations have piled up; max_fps=None
+    presents on every redraw() like a plain Tk loop.
+
+    Draw calls given a key are remembered in a registry: drawing the same
+    key again moves/recolors the existing canvas item and erase(key)
+    deletes it, so the canvas holds one item per key instead of a new
+    item stacked on top for every change.
+
+    wait_for_close() hands control to Tk's mainloop, which sleeps until
+    there is an event or an after() callback due.  Animation goes through
+    animate(), which steps an engine generator from timed callbacks, so
+    the window stays responsive and idles at no CPU between frames.
+    """
+    def __init__(self, width, height, max_fps: float | None=60,
+                 batch_size: int | None=None) -> None:
         self.root = Tk()
         self.root.wm_title("Maze Solver")
         self.root.geometry(f"{width}x{height}")
@@ -11,26 +31,129 @@ class Window():
         self.canvas.pack(expand=True, fill=BOTH)
         self.running: bool = False
         self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.max_fps = max_fps
+        self.batch_size = batch_size
+        self._pending: list[tuple] = []
+        self._last_frame: float = 0.0
+        self._items: dict[Hashable, int] = {}
+        self.items_created: int = 0
+        self.redraws: int = 0
+        self.frames: int = 0
+        self._in_mainloop: bool = False
+
+    def _frame_due(self) -> bool:
+        if self.batch_size and len(self._pending) >= self.batch_size:
+            return True
+        if not self.max_fps:
+            return True
+        return monotonic() - self._last_frame >= 1.0 / self.max_fps
 
-    def redraw(self):
-        self.root.update_idletasks()
-        self.root.update()
+    def flush(self):
+        """turns every queued draw call into a canvas item"""
+        pending, self._pending = self._pending, []
+        for kind, coords, options, key in pending:
+            if kind == "erase":
+                if (item := self._items.pop(key, None)) is not None:
+                    self.canvas.delete(item)
+            elif key is not None and key in self._items:
+                item = self._items[key]
+                self.canvas.coords(item, *coords)
+                self.canvas.itemconfigure(item, **options)
+            else:
+                if kind == "line":
+                    item = self.canvas.create_line(*coords, **options)
+                else:
+                    item = self.canvas.create_rectangle(*coords, **options)
+                self.items_created += 1
+                if key is not None:
+                    self._items[key] = item
+
+    def redraw(self, force: bool=False):
+        self.redraws += 1
+        if not (force or self._frame_due()):
+            return
+        self.frames += 1
+        self.flush()
+        if not self._in_mainloop:
+            # outside mainloop nothing else gets Tk to paint
+            self.root.update_idletasks()
+            self.root.update()
+        self._last_frame = monotonic()
+
+    def animate(self, steps: Iterator[Any], interval_ms: int=0,
+                on_done: Optional[Callable[[Any], None]]=None) -> None:
+        """runs a step generator from Tk callbacks once mainloop is going
+
+        interval_ms > 0 runs one step per callback, that far apart;
+        0 runs as many steps as fit in one frame per callback, then yields
+        to Tk for events.  on_done gets the generator's return value.
+        """
+        frame = 1.0 / (self.max_fps or 60)
+        def tick() -> None:
+            if not self.running:
+                return
+            deadline = monotonic() + frame
+            try:
+                next(steps)
+                while not interval_ms and monotonic() < deadline:
+                    next(steps)
+            except StopIteration as done:
+                self.redraw(force=True)
+                if on_done:
+                    on_done(done.value)
+                return
+            self.redraw()
+            self.root.after(interval_ms or 1, tick)
+        self.root.after_idle(tick)
+
+    def screen_size(self) -> tuple[int, int]:
+        return self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+
+    def resize(self, width: int, height: int) -> None:
+        self.root.geometry(f"{width}x{height}")
+        self.canvas.configure(width=width, height=height)
+
+    def after(self, delay_ms: int, func: Callable[[], None]) -> None:
+        self.root.after(delay_ms, func)
 
     def wait_for_close(self):
+        """runs Tk's mainloop until the window is closed"""
         self.running = True
-        while self.running:
-            self.redraw()
+        self.redraw(force=True)
+        self._in_mainloop = True
+        try:
+            self.root.mainloop()
+        finally:
+            self._in_mainloop = False
+        self.root.destroy()
 
     def close(self):
         self.running = False
+        self.root.quit()
+
+    def draw_line(self, line: Line, fillcolor: str, width: int=2,
+                  key: Optional[Hashable]=None):
+        self._pending.append(("line",
+                              (line.start.x, line.start.y,
+                               line.end.x, line.end.y),
+                              {"width": width, "fill": fillcolor}, key))
+
+    def draw_point(self, point: Point, fillcolor: str, width: int=3,
+                   key: Optional[Hashable]=None):
+        self._pending.append(("rectangle",
+                              (point.x-width, point.y-width,
+                               point.x+width, point.y+width),
+                              {"fill": fillcolor}, key))
 
-    def draw_line(self, line: Line, fillcolor: str, width: int=2):
-        self.canvas.create_line(line.start.x, line.start.y, 
-                                line.end.x, line.end.y, 
-                                width=width, fill=fillcolor)
+    def erase(self, key: Hashable):
+        """removes the item drawn under key, if there is one"""
+        self._pending.append(("erase", None, None, key))
 
-    def draw_point(self, point: Point, fillcolor: str, width: int=3):
-        self.canvas.create_rectangle(point.x-width, point.y-width, 
-                                     point.x+width, point.y+width, 
-                                     fill=fillcolor)
+    def counters(self) -> dict[str, int]:
+        return {"canvas_items_created": self.items_created,
+                "redraws": self.redraws,
+                "frames": self.frames}
 
+    @property
+    def item_count(self) -> int:
+        return len(self.canvas.find_all())
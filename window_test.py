@@ -0,0 +1,213 @@
+import unittest
+import random
+from unittest import mock
+
+import window
+from geometry import Line, Point
+from maze_elements import Cell
+from maze_engine import remove_entrance_and_exit, remove_walls_steps, run_maze
+from screen_coordinate_calculator import GridToScreenTranslator
+from tk_drawing import TkMazeObserver, draw_wall_path
+from vcw_grid import VCWGrid
+from window import Window
+
+class FakeTk:
+    """the bits of Tk a Window calls, with after() callbacks run by hand"""
+    def __init__(self) -> None:
+        self.callbacks: list = []
+        self.updates = 0
+
+    def wm_title(self, title: str) -> None:
+        pass
+
+    def geometry(self, spec: str) -> None:
+        pass
+
+    def protocol(self, name: str, func) -> None:
+        pass
+
+    def update_idletasks(self) -> None:
+        pass
+
+    def update(self) -> None:
+        self.updates += 1
+
+    def after(self, delay_ms: int, func) -> None:
+        self.callbacks.append((delay_ms, func))
+
+    def after_idle(self, func) -> None:
+        self.callbacks.append((0, func))
+
+    def run_callbacks(self) -> list[int]:
+        """runs the callbacks queued so far, giving back their delays"""
+        queued, self.callbacks = self.callbacks, []
+        for _, func in queued:
+            func()
+        return [delay for delay, _ in queued]
+
+class CountingCanvas:
+    """just enough of a Tk Canvas to count what a Window asks of it"""
+    def __init__(self, root: FakeTk, **options) -> None:
+        self.items: dict[int, dict] = {}
+        self.next_item = 0
+        self.calls = {"create_line": 0, "create_rectangle": 0,
+                      "coords": 0, "itemconfigure": 0, "delete": 0}
+
+    def pack(self, **options) -> None:
+        pass
+
+    def _create(self, kind: str, coords: tuple, options: dict) -> int:
+        self.calls[kind] += 1
+        self.next_item += 1
+        self.items[self.next_item] = dict(options, coords=coords)
+        return self.next_item
+
+    def create_line(self, *coords, **options) -> int:
+        return self._create("create_line", coords, options)
+
+    def create_rectangle(self, *coords, **options) -> int:
+        return self._create("create_rectangle", coords, options)
+
+    def coords(self, item: int, *coords) -> None:
+        self.calls["coords"] += 1
+        self.items[item]["coords"] = coords
+
+    def itemconfigure(self, item: int, **options) -> None:
+        self.calls["itemconfigure"] += 1
+        self.items[item].update(options)
+
+    def delete(self, item: int) -> None:
+        self.calls["delete"] += 1
+        del self.items[item]
+
+    def find_all(self) -> tuple:
+        return tuple(self.items)
+
+def line(x: int) -> Line:
+    return Line(start=Point(x=x, y=0), end=Point(x=x, y=10))
+
+class Tests(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        for name, fake in (("Tk", FakeTk), ("Canvas", CountingCanvas),
+                           ("monotonic", lambda: self.now)):
+            patcher = mock.patch.object(window, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_draws_wait_for_a_frame(self):
+        win = Window(50, 50, max_fps=10)
+        win.redraw(force=True)
+        win.draw_line(line(1), "black")
+        win.draw_point(Point(x=5, y=5), "blue")
+        self.assertEqual(win.canvas.calls["create_line"], 0)
+        self.now += 0.06
+        win.redraw()
+        self.assertEqual(win.item_count, 0)
+        self.now += 0.06
+        win.redraw()
+        self.assertEqual(win.canvas.calls["create_line"], 1)
+        self.assertEqual(win.canvas.calls["create_rectangle"], 1)
+        self.assertEqual((win.redraws, win.frames), (3, 2))
+
+    def test_batch_size_presents_early(self):
+        win = Window(50, 50, max_fps=10, batch_size=3)
+        win.redraw(force=True)
+        for x in range(2):
+            win.draw_line(line(x), "black")
+        win.redraw()
+        self.assertEqual(win.item_count, 0)
+        win.draw_line(line(2), "black")
+        win.redraw()
+        self.assertEqual(win.item_count, 3)
+
+    def test_keyed_draws_reuse_their_item(self):
+        win = Window(50, 50, max_fps=None)
+        for color in ("black", "red", "blue"):
+            for x in range(20):
+                win.draw_line(line(x), color, key=("wall", x))
+            win.redraw()
+        calls = win.canvas.calls
+        self.assertEqual(calls["create_line"], 20)
+        self.assertEqual((calls["coords"], calls["itemconfigure"]), (40, 40))
+        self.assertEqual(win.items_created, 20)
+        self.assertEqual({item["fill"] for item in win.canvas.items.values()},
+                         {"blue"})
+        for x in range(5):
+            win.erase(("wall", x))
+        win.erase(("wall", "never drawn"))
+        win.redraw()
+        self.assertEqual((calls["delete"], win.item_count), (5, 15))
+        win.draw_line(line(0), "black", key=("wall", 0))
+        win.redraw()
+        self.assertEqual((calls["create_line"], win.item_count), (21, 16))
+
+    def test_carving_and_solving_keep_one_item_per_line(self):
+        screen = GridToScreenTranslator(num_rows=8, num_cols=9,
+                                        cell_size_in_pixels=11,
+                                        border_width_in_pixels=2)
+        grid = VCWGrid(cell_rows=8, cell_cols=9)
+        grid.populate_cells(lambda loc: Cell(loc=loc, visited=False))
+        grid.populate_walls(screen.generate_wall_path_line)
+        remove_entrance_and_exit(grid)
+        win = Window(**screen.size, max_fps=None)
+        grid.map_walls(lambda wall: draw_wall_path(win, wall))
+        win.redraw()
+        num_walls = win.item_count
+        observer = TkMazeObserver(win)
+        for _ in remove_walls_steps(grid, random.Random(1), observer):
+            pass
+        self.assertTrue(run_maze(grid, random.Random(2), observer))
+        for _ in range(3):
+            grid.map_walls(lambda wall: draw_wall_path(win, wall))
+            win.redraw()
+        # every line is solid or carries a path, never both or twice
+        self.assertLessEqual(win.item_count, num_walls)
+        self.assertEqual(win.item_count, len(win._items))
+        self.assertLess(win.items_created, 2 * num_walls)
+
+    def test_animate_steps_from_callbacks(self):
+        win = Window(50, 50, max_fps=None)
+        win.running = True
+        done = []
+
+        def steps():
+            for _ in range(3):
+                yield
+            return "finished"
+
+        win.animate(steps(), interval_ms=40, on_done=done.append)
+        self.assertEqual(win.root.run_callbacks(), [0])
+        self.assertEqual(win.root.run_callbacks(), [40])
+        self.assertEqual(win.root.run_callbacks(), [40])
+        self.assertEqual(done, [])
+        self.assertEqual(win.root.run_callbacks(), [40])
+        self.assertEqual(done, ["finished"])
+        self.assertEqual(win.root.callbacks, [])
+
+    def test_animate_runs_a_frame_of_steps_per_callback(self):
+        win = Window(50, 50, max_fps=None)
+        win.running = True
+        taken = []
+
+        def steps():
+            for step in range(10):
+                taken.append(step)
+                # the fake clock only moves as steps run
+                self.now += 0.006
+                yield
+
+        win.animate(steps())
+        win.root.run_callbacks()
+        # a 60 fps frame fits three 6 ms steps
+        self.assertEqual(len(taken), 3)
+        win.root.run_callbacks()
+        self.assertEqual(len(taken), 6)
+        # once the window is closed the chain stops
+        win.running = False
+        win.root.run_callbacks()
+        self.assertEqual((len(taken), win.root.callbacks), (6, []))
+
+
+if __name__ == "__main__":
+    unittest.main()